@@ -0,0 +1,112 @@
+# ============================================
+# FILE: check_async.py (Create in root folder)
+# Diagnostic script to check AsyncDatabase against SQLite
+# ============================================
+
+import asyncio
+import os
+import tempfile
+import threading
+
+# A throwaway SQLite file unless DB_BACKEND/DB_SQLITE_PATH say otherwise;
+# set before the database module reads them
+os.environ.setdefault('DB_BACKEND', 'sqlite')
+os.environ.setdefault('DB_SQLITE_PATH', os.path.join(tempfile.mkdtemp(), 'check_async.db'))
+
+from src.config.database import db
+from src.config.async_database import AsyncDatabase
+
+HOSPITAL = "Check Async Hospital"
+
+def insert_hospital(suffix):
+    return db.execute_query("INSERT INTO HOSPITAL (hospital_name, city) VALUES (%s, 'Check')",
+                            (f"{HOSPITAL} {suffix}",))
+
+def hospital_names():
+    rows = db.fetch_all("SELECT hospital_name FROM HOSPITAL WHERE hospital_name LIKE %s",
+                        (f"{HOSPITAL}%",))
+    return {row['hospital_name'] for row in rows}
+
+def nested_rollback():
+    """Outer insert kept, inner savepoint rolled back"""
+    insert_hospital("outer")
+    try:
+        with db.transaction():
+            insert_hospital("inner")
+            raise RuntimeError("inner block fails")
+    except RuntimeError:
+        pass
+    return hospital_names()
+
+def failing_unit():
+    insert_hospital("failed")
+    raise RuntimeError("unit of work fails")
+
+async def main():
+    adb = AsyncDatabase()
+    failures = []
+
+    def check(label, ok):
+        print(f"  {'✅' if ok else '❌'} {label}")
+        if not ok:
+            failures.append(label)
+
+    if not await adb.connect():
+        print("❌ Could not connect")
+        return 1
+
+    print("=" * 60)
+    print("DIAGNOSTIC: AsyncDatabase Check")
+    print("=" * 60)
+
+    # 1. Executor sizing
+    print("\n1. EXECUTOR SIZING:")
+    print("-" * 60)
+    check(f"one worker per pooled connection ({adb.max_workers} = DB_POOL_MAX_SIZE {db.pool_max_size})",
+          adb.max_workers == db.pool_max_size)
+    check("max_workers overrides the pool size", AsyncDatabase(max_workers=2).max_workers == 2)
+    threads = await asyncio.gather(*(adb.run(lambda: threading.current_thread().name)
+                                     for _ in range(adb.max_workers * 4)))
+    check(f"{len(set(threads))} worker thread(s) used, at most {adb.max_workers}",
+          0 < len(set(threads)) <= adb.max_workers)
+    check("calls run off the event loop thread",
+          threading.current_thread().name not in threads)
+
+    # 2. Results come back
+    print("\n2. RESULTS:")
+    print("-" * 60)
+    row = await adb.fetch_one("SELECT 1 AS one")
+    check(f"fetch_one returned {row}", row is not None and row['one'] == 1)
+    values = await asyncio.gather(*(adb.fetch_one("SELECT %s AS n", (n,)) for n in range(20)))
+    check("20 concurrent fetches came back in order", [r['n'] for r in values] == list(range(20)))
+    hospital_id = await adb.run(insert_hospital, "run")
+    check(f"run() returned the new hospital_id {hospital_id}", bool(hospital_id))
+    names = await adb.run(hospital_names)
+    check("the row written through run() is visible", f"{HOSPITAL} run" in names)
+
+    # 3. Transactions
+    print("\n3. TRANSACTIONS:")
+    print("-" * 60)
+    names = await adb.transaction(nested_rollback)
+    check("nested block rolled back inside the transaction",
+          f"{HOSPITAL} outer" in names and f"{HOSPITAL} inner" not in names)
+    names = await adb.run(hospital_names)
+    check("outer block committed, inner block not",
+          f"{HOSPITAL} outer" in names and f"{HOSPITAL} inner" not in names)
+    try:
+        await adb.transaction(failing_unit)
+        check("a failing unit of work raises to the awaiting coroutine", False)
+    except RuntimeError:
+        check("a failing unit of work raises to the awaiting coroutine", True)
+    names = await adb.run(hospital_names)
+    check("and its writes were rolled back", f"{HOSPITAL} failed" not in names)
+
+    await adb.disconnect()
+
+    print("\n" + "=" * 60)
+    print("DIAGNOSTIC COMPLETE" if not failures else f"DIAGNOSTIC FAILED: {len(failures)} check(s)")
+    print("=" * 60)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    raise SystemExit(asyncio.run(main()))
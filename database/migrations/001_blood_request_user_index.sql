@@ -0,0 +1,8 @@
+-- ============================================
+-- Index for the patient's own request list
+-- BloodRequest.get_by_user() filters on user_id and pages by
+-- (request_date, request_id); this index turns each page into a range scan.
+-- ============================================
+
+CREATE INDEX idx_blood_request_user_date
+    ON BLOOD_REQUEST (user_id, request_date, request_id);
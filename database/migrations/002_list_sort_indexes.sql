@@ -0,0 +1,18 @@
+-- ============================================
+-- Indexes on the sort keys of the paginated listings
+-- Each get_all() pages by a stable (sort column, primary key) pair; with
+-- these indexes a page is an index range read instead of a full sort.
+-- ============================================
+
+CREATE INDEX idx_user_created ON USER (created_at, user_id);
+
+CREATE INDEX idx_donor_name ON DONOR (name, donor_id);
+
+CREATE INDEX idx_patient_name ON PATIENT (name, patient_id);
+
+CREATE INDEX idx_blood_request_date ON BLOOD_REQUEST (request_date, request_id);
+
+CREATE INDEX idx_donor_match_date ON DONOR_MATCH (match_date, match_id);
+
+CREATE INDEX idx_donation_hospital_status_date
+    ON DONATION_RECORD (hospital_id, status, donation_date, donation_id);
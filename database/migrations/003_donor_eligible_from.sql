@@ -0,0 +1,16 @@
+-- ============================================
+-- Sargable donor eligibility
+-- eligible_from is the first day a donor may give blood again (NULL if
+-- they never have). As a stored generated column the server keeps it in
+-- sync on every write to last_donation_date - profile inserts, edits and
+-- the donation completion trigger alike - so no code path can forget it.
+-- Donor searches become a range read on the composite index instead of
+-- evaluating DATEDIFF() for every row.
+-- ============================================
+
+ALTER TABLE DONOR
+    ADD COLUMN eligible_from DATE
+        AS (DATE_ADD(last_donation_date, INTERVAL 90 DAY)) STORED;
+
+CREATE INDEX idx_donor_eligibility
+    ON DONOR (blood_group, is_available, eligible_from);
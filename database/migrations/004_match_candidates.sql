@@ -0,0 +1,20 @@
+-- ============================================
+-- Ranked donor candidates per request
+-- Written once when a request is first matched. When a donor declines,
+-- the rematch worker takes the next available candidate from this list
+-- with a primary-key range read instead of searching the DONOR table
+-- again.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS MATCH_CANDIDATE (
+    request_id INT NOT NULL,
+    candidate_rank INT NOT NULL,
+    donor_id INT NOT NULL,
+    PRIMARY KEY (request_id, candidate_rank),
+    FOREIGN KEY (request_id) REFERENCES BLOOD_REQUEST(request_id) ON DELETE CASCADE,
+    FOREIGN KEY (donor_id) REFERENCES DONOR(donor_id) ON DELETE CASCADE
+);
+
+-- Finds requests with a declined match for the rematch poll
+CREATE INDEX idx_donor_match_request_status
+    ON DONOR_MATCH (request_id, match_status);
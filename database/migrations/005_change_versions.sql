@@ -0,0 +1,18 @@
+-- ============================================
+-- Change feed version counters
+-- One row per watched table. The application bumps a table's row once
+-- per write statement or transaction that touched it (see
+-- Database._count_changes), not once per row, so bulk writes and
+-- concurrent writers don't queue on these four rows. Clients poll this
+-- four-row table instead of re-running their listings to find out
+-- whether anything changed.
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS CHANGE_VERSION (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    changed_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+);
+
+INSERT IGNORE INTO CHANGE_VERSION (table_name) VALUES
+    ('BLOOD_REQUEST'), ('DONOR_MATCH'), ('DONATION_RECORD'), ('BLOOD_INVENTORY');
@@ -0,0 +1,9 @@
+-- ============================================
+-- Statistics aggregates
+-- Request counts by urgency and status are read from this index alone
+-- instead of scanning BLOOD_REQUEST. Donor counts by blood group already
+-- use idx_donor_eligibility (blood_group, is_available, ...).
+-- ============================================
+
+CREATE INDEX idx_blood_request_urgency_status
+    ON BLOOD_REQUEST (urgency, status);
@@ -0,0 +1,20 @@
+-- ============================================
+-- Change feed version counters, per statement
+-- Databases that applied the first version of migration 005 bump
+-- CHANGE_VERSION from per-row triggers, which serializes every writer
+-- on the same four rows. The application now bumps each touched table
+-- once per statement or transaction, so the triggers are dropped.
+-- ============================================
+
+DROP TRIGGER IF EXISTS trg_blood_request_version_ins;
+DROP TRIGGER IF EXISTS trg_blood_request_version_upd;
+DROP TRIGGER IF EXISTS trg_blood_request_version_del;
+DROP TRIGGER IF EXISTS trg_donor_match_version_ins;
+DROP TRIGGER IF EXISTS trg_donor_match_version_upd;
+DROP TRIGGER IF EXISTS trg_donor_match_version_del;
+DROP TRIGGER IF EXISTS trg_donation_record_version_ins;
+DROP TRIGGER IF EXISTS trg_donation_record_version_upd;
+DROP TRIGGER IF EXISTS trg_donation_record_version_del;
+DROP TRIGGER IF EXISTS trg_blood_inventory_version_ins;
+DROP TRIGGER IF EXISTS trg_blood_inventory_version_upd;
+DROP TRIGGER IF EXISTS trg_blood_inventory_version_del;
@@ -0,0 +1,214 @@
+-- ============================================
+-- Emergency Blood Finder - SQLite schema
+-- Local stand-in for the MySQL database (DB_BACKEND=sqlite). Mirrors the
+-- tables, indexes and triggers the application relies on, including
+-- everything added by database/migrations/. Dates are stored as ISO
+-- text under DATE/TIMESTAMP column types so they read back as Python
+-- date/datetime values. sp_Confirm_Donation is implemented in Python in
+-- src/config/sqlite_backend.py, which also replaces
+-- {DONATION_INTERVAL_DAYS} with the constant from src/utils/constants.py
+-- when it loads this file.
+-- ============================================
+
+PRAGMA foreign_keys = ON;
+
+CREATE TABLE IF NOT EXISTS USER (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_name VARCHAR(100) NOT NULL,
+    email VARCHAR(100) NOT NULL UNIQUE,
+    phone VARCHAR(15),
+    role VARCHAR(20) NOT NULL CHECK (role IN ('patient', 'donor', 'admin', 'hospital_staff')),
+    password_hash VARCHAR(255),
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS HOSPITAL (
+    hospital_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hospital_name VARCHAR(150) NOT NULL,
+    address VARCHAR(255),
+    city VARCHAR(50),
+    pincode VARCHAR(10),
+    phone VARCHAR(15),
+    email VARCHAR(100),
+    is_active BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE TABLE IF NOT EXISTS HOSPITAL_STAFF (
+    staff_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE REFERENCES USER(user_id) ON DELETE CASCADE,
+    hospital_id INTEGER NOT NULL REFERENCES HOSPITAL(hospital_id),
+    name VARCHAR(100) NOT NULL,
+    designation VARCHAR(50),
+    phone VARCHAR(15)
+);
+
+CREATE TABLE IF NOT EXISTS PATIENT (
+    patient_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE REFERENCES USER(user_id) ON DELETE CASCADE,
+    name VARCHAR(100) NOT NULL,
+    blood_group VARCHAR(5) NOT NULL,
+    city_pincode VARCHAR(10),
+    emergency_contact VARCHAR(15),
+    medical_history TEXT
+);
+
+CREATE TABLE IF NOT EXISTS DONOR (
+    donor_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE REFERENCES USER(user_id) ON DELETE CASCADE,
+    name VARCHAR(100) NOT NULL,
+    blood_group VARCHAR(5) NOT NULL,
+    city_pincode VARCHAR(10),
+    phone VARCHAR(15),
+    is_available BOOLEAN NOT NULL DEFAULT TRUE,
+    weight DECIMAL(5, 2),
+    last_donation_date DATE,
+    total_donations INTEGER NOT NULL DEFAULT 0,
+    -- First day the donor may give again (migration 003)
+    eligible_from DATE GENERATED ALWAYS AS (date(last_donation_date, '+{DONATION_INTERVAL_DAYS} days')) STORED
+);
+
+CREATE TABLE IF NOT EXISTS BLOOD_REQUEST (
+    request_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL REFERENCES USER(user_id) ON DELETE CASCADE,
+    hospital_id INTEGER REFERENCES HOSPITAL(hospital_id),
+    blood_group_needed VARCHAR(5) NOT NULL,
+    urgency VARCHAR(10) NOT NULL CHECK (urgency IN ('low', 'medium', 'high', 'critical')),
+    status VARCHAR(15) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'fulfilled', 'cancelled')),
+    units_needed INTEGER NOT NULL DEFAULT 1,
+    medical_reason TEXT,
+    request_date TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    required_by_date DATE
+);
+
+CREATE TABLE IF NOT EXISTS DONOR_MATCH (
+    match_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id INTEGER NOT NULL REFERENCES BLOOD_REQUEST(request_id) ON DELETE CASCADE,
+    donor_id INTEGER NOT NULL REFERENCES DONOR(donor_id) ON DELETE CASCADE,
+    match_date TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    match_status VARCHAR(15) NOT NULL DEFAULT 'matched'
+        CHECK (match_status IN ('matched', 'contacted', 'confirmed', 'rejected', 'completed')),
+    notes TEXT
+);
+
+CREATE TABLE IF NOT EXISTS DONATION_RECORD (
+    donation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    donor_id INTEGER NOT NULL REFERENCES DONOR(donor_id) ON DELETE CASCADE,
+    request_id INTEGER REFERENCES BLOOD_REQUEST(request_id) ON DELETE SET NULL,
+    match_id INTEGER REFERENCES DONOR_MATCH(match_id) ON DELETE SET NULL,
+    hospital_id INTEGER NOT NULL REFERENCES HOSPITAL(hospital_id),
+    donation_date DATE NOT NULL,
+    units_donated INTEGER NOT NULL DEFAULT 1,
+    status VARCHAR(15) NOT NULL DEFAULT 'scheduled'
+        CHECK (status IN ('scheduled', 'completed', 'cancelled')),
+    conducted_by INTEGER REFERENCES HOSPITAL_STAFF(staff_id),
+    next_eligible_date DATE,
+    created_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS BLOOD_INVENTORY (
+    inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hospital_id INTEGER NOT NULL REFERENCES HOSPITAL(hospital_id) ON DELETE CASCADE,
+    blood_group VARCHAR(5) NOT NULL,
+    units_available INTEGER NOT NULL DEFAULT 0,
+    units_reserved INTEGER NOT NULL DEFAULT 0,
+    threshold INTEGER NOT NULL DEFAULT 5,
+    updated_by INTEGER,
+    last_updated TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (hospital_id, blood_group)
+);
+
+-- Ranked backup donors per request (migration 004)
+CREATE TABLE IF NOT EXISTS MATCH_CANDIDATE (
+    request_id INTEGER NOT NULL REFERENCES BLOOD_REQUEST(request_id) ON DELETE CASCADE,
+    candidate_rank INTEGER NOT NULL,
+    donor_id INTEGER NOT NULL REFERENCES DONOR(donor_id) ON DELETE CASCADE,
+    PRIMARY KEY (request_id, candidate_rank)
+);
+
+-- Change feed counters (migration 005)
+CREATE TABLE IF NOT EXISTS CHANGE_VERSION (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    changed_at TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+);
+
+INSERT OR IGNORE INTO CHANGE_VERSION (table_name) VALUES
+    ('BLOOD_REQUEST'), ('DONOR_MATCH'), ('DONATION_RECORD'), ('BLOOD_INVENTORY');
+
+-- ============================================
+-- Indexes (migrations 001-006, plus the foreign key indexes InnoDB
+-- would create implicitly)
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_blood_request_user_date ON BLOOD_REQUEST (user_id, request_date, request_id);
+CREATE INDEX IF NOT EXISTS idx_user_created ON USER (created_at, user_id);
+CREATE INDEX IF NOT EXISTS idx_donor_name ON DONOR (name, donor_id);
+CREATE INDEX IF NOT EXISTS idx_patient_name ON PATIENT (name, patient_id);
+CREATE INDEX IF NOT EXISTS idx_blood_request_date ON BLOOD_REQUEST (request_date, request_id);
+CREATE INDEX IF NOT EXISTS idx_donor_match_date ON DONOR_MATCH (match_date, match_id);
+CREATE INDEX IF NOT EXISTS idx_donation_hospital_status_date
+    ON DONATION_RECORD (hospital_id, status, donation_date, donation_id);
+CREATE INDEX IF NOT EXISTS idx_donor_eligibility ON DONOR (blood_group, is_available, eligible_from);
+CREATE INDEX IF NOT EXISTS idx_donor_match_request_status ON DONOR_MATCH (request_id, match_status);
+CREATE INDEX IF NOT EXISTS idx_blood_request_urgency_status ON BLOOD_REQUEST (urgency, status);
+CREATE INDEX IF NOT EXISTS idx_donor_match_donor ON DONOR_MATCH (donor_id);
+CREATE INDEX IF NOT EXISTS idx_donation_donor ON DONATION_RECORD (donor_id);
+CREATE INDEX IF NOT EXISTS idx_blood_request_hospital ON BLOOD_REQUEST (hospital_id);
+CREATE INDEX IF NOT EXISTS idx_match_candidate_donor ON MATCH_CANDIDATE (donor_id);
+-- Lets the auto-match trigger read donors in its order and stop at the first
+CREATE INDEX IF NOT EXISTS idx_donor_auto_match
+    ON DONOR (blood_group, is_available, last_donation_date, donor_id);
+
+-- ============================================
+-- Triggers
+-- ============================================
+
+-- Auto-match: give a new request the longest-rested available donor of
+-- exactly the requested group, and take that donor off the available list
+CREATE TRIGGER IF NOT EXISTS trg_auto_match_donor AFTER INSERT ON BLOOD_REQUEST
+WHEN NEW.status = 'pending'
+BEGIN
+    INSERT INTO DONOR_MATCH (request_id, donor_id, match_status, notes)
+    SELECT NEW.request_id, d.donor_id, 'matched', 'Auto-matched on request creation'
+    FROM DONOR d
+    WHERE d.blood_group = NEW.blood_group_needed
+    AND d.is_available = TRUE
+    AND (d.eligible_from IS NULL OR d.eligible_from <= date('now', 'localtime'))
+    ORDER BY d.last_donation_date, d.donor_id  -- never donated (NULL) sorts first
+    LIMIT 1;
+
+    UPDATE DONOR SET is_available = FALSE
+    WHERE donor_id IN (SELECT donor_id FROM DONOR_MATCH WHERE request_id = NEW.request_id);
+END;
+
+-- Prevent early donation: no donation before the donation interval is over
+CREATE TRIGGER IF NOT EXISTS trg_prevent_early_donation BEFORE INSERT ON DONATION_RECORD
+WHEN (SELECT eligible_from FROM DONOR WHERE donor_id = NEW.donor_id) > NEW.donation_date
+BEGIN
+    SELECT RAISE(ABORT, 'Donor is not eligible to donate yet ({DONATION_INTERVAL_DAYS} day wait)');
+END;
+
+-- Update inventory: completing a donation records it against the donor,
+-- adds the units to the hospital's stock and fulfils the request
+CREATE TRIGGER IF NOT EXISTS trg_donation_completed AFTER UPDATE OF status ON DONATION_RECORD
+WHEN NEW.status = 'completed' AND OLD.status <> 'completed'
+BEGIN
+    UPDATE DONOR
+    SET last_donation_date = NEW.donation_date,
+        total_donations = total_donations + 1,
+        is_available = TRUE
+    WHERE donor_id = NEW.donor_id;
+
+    INSERT OR IGNORE INTO BLOOD_INVENTORY (hospital_id, blood_group, units_available)
+    SELECT NEW.hospital_id, blood_group, 0 FROM DONOR WHERE donor_id = NEW.donor_id;
+
+    UPDATE BLOOD_INVENTORY
+    SET units_available = units_available + NEW.units_donated,
+        last_updated = datetime('now', 'localtime')
+    WHERE hospital_id = NEW.hospital_id
+    AND blood_group = (SELECT blood_group FROM DONOR WHERE donor_id = NEW.donor_id);
+
+    UPDATE BLOOD_REQUEST SET status = 'fulfilled' WHERE request_id = NEW.request_id;
+END;
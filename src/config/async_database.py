@@ -0,0 +1,97 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from mysql.connector import Error
+from src.config.database import db as default_db
+
+class AsyncDatabase:
+    """asyncio front end for the blocking Database
+
+    Each call runs on a worker thread with the synchronous method of the
+    same name, so it keeps the connection pool, statement cache, query
+    cache and row format. There is one worker per pooled connection, so
+    up to DB_POOL_MAX_SIZE queries overlap their I/O without any of them
+    waiting on a connection inside a thread.
+
+    Model code is synchronous too; run() calls any of it from a coroutine:
+
+        adb = AsyncDatabase()
+        await adb.connect()
+        matches, stock = await asyncio.gather(
+            adb.run(DonorMatch.get_confirmed_by_hospital, hospital_id),
+            adb.run(BloodInventory.get_by_hospital, hospital_id))
+    """
+
+    def __init__(self, database=None, max_workers=None):
+        self.db = database or default_db
+        self.max_workers = max_workers or self.db.pool_max_size
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='async-db')
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) run on a database worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(),
+                                          functools.partial(fn, *args, **kwargs))
+
+    async def transaction(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) inside one db.transaction()
+
+        A transaction is pinned to the thread that opened it, so the whole
+        unit of work runs as one call on a single worker thread.
+        """
+        def unit_of_work():
+            with self.db.transaction():
+                return fn(*args, **kwargs)
+        return await self.run(unit_of_work)
+
+    async def connect(self):
+        """Open the connection pool; returns False if it can't"""
+        return await self.run(self.db.connect)
+
+    async def disconnect(self):
+        """Close the pool and stop the worker threads"""
+        await self.run(self.db.disconnect)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def execute_query(self, query, params=None):
+        """Execute INSERT, UPDATE, DELETE queries"""
+        return await self.run(self.db.execute_query, query, params)
+
+    async def execute_update(self, query, params=None):
+        """Execute UPDATE, DELETE queries and return the affected row count"""
+        return await self.run(self.db.execute_update, query, params)
+
+    async def execute_many(self, query, rows, chunk_size=None):
+        """Execute a write for many parameter rows; see Database.execute_many"""
+        return await self.run(self.db.execute_many, query, rows, chunk_size)
+
+    async def fetch_one(self, query, params=None, cache=False):
+        """Fetch single record"""
+        return await self.run(self.db.fetch_one, query, params, cache)
+
+    async def fetch_all(self, query, params=None, cache=False):
+        """Fetch all records"""
+        return await self.run(self.db.fetch_all, query, params, cache)
+
+    async def call_procedure(self, proc_name, params=None):
+        """Call stored procedure"""
+        return await self.run(self.db.call_procedure, proc_name, params)
+
+    async def __aenter__(self):
+        if not await self.connect():
+            raise Error("Failed to connect to database")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+
+# Global async database instance, sharing the pool of db
+async_db = AsyncDatabase()
@@ -1,10 +1,232 @@
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errors
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
 from dotenv import load_dotenv
+from src.config import sqlite_backend
+from src.config.query_cache import QueryCache, affected_tables, tables_in
+from src.config.records import record_type
 
 load_dotenv()
 
+# Tables with a CHANGE_VERSION counter for the change feed (migration 005)
+CHANGE_TABLES = ('BLOOD_REQUEST', 'DONOR_MATCH', 'DONATION_RECORD', 'BLOOD_INVENTORY')
+
+# INSERT IGNORE ... VALUES (row); mysql-connector only folds plain
+# INSERT ... VALUES into a multi-row statement, so these are expanded here
+_INSERT_IGNORE_VALUES = re.compile(r'^\s*INSERT\s+IGNORE\b.*\bVALUES\s*(\(.*\))\s*$',
+                                   re.IGNORECASE | re.DOTALL)
+
+def multi_row_insert(query, rows):
+    """One INSERT IGNORE statement and flat params covering every row
+    
+    Returns None for statements executemany() already batches.
+    """
+    match = _INSERT_IGNORE_VALUES.match(query)
+    if match is None:
+        return None
+    values = ", ".join([match.group(1)] * len(rows))
+    return query[:match.start(1)] + values, tuple(value for row in rows for value in row)
+
+def in_list(values, minimum=8):
+    """Placeholders and params for an IN (...) list of values
+    
+    The list is padded to a power-of-two length by repeating its last
+    value, so statements built from it come in a few fixed texts and
+    stay prepared in the statement cache.
+    """
+    values = tuple(values)
+    size = minimum
+    while size < len(values):
+        size *= 2
+    padded = values + values[-1:] * (size - len(values))
+    return ", ".join(["%s"] * size), padded
+
+class StatementCache:
+    """LRU cache of server-side prepared statements for one connection
+
+    Each entry is a prepared cursor keyed by its query text. Running the
+    same text again on that cursor only sends the parameters; the least
+    recently used statement is closed once the cache is full.
+    """
+
+    def __init__(self, connection, size):
+        self.connection = connection
+        self.size = size
+        self._cursors = OrderedDict()
+
+    def get(self, query):
+        """Return the prepared cursor for query, creating it if needed"""
+        cursor = self._cursors.get(query)
+        if cursor is not None:
+            self._cursors.move_to_end(query)
+            return cursor
+
+        cursor = self.connection.cursor(prepared=True)
+        self._cursors[query] = cursor
+        if len(self._cursors) > self.size:
+            _, evicted = self._cursors.popitem(last=False)
+            self._close_cursor(evicted)
+        return cursor
+
+    def discard(self, query):
+        """Drop a statement whose cursor may be left in a bad state"""
+        cursor = self._cursors.pop(query, None)
+        if cursor is not None:
+            self._close_cursor(cursor)
+
+    def close(self):
+        """Close every cached statement"""
+        while self._cursors:
+            _, cursor = self._cursors.popitem()
+            self._close_cursor(cursor)
+
+    @staticmethod
+    def _close_cursor(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+class PooledConnection:
+    """A pooled connection plus the time it was last handed back"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.last_used = time.monotonic()
+        self.statements = None
+        self.reusable = True
+
+    def close(self):
+        """Close the underlying connection, ignoring errors"""
+        if self.statements is not None:
+            self.statements.close()
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+
+class ConnectionPool:
+    """Bounded pool of database connections
+
+    Keeps at least min_size connections open and never more than max_size.
+    Idle connections above min_size are closed after idle_timeout seconds,
+    and connections that sat idle for ping_after seconds are pinged before
+    they are handed out again.
+    """
+
+    def __init__(self, factory, min_size=1, max_size=10, idle_timeout=300,
+                 ping_after=30, checkout_timeout=30):
+        self.factory = factory
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.checkout_timeout = checkout_timeout
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def open(self):
+        """Open the minimum number of connections"""
+        while self._size < self.min_size:
+            with self._condition:
+                self._size += 1
+            self._idle.append(self._create())
+
+    def _create(self):
+        """Open a new connection for a slot that is already reserved"""
+        try:
+            return PooledConnection(self.factory())
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _is_healthy(self, pooled):
+        """Ping connections that have been idle for a while"""
+        if time.monotonic() - pooled.last_used < self.ping_after:
+            return True
+        try:
+            pooled.connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _expire_idle(self):
+        """Remove idle connections past idle_timeout, keeping min_size open"""
+        expired = []
+        now = time.monotonic()
+        while (self._idle and self._size > self.min_size
+               and now - self._idle[0].last_used > self.idle_timeout):
+            expired.append(self._idle.pop(0))
+            self._size -= 1
+        return expired
+
+    def acquire(self):
+        """Check out a connection, waiting up to checkout_timeout for one"""
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise errors.PoolError("Connection pool is closed")
+                expired = self._expire_idle()
+                if self._idle:
+                    pooled = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    pooled = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise errors.PoolError("Timed out waiting for a database connection")
+                self._condition.wait(remaining)
+
+        for stale in expired:
+            stale.close()
+
+        if pooled is None:
+            return self._create()
+        if not self._is_healthy(pooled):
+            pooled.close()
+            return self._create()
+        return pooled
+
+    def release(self, pooled, discard=False):
+        """Return a connection to the pool, or close it if discard is set"""
+        with self._condition:
+            if discard or self._closed:
+                self._size -= 1
+                expired = [pooled]
+            else:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                expired = self._expire_idle()
+            self._condition.notify()
+
+        for stale in expired:
+            stale.close()
+
+    def close(self):
+        """Close idle connections; checked out ones close when released"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for pooled in idle:
+            pooled.close()
+
 class Database:
     def __init__(self):
         self.host = os.getenv('DB_HOST', 'localhost')
@@ -12,92 +234,423 @@ class Database:
         self.password = os.getenv('DB_PASSWORD', '')
         self.database = os.getenv('DB_NAME', 'emergency_blood')
         self.port = os.getenv('DB_PORT', '3306')
-        self.connection = None
-    
+        # 'mysql', or 'sqlite' for an embedded database file at DB_SQLITE_PATH
+        self.backend = os.getenv('DB_BACKEND', 'mysql').lower()
+        self.sqlite_path = os.getenv('DB_SQLITE_PATH', 'emergency_blood.db')
+        self.pool_min_size = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+        self.pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+        self.pool_idle_timeout = float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))
+        self.pool_ping_after = float(os.getenv('DB_POOL_PING_AFTER', '30'))
+        self.pool_checkout_timeout = float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', '30'))
+        self.statement_cache_size = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '100'))
+        if self.backend == 'sqlite':
+            # sqlite3 keeps its own per-connection statement cache
+            self.statement_cache_size = 0
+        self.bulk_chunk_size = int(os.getenv('DB_BULK_CHUNK_SIZE', '1000'))
+        self.fetch_batch_size = int(os.getenv('DB_FETCH_BATCH_SIZE', '500'))
+        # 'dict' returns plain dictionaries, 'record' compact tuple-backed rows
+        self.row_factory = os.getenv('DB_ROW_FACTORY', 'dict')
+        # Results of fetches made with cache=True; a 0 MB budget disables it
+        self.query_cache = QueryCache(
+            max_bytes=int(float(os.getenv('DB_QUERY_CACHE_MB', '16')) * 1024 * 1024),
+            ttl=float(os.getenv('DB_QUERY_CACHE_TTL', '30'))
+        )
+        # Cleared if CHANGE_VERSION is missing (migration 005 not applied)
+        self.count_changes = True
+        self.pool = None
+        self._local = threading.local()
+
+    def _open_connection(self):
+        """Open one raw connection for the pool"""
+        if self.backend == 'sqlite':
+            return sqlite_backend.connect(self.sqlite_path)
+        # Autocommit keeps every pooled connection reading fresh data;
+        # multi-statement writes open an explicit transaction instead.
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            port=self.port,
+            autocommit=True
+        )
+
     def connect(self):
-        """Establish database connection"""
-        try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                port=self.port
+        """Open the database connection pool"""
+        try:
+            self.pool = ConnectionPool(
+                self._open_connection,
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size,
+                idle_timeout=self.pool_idle_timeout,
+                ping_after=self.pool_ping_after,
+                checkout_timeout=self.pool_checkout_timeout
             )
-            if self.connection.is_connected():
-                print("Successfully connected to MySQL database")
-                return True
+            self.pool.open()
+            print(f"Successfully connected to {self._describe()}")
+            return True
         except Error as e:
-            print(f"Error connecting to MySQL: {e}")
+            print(f"Error connecting to {self._describe()}: {e}")
+            self.pool = None
             return False
-    
+
     def disconnect(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            print("MySQL connection closed")
-    
+        """Close all pooled connections"""
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            print(f"{self._describe()} connection closed")
+
+    def _describe(self):
+        if self.backend == 'sqlite':
+            return f"SQLite database {self.sqlite_path}"
+        return "MySQL database"
+
+    @contextmanager
+    def _connection(self):
+        """Check a connection out of the pool for the calling thread
+
+        Inside transaction() the thread's pinned connection is reused.
+        """
+        pinned = getattr(self._local, 'pooled', None)
+        if pinned is not None:
+            yield pinned
+            return
+        if self.pool is None:
+            raise Error("Not connected to the database")
+        pooled = self.pool.acquire()
+        if pooled.statements is None and self.statement_cache_size > 0:
+            pooled.statements = StatementCache(pooled.connection, self.statement_cache_size)
+        broken = False
+        try:
+            yield pooled
+        except (errors.OperationalError, errors.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.pool.release(pooled, discard=broken or not pooled.reusable)
+
+    def _in_transaction(self):
+        """True while the calling thread is inside transaction()"""
+        return getattr(self._local, 'pooled', None) is not None
+
+    @staticmethod
+    def _rollback(connection):
+        """Roll back without hiding the error that caused it"""
+        try:
+            connection.rollback()
+        except Error:
+            pass
+
+    @contextmanager
+    def transaction(self):
+        """Unit of work spanning several queries or model calls
+
+        Everything run by this thread inside the block uses one connection
+        and is committed once when the block exits, or rolled back if it
+        raises. Nested blocks become savepoints, so a failing inner block
+        only undoes its own work.
+        """
+        local = self._local
+        if not self._in_transaction():
+            with self._connection() as pooled:
+                connection = pooled.connection
+                connection.start_transaction()
+                local.pooled = pooled
+                local.depth = 0
+                local.written = set()
+                try:
+                    yield
+                    self._count_changes(connection, local.written)
+                    connection.commit()
+                    # Readers outside the transaction may have cached the
+                    # old rows since the writes invalidated them
+                    self.query_cache.invalidate_tables(local.written)
+                except BaseException:
+                    self._rollback(connection)
+                    raise
+                finally:
+                    local.pooled = None
+                    local.written = None
+            return
+
+        local.depth += 1
+        savepoint = f"sp_{local.depth}"
+        connection = local.pooled.connection
+        try:
+            with self._cursor(connection) as cursor:
+                cursor.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield
+            except BaseException:
+                with self._cursor(connection) as cursor:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                raise
+            with self._cursor(connection) as cursor:
+                cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+        finally:
+            local.depth -= 1
+
+    @contextmanager
+    def _atomic(self, connection):
+        """Commit a block on its own unless a transaction() is already open"""
+        if self._in_transaction():
+            yield
+            return
+        connection.start_transaction()
+        try:
+            yield
+            connection.commit()
+        except BaseException:
+            self._rollback(connection)
+            raise
+
+    @contextmanager
+    def _cursor(self, connection, **kwargs):
+        """Open a cursor that is always closed afterwards"""
+        cursor = connection.cursor(**kwargs)
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def _execute(self, pooled, query, params=None):
+        """Execute query and yield the cursor holding its result
+
+        Uses the connection's prepared statement cache when it is enabled,
+        otherwise a buffered cursor that is closed on the way out.
+        """
+        if pooled.statements is None:
+            with self._cursor(pooled.connection, buffered=True) as cursor:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                yield cursor
+            return
+
+        cursor = pooled.statements.get(query)
+        try:
+            cursor.execute(query, params or ())
+            yield cursor
+        except Exception:
+            pooled.statements.discard(query)
+            raise
+
+    def _row_builder(self, cursor):
+        """Return a function turning one raw tuple into a result row"""
+        columns = cursor.column_names
+        if self.row_factory == 'record':
+            return record_type(columns)
+        return lambda row: dict(zip(columns, row))
+
+    def _make_rows(self, cursor, rows):
+        """Turn raw tuples into dictionaries or records keyed by column name"""
+        return list(map(self._row_builder(cursor), rows))
+
+    def _count_changes(self, connection, tables):
+        """Bump CHANGE_VERSION once for the watched tables a write touched
+
+        Called once per statement, bulk chunk or transaction on the writing
+        connection, so the counter rows are locked once per unit of work
+        rather than once per row. Tables written by triggers count too.
+        """
+        changed = sorted(affected_tables(tables) & set(CHANGE_TABLES))
+        if not changed or not self.count_changes:
+            return
+        try:
+            with self._cursor(connection) as cursor:
+                cursor.execute(
+                    "UPDATE CHANGE_VERSION SET version = version + 1, changed_at = %s "
+                    f"WHERE table_name IN ({', '.join(['%s'] * len(changed))})",
+                    (datetime.now(), *changed)
+                )
+        except errors.ProgrammingError as e:
+            print(f"Change versions not recorded: {e}")
+            self.count_changes = False
+
+    def _wrote(self, query):
+        """Invalidate cached results a write statement may have changed"""
+        tables = tables_in(query)
+        self.query_cache.invalidate_tables(tables)
+        if self._in_transaction():
+            self._local.written |= tables
+
+    def _cacheable(self, cache):
+        # Reads inside a transaction may see its uncommitted writes
+        return cache and self.query_cache.enabled and not self._in_transaction()
+
     def execute_query(self, query, params=None):
         """Execute INSERT, UPDATE, DELETE queries"""
         try:
-            cursor = self.connection.cursor()
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            self.connection.commit()
-            return cursor.lastrowid
+            with self._connection() as pooled:
+                with self._execute(pooled, query, params) as cursor:
+                    result = cursor.lastrowid
+                if not self._in_transaction():
+                    self._count_changes(pooled.connection, tables_in(query))
+                self._wrote(query)
+                return result
         except Error as e:
             print(f"Error executing query: {e}")
-            self.connection.rollback()
             raise e
-    
-    def fetch_one(self, query, params=None):
-        """Fetch single record"""
+
+    def execute_update(self, query, params=None):
+        """Execute UPDATE, DELETE queries and return the affected row count"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            return cursor.fetchone()
+            with self._connection() as pooled:
+                with self._execute(pooled, query, params) as cursor:
+                    result = cursor.rowcount
+                if not self._in_transaction():
+                    self._count_changes(pooled.connection, tables_in(query))
+                self._wrote(query)
+                return result
+        except Error as e:
+            print(f"Error executing query: {e}")
+            raise e
+
+    def execute_many(self, query, rows, chunk_size=None):
+        """Execute a write for many parameter rows, committing once per chunk
+
+        INSERT ... VALUES and INSERT IGNORE ... VALUES statements are sent
+        as one multi-row INSERT per chunk. rows may be any iterable, so
+        large loads can be streamed. Returns the number of affected rows.
+        """
+        chunk_size = chunk_size or self.bulk_chunk_size
+        iterator = iter(rows)
+        total = 0
+        try:
+            with self._connection() as pooled:
+                connection = pooled.connection
+                while True:
+                    chunk = list(islice(iterator, chunk_size))
+                    if not chunk:
+                        break
+                    with self._atomic(connection):
+                        with self._cursor(connection) as cursor:
+                            statement = multi_row_insert(query, chunk)
+                            if statement is None:
+                                cursor.executemany(query, chunk)
+                            else:
+                                cursor.execute(*statement)
+                            total += cursor.rowcount
+                        if not self._in_transaction():
+                            self._count_changes(connection, tables_in(query))
+                    self._wrote(query)  # after each chunk's commit
+            return total
         except Error as e:
+            print(f"Error executing bulk query: {e}")
+            raise e
+
+    def _fetch_rows(self, query, params):
+        with self._connection() as pooled:
+            with self._execute(pooled, query, params) as cursor:
+                return self._make_rows(cursor, cursor.fetchall())
+
+    def _fetch_first(self, query, params):
+        # Read the whole result so no unread rows stay on the connection
+        rows = self._fetch_rows(query, params)
+        return rows[0] if rows else None
+
+    def fetch_one(self, query, params=None, cache=False, raise_errors=False):
+        """Fetch single record
+
+        With cache=True a repeat of the same query and params is answered
+        from the query cache until a table it reads is written. Errors are
+        printed and give None, unless raise_errors=True; locking reads
+        inside transaction() use that so a failure rolls the work back.
+        """
+        try:
+            if self._cacheable(cache):
+                return self.query_cache.fetch(query, params, lambda: self._fetch_first(query, params))
+            return self._fetch_first(query, params)
+        except Error as e:
+            if raise_errors:
+                raise
             print(f"Error fetching data: {e}")
             return None
-    
-    def fetch_all(self, query, params=None):
-        """Fetch all records"""
+
+    def fetch_all(self, query, params=None, cache=False, raise_errors=False):
+        """Fetch all records
+
+        cache=True and raise_errors=True work as for fetch_one().
+        """
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            return cursor.fetchall()
+            if self._cacheable(cache):
+                return self.query_cache.fetch(query, params, lambda: self._fetch_rows(query, params))
+            return self._fetch_rows(query, params)
         except Error as e:
+            if raise_errors:
+                raise
             print(f"Error fetching data: {e}")
             return []
-    
+
+    def fetch_iter(self, query, params=None, batch_size=None):
+        """Stream records from an unbuffered cursor
+
+        Rows are pulled from the server fetchmany(batch_size) at a time, so
+        memory stays flat however large the result is. The connection stays
+        checked out until the generator is exhausted or closed.
+        """
+        batch_size = batch_size or self.fetch_batch_size
+        try:
+            with self._connection() as pooled:
+                connection = pooled.connection
+                cursor = connection.cursor(buffered=False)
+                exhausted = False
+                try:
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+                    make_row = self._row_builder(cursor)
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            exhausted = True
+                            break
+                        for row in rows:
+                            yield make_row(row)
+                finally:
+                    if exhausted:
+                        cursor.close()
+                    elif self._in_transaction():
+                        # The transaction needs this connection, so drain it
+                        connection.consume_results()
+                        cursor.close()
+                    else:
+                        # Cheaper to drop the connection than to read the rest
+                        pooled.reusable = False
+        except Error as e:
+            print(f"Error fetching data: {e}")
+            raise e
+
     def call_procedure(self, proc_name, params=None):
         """Call stored procedure"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            if params:
-                cursor.callproc(proc_name, params)
-            else:
-                cursor.callproc(proc_name)
-            
-            # Fetch results if any
-            results = []
-            for result in cursor.stored_results():
-                results.extend(result.fetchall())
-            
-            self.connection.commit()
-            return results
+            with self._connection() as pooled:
+                connection = pooled.connection
+                with self._atomic(connection):
+                    with self._cursor(connection, dictionary=True) as cursor:
+                        if params:
+                            cursor.callproc(proc_name, params)
+                        else:
+                            cursor.callproc(proc_name)
+
+                        # Fetch results if any
+                        results = []
+                        for result in cursor.stored_results():
+                            results.extend(result.fetchall())
+                    # Procedures may write anywhere
+                    if self._in_transaction():
+                        self._local.written |= set(CHANGE_TABLES)
+                    else:
+                        self._count_changes(connection, CHANGE_TABLES)
+                self.query_cache.clear()
+                return results
         except Error as e:
             print(f"Error calling procedure: {e}")
-            self.connection.rollback()
             raise e
 
 # Global database instance
-db = Database()
\ No newline at end of file
+db = Database()
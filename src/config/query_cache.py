@@ -0,0 +1,162 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+# Tables whose triggers write to other tables, so a write to the key also
+# stales results read from the values
+TRIGGER_EFFECTS = {
+    'BLOOD_REQUEST': {'DONOR_MATCH', 'DONOR'},                        # auto-match
+    'DONATION_RECORD': {'DONOR', 'BLOOD_INVENTORY', 'BLOOD_REQUEST'},  # completion
+}
+
+_TABLE_PATTERN = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE)\s+`?(\w+)`?', re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def tables_in(query):
+    """Upper-cased names of the tables a statement reads or writes"""
+    return frozenset(name.upper() for name in _TABLE_PATTERN.findall(query))
+
+def affected_tables(tables):
+    """tables plus everything their triggers write, transitively"""
+    affected = set(tables)
+    pending = list(affected)
+    while pending:
+        for table in TRIGGER_EFFECTS.get(pending.pop(), ()):
+            if table not in affected:
+                affected.add(table)
+                pending.append(table)
+    return affected
+
+def _estimate_size(value):
+    """Rough size in bytes of a cached result: rows plus their values"""
+    rows = value if isinstance(value, list) else [value]
+    size = sys.getsizeof(rows)
+    for row in rows:
+        if row is None:
+            continue
+        size += sys.getsizeof(row)
+        for item in row.values():
+            size += sys.getsizeof(item)
+    return size
+
+class QueryCache:
+    """Result cache for read queries, keyed by (SQL text, parameters)
+
+    Each entry is tagged with the tables its query reads. A write to any
+    of them - or to a table whose triggers write to them - drops the
+    entry, as does reaching ttl seconds. Entries are evicted least
+    recently used first once their estimated size passes max_bytes.
+    """
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, tables, size, value)
+        self._by_table = {}            # table -> keys of entries reading it
+        self._generations = {}         # table -> writes seen, for in-flight loads
+        self._epoch = 0                # bumped by clear()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def fetch(self, query, params, load):
+        """Return the cached result of query, or load() it and cache it
+
+        A list result is copied on the way out so callers can't reorder
+        the cached one.
+        """
+        key = (query, tuple(params) if params else ())
+        tables = tables_in(query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[3]
+                return list(value) if isinstance(value, list) else value
+            self.misses += 1
+            if entry is not None:
+                self._remove(key)
+            snapshot = self._snapshot(tables)
+
+        value = load()
+        self._put(key, tables, value, snapshot)
+        return list(value) if isinstance(value, list) else value
+
+    def _snapshot(self, tables):
+        return (self._epoch,) + tuple(self._generations.get(table, 0) for table in sorted(tables))
+
+    def _put(self, key, tables, value, snapshot):
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # A write landed while the query ran; its result may be stale
+            if self._snapshot(tables) != snapshot:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tables, size, value)
+            self.bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, tables, size, _ = self._entries.pop(key)
+        self.bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def invalidate_tables(self, tables):
+        """Drop every entry reading any of tables or what their triggers write"""
+        with self._lock:
+            for table in affected_tables(name.upper() for name in tables):
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in list(self._by_table.get(table, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def invalidate_query(self, query):
+        """Invalidate for a write statement, by the tables it names"""
+        self.invalidate_tables(tables_in(query))
+
+    def clear(self):
+        """Drop everything, for writes whose tables aren't known"""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_table.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,64 @@
+import threading
+
+class Record(tuple):
+    """Compact, read-only result row
+
+    Values live in a plain tuple; the column names are stored once on the
+    generated class for each query shape instead of once per row. Rows
+    still answer row['name'] and row.get('name') like the dictionaries the
+    dashboards were written against, plus keys()/values()/items().
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        index = self._index.get(key)
+        if index is None:
+            return default
+        return tuple.__getitem__(self, index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def values(self):
+        return [tuple.__getitem__(self, i) for i in self._index.values()]
+
+    def items(self):
+        return [(name, tuple.__getitem__(self, i)) for name, i in self._index.items()]
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+_record_types = {}
+_record_types_lock = threading.Lock()
+
+def record_type(columns):
+    """Return the Record subclass for a tuple of column names
+
+    Classes are generated once per query shape and reused afterwards. As
+    with dictionary rows, a repeated column name maps to its last value.
+    """
+    columns = tuple(columns)
+    cls = _record_types.get(columns)
+    if cls is None:
+        with _record_types_lock:
+            cls = _record_types.get(columns)
+            if cls is None:
+                index = {name: i for i, name in enumerate(columns)}
+                cls = type('Record', (Record,), {
+                    '__slots__': (),
+                    '_fields': columns,
+                    '_index': index,
+                })
+                _record_types[columns] = cls
+    return cls
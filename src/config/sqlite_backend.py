@@ -0,0 +1,230 @@
+import os
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from mysql.connector import errors
+from src.utils.constants import DONATION_INTERVAL_DAYS
+
+# Schema, indexes and triggers created in an empty database file
+SCHEMA_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'sqlite', 'schema.sql')
+
+def _parse_date(value):
+    return date.fromisoformat(value.decode()[:10])
+
+def _parse_timestamp(value):
+    text = value.decode()
+    return datetime.fromisoformat(text) if len(text) > 10 else datetime.fromisoformat(text + ' 00:00:00')
+
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATE', _parse_date)
+sqlite3.register_converter('TIMESTAMP', _parse_timestamp)
+sqlite3.register_converter('DATETIME', _parse_timestamp)
+
+_FOR_UPDATE = re.compile(r'\s+FOR\s+UPDATE\b', re.IGNORECASE)
+_INSERT_IGNORE = re.compile(r'\bINSERT\s+IGNORE\b', re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def translate(query):
+    """Rewrite the MySQL dialect the models use into SQLite
+
+    %s placeholders become ?, INSERT IGNORE becomes INSERT OR IGNORE and
+    FOR UPDATE is dropped; transactions start with BEGIN IMMEDIATE, which
+    already holds the database write lock.
+    """
+    query = _FOR_UPDATE.sub('', query)
+    query = _INSERT_IGNORE.sub('INSERT OR IGNORE', query)
+    return query.replace('%s', '?')
+
+def _field(value, *options):
+    """MySQL FIELD(): 1-based position of value among options, 0 if absent"""
+    for position, option in enumerate(options, 1):
+        if value == option:
+            return position
+    return 0
+
+def _wrap_error(e):
+    """The mysql.connector error matching a sqlite3 one
+
+    Database handles errors by mysql.connector type, so the backend
+    raises those; locking problems count as operational.
+    """
+    if isinstance(e, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=str(e))
+    if isinstance(e, sqlite3.OperationalError) and 'locked' in str(e):
+        return errors.OperationalError(msg=str(e))
+    if isinstance(e, sqlite3.ProgrammingError):
+        return errors.ProgrammingError(msg=str(e))
+    return errors.DatabaseError(msg=str(e))
+
+class _ProcedureResult:
+    """One result set of a procedure, as returned by stored_results()"""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+class SQLiteCursor:
+    """sqlite3 cursor with the mysql.connector cursor surface Database uses"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection.raw.cursor()
+        self._results = []
+
+    @property
+    def column_names(self):
+        description = self._cursor.description or ()
+        return tuple(column[0] for column in description)
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(translate(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise _wrap_error(e) from e
+
+    def executemany(self, query, rows):
+        try:
+            self._cursor.executemany(translate(query), [tuple(row) for row in rows])
+        except sqlite3.Error as e:
+            raise _wrap_error(e) from e
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def callproc(self, name, params=()):
+        procedure = PROCEDURES.get(name)
+        if procedure is None:
+            raise errors.ProgrammingError(msg=f"PROCEDURE {name} does not exist")
+        try:
+            rows = procedure(self, *params)
+        except sqlite3.Error as e:
+            raise _wrap_error(e) from e
+        self._results = [_ProcedureResult(rows)] if rows else []
+
+    def stored_results(self):
+        return iter(self._results)
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection:
+    """sqlite3 connection with the mysql.connector connection surface Database uses
+
+    Runs in autocommit mode like the pooled MySQL connections;
+    start_transaction() opens an explicit BEGIN IMMEDIATE transaction.
+    """
+
+    def __init__(self, path):
+        # The pool hands a connection to one thread at a time
+        self.raw = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                   detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self.raw.execute("PRAGMA foreign_keys = ON")
+        self.raw.execute("PRAGMA journal_mode = WAL")
+        self.raw.execute("PRAGMA synchronous = NORMAL")
+        self.raw.create_function('NOW', 0, lambda: datetime.now().replace(microsecond=0).isoformat(' '))
+        self.raw.create_function('CURDATE', 0, lambda: date.today().isoformat())
+        self.raw.create_function('FIELD', -1, _field, deterministic=True)
+
+    def cursor(self, **kwargs):
+        """Open a cursor; mysql.connector options (buffered, dictionary, prepared) don't apply"""
+        return SQLiteCursor(self)
+
+    def start_transaction(self):
+        self.raw.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def consume_results(self):
+        pass
+
+    def ping(self, reconnect=False):
+        try:
+            self.raw.execute("SELECT 1")
+        except sqlite3.Error as e:
+            raise _wrap_error(e) from e
+
+    def close(self):
+        self.raw.close()
+
+def create_schema(connection):
+    """Create the tables, indexes and triggers if the database is empty"""
+    found = connection.raw.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'USER'").fetchone()
+    if found:
+        return
+    with open(SCHEMA_FILE, encoding='utf-8') as f:
+        # The generated eligible_from uses the same interval as the app
+        schema = f.read().replace('{DONATION_INTERVAL_DAYS}', str(DONATION_INTERVAL_DAYS))
+    connection.raw.executescript(schema)
+
+def connect(path):
+    """Open a connection to the SQLite database at path, creating it if needed"""
+    try:
+        connection = SQLiteConnection(path)
+        create_schema(connection)
+        return connection
+    except sqlite3.Error as e:
+        raise _wrap_error(e) from e
+
+def sp_confirm_donation(cursor, match_id, donation_date, units_donated, conducted_by):
+    """Python version of the sp_Confirm_Donation procedure
+
+    Schedules a donation for a confirmed match: records it in
+    DONATION_RECORD against the request's hospital and marks the match
+    completed. Runs inside the caller's transaction.
+    """
+    raw = cursor._cursor
+    match = raw.execute("""
+        SELECT dm.donor_id, dm.request_id, dm.match_status, br.hospital_id
+        FROM DONOR_MATCH dm
+        JOIN BLOOD_REQUEST br ON dm.request_id = br.request_id
+        WHERE dm.match_id = ?
+    """, (match_id,)).fetchone()
+    if match is None:
+        raise errors.DatabaseError(msg=f"Match {match_id} not found")
+    donor_id, request_id, match_status, hospital_id = match
+    if match_status != 'confirmed':
+        raise errors.DatabaseError(msg=f"Match {match_id} is {match_status}, not confirmed")
+
+    if isinstance(donation_date, str):
+        donation_date = date.fromisoformat(donation_date[:10])
+    elif isinstance(donation_date, datetime):
+        donation_date = donation_date.date()
+    next_eligible = donation_date + timedelta(days=DONATION_INTERVAL_DAYS)
+
+    raw.execute("""
+        INSERT INTO DONATION_RECORD
+        (donor_id, request_id, match_id, hospital_id, donation_date, units_donated,
+         status, conducted_by, next_eligible_date)
+        VALUES (?, ?, ?, ?, ?, ?, 'scheduled', ?, ?)
+    """, (donor_id, request_id, match_id, hospital_id, donation_date, units_donated,
+          conducted_by, next_eligible))
+    donation_id = raw.lastrowid
+    raw.execute("UPDATE DONOR_MATCH SET match_status = 'completed' WHERE match_id = ?", (match_id,))
+    return [{'donation_id': donation_id, 'message': 'Donation scheduled successfully'}]
+
+# Stored procedures by name, as called through Database.call_procedure()
+PROCEDURES = {
+    'sp_Confirm_Donation': sp_confirm_donation,
+}
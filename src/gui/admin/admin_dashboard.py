@@ -3,23 +3,44 @@
 # Complete Admin Dashboard with All Functionality
 # ============================================
 
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from src.models.user import User
-from src.models.donor import Donor
 from src.models.blood_request import BloodRequest
 from src.models.blood_inventory import BloodInventory
+from src.models.statistics import Statistics
+from src.models.batch_matching import BatchMatcher
+from src.models.change_feed import change_feed
+from src.gui.admin.reports import Reports
+from src.gui.common.background import BackgroundLoader, ChangeWatcher
+from src.gui.common.widgets import TreeviewBinder, VirtualTable, LazyNotebook
+from src.utils.helpers import format_date
 
 class AdminDashboard:
+    # Change-driven statistics reloads run at most this often (seconds)
+    STATS_REFRESH_INTERVAL = 30
+    
     def __init__(self, parent, user):
         self.parent = parent
         self.user = user
         self.window = tk.Toplevel()
+        self.loader = BackgroundLoader(self.window)
+        self.stats_loaded_at = 0
+        self.stats_stale = False
+        self.stats_after = None
         self.window.title(f"Admin Dashboard - {user['user_name']}")
         self.window.geometry("1200x700")
         
+        start = time.perf_counter()
         self.center_window()
         self.create_widgets()
+        print(f"Admin dashboard ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+        
+        # Refresh requests and stock as other clients change them
+        self.watcher = ChangeWatcher(self.window, change_feed,
+                                     ['BLOOD_REQUEST', 'DONOR_MATCH', 'BLOOD_INVENTORY'],
+                                     self.on_data_changed)
         
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
     
@@ -44,67 +65,51 @@ class AdminDashboard:
             fg='white'
         ).pack(pady=15)
         
-        # Notebook (Tabs)
-        notebook = ttk.Notebook(self.window)
-        notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        # Notebook (Tabs), each built and loaded on first view
+        self.notebook = LazyNotebook(self.window)
+        self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
         # Tab 1: Statistics
-        stats_tab = tk.Frame(notebook)
-        notebook.add(stats_tab, text='📊 Statistics')
-        self.create_stats_tab(stats_tab)
+        self.notebook.add_lazy('stats', '📊 Statistics', self.create_stats_tab)
         
         # Tab 2: User Management
-        users_tab = tk.Frame(notebook)
-        notebook.add(users_tab, text='👥 Users')
-        self.create_users_tab(users_tab)
+        self.notebook.add_lazy('users', '👥 Users', self.create_users_tab)
         
         # Tab 3: Blood Inventory
-        inventory_tab = tk.Frame(notebook)
-        notebook.add(inventory_tab, text='🩸 Blood Inventory')
-        self.create_inventory_tab(inventory_tab)
+        self.notebook.add_lazy('inventory', '🩸 Blood Inventory', self.create_inventory_tab)
         
         # Tab 4: Requests
-        requests_tab = tk.Frame(notebook)
-        notebook.add(requests_tab, text='📋 Blood Requests')
-        self.create_requests_tab(requests_tab)
+        self.notebook.add_lazy('requests', '📋 Blood Requests', self.create_requests_tab)
+        
+        # Statistics changed while another tab was shown reload on return
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.refresh_stats(), add='+')
     
     def create_stats_tab(self, parent):
         """Statistics Dashboard"""
-        # Get statistics
-        users = User.get_all()
-        donors = Donor.get_all()
-        requests = BloodRequest.get_all()
-        inventory = BloodInventory.get_all()
-        
-        total_users = len(users)
-        total_donors = len(donors)
-        available_donors = len([d for d in donors if d['is_available']])
-        total_requests = len(requests)
-        pending_requests = len([r for r in requests if r['status'] == 'pending'])
-        fulfilled_requests = len([r for r in requests if r['status'] == 'fulfilled'])
-        
         # Stats Frame
         stats_frame = tk.Frame(parent, padx=20, pady=20)
         stats_frame.pack(fill='both', expand=True)
         
-        # Create stat cards
+        # Create stat cards; values are filled in once loaded
         row = 0
         col = 0
         
         stats = [
-            ("Total Users", total_users, "#007bff"),
-            ("Total Donors", total_donors, "#28a745"),
-            ("Available Donors", available_donors, "#17a2b8"),
-            ("Total Requests", total_requests, "#ffc107"),
-            ("Pending Requests", pending_requests, "#dc3545"),
-            ("Fulfilled Requests", fulfilled_requests, "#28a745"),
+            ('total_users', "Total Users", "#007bff"),
+            ('total_donors', "Total Donors", "#28a745"),
+            ('available_donors', "Available Donors", "#17a2b8"),
+            ('total_requests', "Total Requests", "#ffc107"),
+            ('pending_requests', "Pending Requests", "#dc3545"),
+            ('fulfilled_requests', "Fulfilled Requests", "#28a745"),
         ]
         
-        for title, value, color in stats:
+        self.stat_labels = {}
+        for key, title, color in stats:
             card = tk.Frame(stats_frame, bg=color, padx=30, pady=20)
             card.grid(row=row, column=col, padx=10, pady=10, sticky='nsew')
             
-            tk.Label(card, text=str(value), font=('Arial', 36, 'bold'), bg=color, fg='white').pack()
+            self.stat_labels[key] = tk.Label(card, text="…", font=('Arial', 36, 'bold'), bg=color, fg='white')
+            self.stat_labels[key].pack()
             tk.Label(card, text=title, font=('Arial', 12), bg=color, fg='white').pack()
             
             col += 1
@@ -116,34 +121,116 @@ class AdminDashboard:
         for i in range(3):
             stats_frame.grid_columnconfigure(i, weight=1)
         
-        # Blood Inventory Summary
-        inv_frame = tk.LabelFrame(stats_frame, text="Blood Inventory Summary", font=('Arial', 12, 'bold'), padx=10, pady=10)
+        # Blood Stock by Hospital
+        inv_frame = tk.LabelFrame(stats_frame, text="Blood Stock by Hospital", font=('Arial', 12, 'bold'), padx=10, pady=10)
         inv_frame.grid(row=row+1, column=0, columnspan=3, sticky='ew', pady=20)
         
-        tree = ttk.Treeview(inv_frame, columns=('Hospital', 'Blood', 'Available', 'Reserved', 'Status'), show='headings', height=8)
+        self.stats_status = tk.Label(inv_frame, text="", fg='#6c757d')
+        self.stats_status.pack(anchor='w')
+        
+        tree = ttk.Treeview(inv_frame, columns=('Hospital', 'Available', 'Reserved', 'Low'), show='headings', height=6)
         
         tree.heading('Hospital', text='Hospital')
-        tree.heading('Blood', text='Blood Group')
-        tree.heading('Available', text='Available')
-        tree.heading('Reserved', text='Reserved')
-        tree.heading('Status', text='Status')
+        tree.heading('Available', text='Units Available')
+        tree.heading('Reserved', text='Units Reserved')
+        tree.heading('Low', text='Low Stock Groups')
         
         tree.column('Hospital', width=300)
-        tree.column('Blood', width=100)
-        tree.column('Available', width=100)
-        tree.column('Reserved', width=100)
+        tree.column('Available', width=120)
+        tree.column('Reserved', width=120)
+        tree.column('Low', width=140)
+        
+        tree.pack(fill='both', expand=True)
+        self.stock_rows = TreeviewBinder(tree, 'hospital_id', lambda item: (
+            item['hospital_name'],
+            int(item['units_available'] or 0),
+            int(item['units_reserved'] or 0),
+            int(item['low_stock_groups'] or 0)
+        ))
+        
+        # Requests by Urgency
+        urgency_frame = tk.LabelFrame(stats_frame, text="Requests by Urgency", font=('Arial', 12, 'bold'), padx=10, pady=10)
+        urgency_frame.grid(row=row+2, column=0, columnspan=2, sticky='nsew')
+        
+        tree = ttk.Treeview(urgency_frame, columns=('Urgency', 'Status', 'Count'), show='headings', height=6)
+        tree.heading('Urgency', text='Urgency')
+        tree.heading('Status', text='Status')
+        tree.heading('Count', text='Requests')
+        tree.column('Urgency', width=150)
         tree.column('Status', width=150)
+        tree.column('Count', width=100)
+        tree.pack(fill='both', expand=True)
+        self.urgency_rows = TreeviewBinder(tree, lambda item: f"{item['urgency']}:{item['status']}", lambda item: (
+            item['urgency'],
+            item['status'],
+            item['request_count']
+        ))
         
-        for item in inventory:
-            tree.insert('', 'end', values=(
-                item['hospital_name'],
-                item['blood_group'],
-                item['units_available'],
-                item['units_reserved'],
-                item['stock_status']
-            ))
+        # Donors by Blood Group
+        group_frame = tk.LabelFrame(stats_frame, text="Donors by Blood Group", font=('Arial', 12, 'bold'), padx=10, pady=10)
+        group_frame.grid(row=row+2, column=2, sticky='nsew', padx=(10, 0))
         
+        tree = ttk.Treeview(group_frame, columns=('Blood', 'Donors', 'Available'), show='headings', height=6)
+        tree.heading('Blood', text='Blood Group')
+        tree.heading('Donors', text='Donors')
+        tree.heading('Available', text='Available')
+        tree.column('Blood', width=100)
+        tree.column('Donors', width=80)
+        tree.column('Available', width=80)
         tree.pack(fill='both', expand=True)
+        self.group_rows = TreeviewBinder(tree, 'blood_group', lambda item: (
+            item['blood_group'],
+            item['donor_count'],
+            int(item['available_count'] or 0)
+        ))
+        
+        self.load_stats()
+    
+    def load_stats(self):
+        """Gather statistics in the background"""
+        self.stats_loaded_at = time.monotonic()
+        self.stats_stale = False
+        self.loader.load('stats', self.collect_stats, self.show_stats,
+                         lambda e: print(f"Error loading statistics: {e}"),
+                         status=self.stats_status)
+    
+    def refresh_stats(self):
+        """Reload stale statistics if their tab is on screen
+        
+        The aggregates scan whole tables, so reloads caused by changes are
+        spaced at least STATS_REFRESH_INTERVAL apart; changes arriving in
+        between are folded into one reload when the interval ends.
+        """
+        if self.stats_after is not None:
+            return  # already due
+        if not self.stats_stale or not self.notebook.is_selected('stats'):
+            return
+        wait = self.STATS_REFRESH_INTERVAL - (time.monotonic() - self.stats_loaded_at)
+        if wait > 0:
+            self.stats_after = self.window.after(int(wait * 1000), self.stats_due)
+            return
+        self.load_stats()
+    
+    def stats_due(self):
+        self.stats_after = None
+        self.refresh_stats()
+    
+    @staticmethod
+    def collect_stats():
+        """Aggregates for the stat cards and summary tables, computed in SQL"""
+        return (Statistics.get_summary(),
+                Statistics.get_stock_by_hospital(),
+                Statistics.get_requests_by_urgency(),
+                Statistics.get_donors_by_blood_group())
+    
+    def show_stats(self, result):
+        counts, stock, by_urgency, by_group = result
+        for key, label in self.stat_labels.items():
+            label.config(text=str(counts.get(key, 0)))
+        
+        self.stock_rows.update(stock)
+        self.urgency_rows.update(by_urgency)
+        self.group_rows.update(by_group)
     
     def create_users_tab(self, parent):
         """User Management Tab"""
@@ -157,55 +244,39 @@ class AdminDashboard:
         tk.Button(btn_frame, text="Refresh", bg='#007bff', fg='white', command=self.load_users).pack(side='left', padx=5)
         tk.Button(btn_frame, text="Add User", bg='#28a745', fg='white', command=self.add_user).pack(side='left', padx=5)
         tk.Button(btn_frame, text="Delete User", bg='#dc3545', fg='white', command=self.delete_user).pack(side='left', padx=5)
-        
-        # Treeview
-        tree_frame = tk.Frame(frame)
-        tree_frame.pack(fill='both', expand=True, pady=10)
-        
-        scrollbar = tk.Scrollbar(tree_frame)
-        scrollbar.pack(side='right', fill='y')
-        
-        self.users_tree = ttk.Treeview(tree_frame, yscrollcommand=scrollbar.set,
-                                       columns=('ID', 'Name', 'Email', 'Phone', 'Role', 'Active', 'Created'), show='headings')
-        
-        scrollbar.config(command=self.users_tree.yview)
-        
-        self.users_tree.heading('ID', text='User ID')
-        self.users_tree.heading('Name', text='Name')
-        self.users_tree.heading('Email', text='Email')
-        self.users_tree.heading('Phone', text='Phone')
-        self.users_tree.heading('Role', text='Role')
-        self.users_tree.heading('Active', text='Active')
-        self.users_tree.heading('Created', text='Created Date')
-        
-        self.users_tree.column('ID', width=70)
-        self.users_tree.column('Name', width=150)
-        self.users_tree.column('Email', width=200)
-        self.users_tree.column('Phone', width=120)
-        self.users_tree.column('Role', width=120)
-        self.users_tree.column('Active', width=70)
-        self.users_tree.column('Created', width=150)
-        
-        self.users_tree.pack(fill='both', expand=True)
-        
-        self.load_users()
-    
-    def load_users(self):
-        """Load all users"""
-        for item in self.users_tree.get_children():
-            self.users_tree.delete(item)
-        
-        users = User.get_all()
-        for user in users:
-            self.users_tree.insert('', 'end', values=(
+        self.users_export_btn = tk.Button(btn_frame, text="Export CSV", bg='#6c757d', fg='white',
+                 command=lambda: self.export_csv("users", Reports.export_users, self.users_export_btn))
+        self.users_export_btn.pack(side='left', padx=5)
+        self.users_status = tk.Label(btn_frame, text="", fg='#6c757d')
+        self.users_status.pack(side='right', padx=5)
+        
+        # Virtual table: only the visible rows live in the Treeview
+        self.users_table = VirtualTable(
+            frame,
+            columns=[('ID', 'User ID', 70), ('Name', 'Name', 150), ('Email', 'Email', 200),
+                     ('Phone', 'Phone', 120), ('Role', 'Role', 120), ('Active', 'Active', 70),
+                     ('Created', 'Created Date', 150)],
+            fetch_page=lambda after, limit: User.get_all(after=after, limit=limit),
+            key='user_id',
+            values=lambda user: (
                 user['user_id'],
                 user['user_name'],
                 user['email'],
                 user['phone'],
                 user['role'],
                 'Yes' if user['is_active'] else 'No',
-                user['created_at'].strftime('%Y-%m-%d %H:%M') if user['created_at'] else ''
-            ))
+                format_date(user['created_at'], '%Y-%m-%d %H:%M', '')
+            ),
+            loader=self.loader, name='users', status=self.users_status
+        )
+        self.users_table.pack(fill='both', expand=True, pady=10)
+        self.users_tree = self.users_table.tree
+        
+        self.load_users()
+    
+    def load_users(self):
+        """Reload the users table from its first page"""
+        self.users_table.reload()
     
     def add_user(self):
         """Add new user - Admin only creates basic user account"""
@@ -395,50 +466,18 @@ class AdminDashboard:
         
         tk.Button(frame, text="Refresh", bg='#007bff', fg='white', 
                  command=self.load_inventory).pack(pady=5)
-        
-        # Treeview
-        tree_frame = tk.Frame(frame)
-        tree_frame.pack(fill='both', expand=True, pady=10)
-        
-        scrollbar = tk.Scrollbar(tree_frame)
-        scrollbar.pack(side='right', fill='y')
-        
-        self.inv_tree = ttk.Treeview(tree_frame, yscrollcommand=scrollbar.set,
-                                     columns=('ID', 'Hospital', 'Blood', 'Available', 'Reserved', 'Threshold', 'Status', 'Updated'), 
-                                     show='headings')
-        
-        scrollbar.config(command=self.inv_tree.yview)
-        
-        self.inv_tree.heading('ID', text='Inv ID')
-        self.inv_tree.heading('Hospital', text='Hospital')
-        self.inv_tree.heading('Blood', text='Blood Group')
-        self.inv_tree.heading('Available', text='Available')
-        self.inv_tree.heading('Reserved', text='Reserved')
-        self.inv_tree.heading('Threshold', text='Threshold')
-        self.inv_tree.heading('Status', text='Status')
-        self.inv_tree.heading('Updated', text='Last Updated')
-        
-        self.inv_tree.column('ID', width=70)
-        self.inv_tree.column('Hospital', width=200)
-        self.inv_tree.column('Blood', width=100)
-        self.inv_tree.column('Available', width=80)
-        self.inv_tree.column('Reserved', width=80)
-        self.inv_tree.column('Threshold', width=80)
-        self.inv_tree.column('Status', width=100)
-        self.inv_tree.column('Updated', width=150)
-        
-        self.inv_tree.pack(fill='both', expand=True)
-        
-        self.load_inventory()
-    
-    def load_inventory(self):
-        """Load blood inventory"""
-        for item in self.inv_tree.get_children():
-            self.inv_tree.delete(item)
-        
-        inventory = BloodInventory.get_all()
-        for item in inventory:
-            self.inv_tree.insert('', 'end', values=(
+        self.inv_status = tk.Label(frame, text="", fg='#6c757d')
+        self.inv_status.pack()
+        
+        # Virtual table: only the visible rows live in the Treeview
+        self.inv_table = VirtualTable(
+            frame,
+            columns=[('ID', 'Inv ID', 70), ('Hospital', 'Hospital', 200), ('Blood', 'Blood Group', 100),
+                     ('Available', 'Available', 80), ('Reserved', 'Reserved', 80),
+                     ('Threshold', 'Threshold', 80), ('Status', 'Status', 100), ('Updated', 'Last Updated', 150)],
+            fetch_page=lambda after, limit: BloodInventory.get_all(after=after, limit=limit),
+            key='inventory_id',
+            values=lambda item: (
                 item['inventory_id'],
                 item['hospital_name'],
                 item['blood_group'],
@@ -446,60 +485,47 @@ class AdminDashboard:
                 item['units_reserved'],
                 item['threshold'],
                 item['stock_status'],
-                item['last_updated'].strftime('%Y-%m-%d %H:%M') if item['last_updated'] else ''
-            ))
+                format_date(item['last_updated'], '%Y-%m-%d %H:%M', '')
+            ),
+            loader=self.loader, name='inventory', status=self.inv_status
+        )
+        self.inv_table.pack(fill='both', expand=True, pady=10)
+        self.inv_tree = self.inv_table.tree
+        
+        self.load_inventory()
+    
+    def load_inventory(self):
+        """Reload the inventory table from its first page"""
+        self.inv_table.reload()
     
     def create_requests_tab(self, parent):
         """Blood Requests Tab"""
         frame = tk.Frame(parent, padx=10, pady=10)
         frame.pack(fill='both', expand=True)
         
-        tk.Button(frame, text="Refresh", bg='#007bff', fg='white', 
-                 command=self.load_requests).pack(pady=5)
-        
-        # Treeview
-        tree_frame = tk.Frame(frame)
-        tree_frame.pack(fill='both', expand=True, pady=10)
-        
-        scrollbar = tk.Scrollbar(tree_frame)
-        scrollbar.pack(side='right', fill='y')
-        
-        self.req_tree = ttk.Treeview(tree_frame, yscrollcommand=scrollbar.set,
-                                     columns=('ID', 'Patient', 'Blood', 'Urgency', 'Status', 'Units', 'Donor', 'Date'), 
-                                     show='headings')
-        
-        scrollbar.config(command=self.req_tree.yview)
-        
-        self.req_tree.heading('ID', text='Req ID')
-        self.req_tree.heading('Patient', text='Patient')
-        self.req_tree.heading('Blood', text='Blood Group')
-        self.req_tree.heading('Urgency', text='Urgency')
-        self.req_tree.heading('Status', text='Status')
-        self.req_tree.heading('Units', text='Units')
-        self.req_tree.heading('Donor', text='Matched Donor')
-        self.req_tree.heading('Date', text='Request Date')
-        
-        self.req_tree.column('ID', width=70)
-        self.req_tree.column('Patient', width=150)
-        self.req_tree.column('Blood', width=100)
-        self.req_tree.column('Urgency', width=80)
-        self.req_tree.column('Status', width=100)
-        self.req_tree.column('Units', width=70)
-        self.req_tree.column('Donor', width=150)
-        self.req_tree.column('Date', width=150)
-        
-        self.req_tree.pack(fill='both', expand=True)
-        
-        self.load_requests()
-    
-    def load_requests(self):
-        """Load blood requests"""
-        for item in self.req_tree.get_children():
-            self.req_tree.delete(item)
-        
-        requests = BloodRequest.get_all()
-        for req in requests:
-            self.req_tree.insert('', 'end', values=(
+        btn_frame = tk.Frame(frame)
+        btn_frame.pack(pady=5)
+        
+        tk.Button(btn_frame, text="Refresh", bg='#007bff', fg='white', 
+                 command=self.load_requests).pack(side='left', padx=5)
+        self.req_export_btn = tk.Button(btn_frame, text="Export CSV", bg='#6c757d', fg='white',
+                 command=lambda: self.export_csv("blood_requests", Reports.export_requests, self.req_export_btn))
+        self.req_export_btn.pack(side='left', padx=5)
+        tk.Button(btn_frame, text="Match Pending", bg='#28a745', fg='white',
+                 command=self.match_pending).pack(side='left', padx=5)
+        self.req_status = tk.Label(btn_frame, text="", fg='#6c757d')
+        self.req_status.pack(side='left', padx=5)
+        
+        # Virtual table: only the visible rows live in the Treeview.
+        # A request is listed once per match, so rows key on both.
+        self.req_table = VirtualTable(
+            frame,
+            columns=[('ID', 'Req ID', 70), ('Patient', 'Patient', 150), ('Blood', 'Blood Group', 100),
+                     ('Urgency', 'Urgency', 80), ('Status', 'Status', 100), ('Units', 'Units', 70),
+                     ('Donor', 'Matched Donor', 150), ('Date', 'Request Date', 150)],
+            fetch_page=lambda after, limit: BloodRequest.get_all(after=after, limit=limit),
+            key=lambda req: f"{req['request_id']}:{req.get('match_id')}",
+            values=lambda req: (
                 req['request_id'],
                 req.get('patient_name', 'N/A'),
                 req['blood_group_needed'],
@@ -507,9 +533,75 @@ class AdminDashboard:
                 req['status'],
                 req['units_needed'],
                 req.get('donor_name', 'Not Matched'),
-                req['request_date'].strftime('%Y-%m-%d %H:%M') if req['request_date'] else ''
-            ))
+                format_date(req['request_date'], '%Y-%m-%d %H:%M', '')
+            ),
+            loader=self.loader, name='requests', status=self.req_status
+        )
+        self.req_table.pack(fill='both', expand=True, pady=10)
+        self.req_tree = self.req_table.tree
+        
+        self.load_requests()
+    
+    def load_requests(self):
+        """Reload the requests table from its first page"""
+        self.req_table.reload()
+    
+    def on_data_changed(self, tables):
+        """Refresh the loaded rows of tables whose data changed
+        
+        Tabs not built yet are skipped; they load fresh when first opened.
+        Statistics go through refresh_stats(), which spaces reloads out.
+        """
+        if self.notebook.is_built('stats'):
+            self.stats_stale = True
+            self.refresh_stats()
+        if tables & {'BLOOD_REQUEST', 'DONOR_MATCH'} and self.notebook.is_built('requests'):
+            self.req_table.refresh()
+        if 'BLOOD_INVENTORY' in tables and self.notebook.is_built('inventory'):
+            self.inv_table.refresh()
+    
+    def match_pending(self):
+        """Match every unmatched pending request in one batch"""
+        if not messagebox.askyesno("Confirm", "Match all pending requests to available donors now?"):
+            return
+        
+        def done(assignments):
+            messagebox.showinfo("Batch Matching", f"Matched {len(assignments)} pending request(s)")
+            self.load_requests()
+        
+        self.loader.load('match_pending', BatchMatcher().run, done,
+                         lambda e: messagebox.showerror("Error", f"Batch matching failed: {str(e)}"),
+                         status=self.req_status)
+    
+    def export_csv(self, name, exporter, button):
+        """Ask for a file name and stream an export into it in the background
+        
+        button stays disabled until the export finishes.
+        """
+        path = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension='.csv',
+            initialfile=f"{name}.csv",
+            filetypes=[('CSV files', '*.csv')]
+        )
+        if not path:
+            return
+        
+        def done(count):
+            button.config(state='normal')
+            messagebox.showinfo("Export Complete", f"Exported {count} rows to {path}")
+        
+        def failed(e):
+            button.config(state='normal')
+            messagebox.showerror("Error", f"Export failed: {str(e)}")
+        
+        button.config(state='disabled')
+        self.loader.load(f"export_{name}", lambda: exporter(path), done, failed)
     
     def on_closing(self):
+        self.watcher.close()
+        if self.stats_after is not None:
+            self.window.after_cancel(self.stats_after)
+        self.loader.shutdown()
         self.window.destroy()
         self.parent.deiconify()
\ No newline at end of file
@@ -0,0 +1,43 @@
+import csv
+from src.models.user import User
+from src.models.blood_request import BloodRequest
+from src.models.donor_match import DonorMatch
+
+class Reports:
+    """CSV exports that stream rows straight from the database"""
+
+    USER_COLUMNS = ['user_id', 'user_name', 'email', 'phone', 'role', 'is_active', 'created_at']
+
+    REQUEST_COLUMNS = ['request_id', 'patient_name', 'blood_group_needed', 'urgency', 'status',
+                       'units_needed', 'medical_reason', 'request_date', 'required_by_date',
+                       'hospital_name', 'match_id', 'donor_name', 'match_status']
+
+    MATCH_COLUMNS = ['match_id', 'request_id', 'donor_id', 'donor_name', 'patient_name',
+                     'blood_group_needed', 'match_status', 'match_date', 'notes']
+
+    @staticmethod
+    def export_csv(path, rows, columns):
+        """Write rows to a CSV file one at a time; returns the row count"""
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    @staticmethod
+    def export_users(path):
+        """Export all users to CSV"""
+        return Reports.export_csv(path, User.iter_all(), Reports.USER_COLUMNS)
+
+    @staticmethod
+    def export_requests(path):
+        """Export all blood requests to CSV"""
+        return Reports.export_csv(path, BloodRequest.iter_all(), Reports.REQUEST_COLUMNS)
+
+    @staticmethod
+    def export_matches(path):
+        """Export all donor matches to CSV"""
+        return Reports.export_csv(path, DonorMatch.iter_all(), Reports.MATCH_COLUMNS)
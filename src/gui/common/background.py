@@ -0,0 +1,145 @@
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+# Worker threads shared by every dashboard; queries are I/O bound and the
+# connection pool caps real concurrency anyway
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='gui-loader')
+        return _executor
+
+class BackgroundLoader:
+    """Run model queries off the Tk main thread
+
+    Tk widgets may only be touched from the main thread, so finished
+    loads are queued and delivered by polling with widget.after(). Each
+    load has a key (one per table, say); starting a new load for a key
+    makes any older one for it stale, and stale results are dropped.
+    """
+
+    # Milliseconds between checks for finished loads while any are running
+    POLL_MS = 30
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._results = queue.Queue()
+        self._generations = {}
+        self._pending = {}
+        self._polling = False
+        self._closed = False
+
+    def load(self, key, fn, on_success, on_error=None, status=None):
+        """Run fn() in the background and pass its result to on_success
+
+        on_error gets the exception instead if fn raises. status is an
+        optional label that reads "Loading..." until the load finishes.
+        Both callbacks run on the Tk main thread.
+        """
+        if self._closed:
+            return
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        self._pending[key] = status
+        if status is not None:
+            status.config(text="Loading...")
+
+        def run():
+            try:
+                self._results.put((key, generation, True, fn(), on_success, on_error))
+            except Exception as e:
+                self._results.put((key, generation, False, e, on_success, on_error))
+
+        _get_executor().submit(run)
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_MS, self._poll)
+
+    def cancel(self, key):
+        """Drop the result of any load running for key"""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._finish(key)
+
+    def is_loading(self, key):
+        return key in self._pending
+
+    def shutdown(self):
+        """Drop every running load; call when the window closes"""
+        self._closed = True
+        for key in list(self._pending):
+            self.cancel(key)
+
+    def _finish(self, key):
+        status = self._pending.pop(key, None)
+        if status is not None and not self._closed:
+            status.config(text="")
+
+    def _poll(self):
+        if self._closed or not self.widget.winfo_exists():
+            self._polling = False
+            return
+
+        try:
+            while True:
+                try:
+                    key, generation, ok, value, on_success, on_error = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                if generation != self._generations.get(key):
+                    continue  # superseded or cancelled
+                self._finish(key)
+                # A failing callback must not stop the other results
+                # from being delivered
+                try:
+                    if ok:
+                        on_success(value)
+                    elif on_error:
+                        on_error(value)
+                    else:
+                        print(f"Error loading {key}: {value}")
+                except Exception as e:
+                    print(f"Error handling {key} result: {e}")
+        finally:
+            self._polling = False
+            if self._pending and not self._closed:
+                try:
+                    self.widget.after(self.POLL_MS, self._poll)
+                    self._polling = True
+                except tk.TclError:
+                    pass  # a callback destroyed the window
+
+class ChangeWatcher:
+    """Deliver change feed notifications on the Tk main thread
+
+    Checks a change feed subscription every interval_ms with
+    widget.after() and calls on_change(tables) with the watched tables
+    that changed, so dashboards re-query only what is stale.
+    """
+
+    def __init__(self, widget, feed, tables, on_change, interval_ms=1000):
+        self.widget = widget
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self.subscription = feed.subscribe(tables)
+        self._closed = False
+        self.widget.after(self.interval_ms, self._check)
+
+    def _check(self):
+        if self._closed or not self.widget.winfo_exists():
+            self.close()
+            return
+        changed = self.subscription.take()
+        if changed:
+            self.on_change(changed)
+        self.widget.after(self.interval_ms, self._check)
+
+    def close(self):
+        """Stop watching; call when the window closes"""
+        self._closed = True
+        self.subscription.close()
@@ -0,0 +1,268 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+class TreeviewBinder:
+    """Keep a ttk.Treeview in step with query results, row by row
+
+    Items use each row's primary key as their iid, so a refresh only
+    inserts new rows, rewrites changed ones, moves reordered ones and
+    deletes the rest. Untouched rows keep their selection, and the
+    scroll position is restored afterwards, so refreshing an unchanged
+    list costs next to nothing and does not flicker.
+    """
+
+    def __init__(self, tree, key, values):
+        """key is a column name or a function of the row giving its
+        primary key; values turns a row into the tuple of cell values"""
+        self.tree = tree
+        self.key = key if callable(key) else (lambda row: row[key])
+        self.values = values
+        self._shown = {}  # iid -> values tuple currently displayed
+
+    def _items(self, rows):
+        """(iid, values) pairs for rows, dropping repeated keys"""
+        items = []
+        seen = set()
+        for row in rows:
+            iid = str(self.key(row))
+            if iid in seen:
+                continue
+            seen.add(iid)
+            items.append((iid, tuple(self.values(row))))
+        return items
+
+    def update(self, rows):
+        """Make the tree show exactly rows, in order"""
+        tree = self.tree
+        top = tree.yview()[0]
+        items = self._items(rows)
+        wanted = {iid for iid, _ in items}
+
+        stale = [iid for iid in tree.get_children() if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                self._shown.pop(iid, None)
+
+        current = list(tree.get_children())
+        for index, (iid, values) in enumerate(items):
+            if iid not in self._shown:
+                tree.insert('', index, iid=iid, values=values)
+                current.insert(index, iid)
+            else:
+                if self._shown[iid] != values:
+                    tree.item(iid, values=values)
+                if current[index] != iid:
+                    tree.move(iid, '', index)
+                    current.remove(iid)
+                    current.insert(index, iid)
+            self._shown[iid] = values
+
+        tree.yview_moveto(top)
+
+    def extend(self, rows):
+        """Append rows below the current ones, updating any already shown"""
+        for iid, values in self._items(rows):
+            if iid in self._shown:
+                if self._shown[iid] != values:
+                    self.tree.item(iid, values=values)
+            else:
+                self.tree.insert('', 'end', iid=iid, values=values)
+            self._shown[iid] = values
+
+    def clear(self):
+        """Remove every row"""
+        self.tree.delete(*self.tree.get_children())
+        self._shown.clear()
+
+class VirtualTable(tk.Frame):
+    """Treeview that only materialises the rows on screen
+
+    Rows arrive a page at a time from a keyset-paginated model method,
+    fetch_page(after, limit) returning a Page, and are kept as plain rows.
+    The Treeview itself only ever holds the visible window, redrawn
+    through a TreeviewBinder as the user scrolls; the next page is
+    fetched in the background before the window reaches the end of what
+    is loaded. Opening a table therefore costs one page however much
+    history is stored.
+    """
+
+    def __init__(self, parent, columns, fetch_page, key, values, loader, name,
+                 page_size=200, status=None, **kwargs):
+        """columns is a list of (column, heading, width) triples"""
+        super().__init__(parent, **kwargs)
+        self.fetch_page = fetch_page
+        self.loader = loader
+        self.name = name
+        self.page_size = page_size
+        self.status = status
+
+        self.rows = []
+        self.token = None
+        self.exhausted = False
+        self.pages = 0
+        self.offset = 0
+        self.visible = 20
+
+        self.scrollbar = tk.Scrollbar(self, command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.tree = ttk.Treeview(self, columns=[column for column, _, _ in columns], show='headings')
+        for column, heading, width in columns:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width)
+        self.tree.pack(fill='both', expand=True)
+        self.binder = TreeviewBinder(self.tree, key, values)
+
+        self.count_label = tk.Label(self, text="", fg='#6c757d', anchor='w')
+        self.count_label.pack(fill='x')
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-1, 'units'))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(1, 'units'))
+        self.tree.bind('<Up>', self._on_key)
+        self.tree.bind('<Down>', self._on_key)
+        self.tree.bind('<Prior>', lambda e: self.scroll(-1, 'pages') or 'break')
+        self.tree.bind('<Next>', lambda e: self.scroll(1, 'pages') or 'break')
+
+    def reload(self):
+        """Drop loaded rows and fetch the first page again"""
+        self.token = None
+        self.loader.load(self.name, lambda: self.fetch_page(None, self.page_size),
+                         self._first_page, self._failed, status=self.status)
+
+    def refresh(self):
+        """Re-fetch as many rows as are loaded, keeping the scroll position"""
+        limit = self.page_size * max(1, self.pages)
+        self.loader.load(self.name, lambda: self.fetch_page(None, limit),
+                         self._refreshed, self._failed, status=self.status)
+
+    def _first_page(self, page):
+        self.pages = 1
+        self.offset = 0
+        self._refreshed(page)
+
+    def _refreshed(self, page):
+        self.rows = list(page)
+        self.token = page.next_token
+        self.exhausted = page.next_token is None
+        self.render()
+
+    def _more(self):
+        """Fetch the next page unless one is on its way or none is left"""
+        if self.exhausted or self.loader.is_loading(self.name):
+            return
+        token = self.token
+        self.loader.load(self.name, lambda: self.fetch_page(token, self.page_size),
+                         self._next_page, self._failed, status=self.status)
+
+    def _next_page(self, page):
+        self.pages += 1
+        self.rows.extend(page)
+        self.token = page.next_token
+        self.exhausted = page.next_token is None
+        self.render()
+
+    def _failed(self, e):
+        messagebox.showerror("Error", f"Failed to load {self.name}: {str(e)}")
+
+    def render(self):
+        """Show the window of rows starting at offset"""
+        self.offset = max(0, min(self.offset, len(self.rows) - self.visible))
+        self.binder.update(self.rows[self.offset:self.offset + self.visible])
+
+        # Leave room below the loaded rows while more pages remain
+        total = max(1, len(self.rows) + (0 if self.exhausted else self.page_size))
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.visible) / total))
+        more = "" if self.exhausted else "+"
+        self.count_label.config(text=f"{len(self.rows)}{more} rows")
+
+        if self.offset + 2 * self.visible >= len(self.rows):
+            self._more()
+
+    def scroll(self, amount, what='units'):
+        step = self.visible if what == 'pages' else 1
+        self.offset += int(amount) * step
+        self.render()
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, what)"""
+        if args[0] == 'moveto':
+            total = len(self.rows) + (0 if self.exhausted else self.page_size)
+            self.offset = int(float(args[1]) * total)
+            self.render()
+        elif args[0] == 'scroll':
+            self.scroll(args[1], args[2])
+
+    def _on_key(self, event):
+        """Scroll the window when the cursor moves past its edge"""
+        focus = self.tree.focus()
+        children = self.tree.get_children()
+        if not children or focus not in children:
+            return None
+        index = children.index(focus)
+        step = -1 if event.keysym == 'Up' else 1
+        if 0 <= index + step < len(children):
+            return None
+        self.scroll(step)
+        children = self.tree.get_children()
+        if children:
+            target = children[0] if step < 0 else children[-1]
+            self.tree.selection_set(target)
+            self.tree.focus(target)
+        return 'break'
+
+    def _on_resize(self, event):
+        rowheight = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        visible = max(1, (event.height - rowheight) // rowheight)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+class LazyNotebook(ttk.Notebook):
+    """Notebook whose tabs are built the first time they are selected
+
+    add_lazy(name, text, build) adds an empty frame and calls build(frame)
+    on first selection, so opening a dashboard only pays for the tab on
+    screen. Build times are kept in timings (milliseconds) and printed.
+    """
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._frames = {}   # name -> frame
+        self._builders = {} # name -> build function, until built
+        self.timings = {}
+        self.bind('<<NotebookTabChanged>>', lambda e: self._build_selected())
+
+    def add_lazy(self, name, text, build):
+        frame = tk.Frame(self)
+        self._frames[name] = frame
+        self._builders[name] = build
+        self.add(frame, text=text)
+        self._build_selected()
+        return frame
+
+    def is_built(self, name):
+        return name in self._frames and name not in self._builders
+
+    def is_selected(self, name):
+        return name in self._frames and str(self._frames[name]) == str(self.select())
+
+    def build(self, name):
+        """Build the tab now if it hasn't been built yet"""
+        build = self._builders.pop(name, None)
+        if build is None:
+            return
+        start = time.perf_counter()
+        build(self._frames[name])
+        self.timings[name] = (time.perf_counter() - start) * 1000
+        print(f"Built {name} tab in {self.timings[name]:.1f} ms")
+
+    def _build_selected(self):
+        selected = str(self.select())
+        for name, frame in self._frames.items():
+            if str(frame) == selected:
+                self.build(name)
+                return
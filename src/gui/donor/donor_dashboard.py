@@ -1,8 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from src.config.database import db
 from src.models.donor import Donor
 from src.models.blood_request import BloodRequest
 from src.models.donor_match import DonorMatch
+from src.models.rematch import rematch_worker
+from src.models.change_feed import change_feed
+from src.gui.common.background import BackgroundLoader, ChangeWatcher
+from src.gui.common.widgets import TreeviewBinder
+from src.utils.helpers import format_date
 
 class DonorDashboard:
     def __init__(self, parent, user):
@@ -11,6 +17,7 @@ class DonorDashboard:
         self.donor = None
         
         self.window = tk.Toplevel()
+        self.loader = BackgroundLoader(self.window)
         self.window.title(f"Donor Dashboard - {user['user_name']}")
         self.window.geometry("1200x700")
         
@@ -25,6 +32,10 @@ class DonorDashboard:
         
         self.create_widgets()
         
+        # Refresh when a new match arrives or a donation is recorded
+        self.watcher = ChangeWatcher(self.window, change_feed, ['DONOR_MATCH', 'DONATION_RECORD'],
+                                     self.on_data_changed)
+        
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
     
     def center_window(self):
@@ -139,6 +150,16 @@ Status: {'Available ✅' if self.donor.get('is_available', False) else 'Unavaila
         self.matches_tree.column('Status', width=80)
         
         self.matches_tree.pack(fill='both', expand=True)
+        self.matches_rows = TreeviewBinder(self.matches_tree, 'match_id', lambda match: (
+            match.get('match_id', 'N/A'),
+            match.get('patient_name', 'N/A'),
+            match.get('blood_group_needed', 'N/A'),
+            match.get('urgency', 'N/A'),
+            match.get('units_needed', 'N/A'),
+            match.get('hospital_name', 'N/A'),
+            format_date(match.get('request_date')),
+            match.get('match_status', 'N/A')
+        ))
         
         # Action buttons for matches
         match_btn_frame = tk.Frame(matches_frame, bg='#fff3cd')
@@ -152,6 +173,8 @@ Status: {'Available ✅' if self.donor.get('is_available', False) else 'Unavaila
                  command=self.decline_request).pack(side='left', padx=5)
         tk.Button(match_btn_frame, text="View Details", bg='#17a2b8', fg='white',
                  command=self.view_match_details).pack(side='left', padx=5)
+        self.matches_status = tk.Label(match_btn_frame, text="", bg='#fff3cd', fg='#6c757d')
+        self.matches_status.pack(side='right', padx=5)
         
         # Right column - Donation History
         right_frame = tk.Frame(main_frame)
@@ -188,50 +211,56 @@ Status: {'Available ✅' if self.donor.get('is_available', False) else 'Unavaila
         self.history_tree.column('Next Eligible', width=120)
         
         self.history_tree.pack(fill='both', expand=True)
+        self.history_rows = TreeviewBinder(self.history_tree, 'donation_id', lambda record: (
+            record.get('donation_id', 'N/A'),
+            format_date(record.get('donation_date')),
+            record.get('hospital_name', 'N/A'),
+            record.get('units_donated', 'N/A'),
+            record.get('status', 'N/A'),
+            format_date(record.get('next_eligible_date'))
+        ))
         
         # Refresh button for history
         tk.Button(history_frame, text="Refresh History", bg='#007bff', fg='white', 
-                 command=self.load_history).pack(pady=10)
+                 command=self.load_history).pack(pady=(10, 0))
+        self.history_status = tk.Label(history_frame, text="", fg='#6c757d')
+        self.history_status.pack()
         
         # Load initial data
         self.load_matches()
         self.load_history()
     
-    def load_matches(self):
-        """Load pending blood requests matched to this donor"""
-        # Clear existing items
-        for item in self.matches_tree.get_children():
-            self.matches_tree.delete(item)
+    def load_matches(self, quiet=False):
+        """Load pending blood requests matched to this donor in the background
         
-        try:
-            # Get matches for this donor
-            matches = DonorMatch.get_by_donor_id(self.donor['donor_id'])
-            
-            for match in matches:
-                # Only show matched or contacted status (not confirmed/rejected)
-                if match.get('match_status') in ['matched', 'contacted']:
-                    request_date = match.get('request_date')
-                    date_str = request_date.strftime('%Y-%m-%d') if request_date else 'N/A'
-                    
-                    self.matches_tree.insert('', 'end', values=(
-                        match.get('match_id', 'N/A'),
-                        match.get('patient_name', 'N/A'),
-                        match.get('blood_group_needed', 'N/A'),
-                        match.get('urgency', 'N/A'),
-                        match.get('units_needed', 'N/A'),
-                        match.get('hospital_name', 'N/A'),
-                        date_str,
-                        match.get('match_status', 'N/A')
-                    ))
-            
-            # Update count in label
-            count = len(self.matches_tree.get_children())
+        quiet only announces matches that weren't already shown, for
+        refreshes the user didn't ask for.
+        """
+        self.loader.load('matches', lambda: DonorMatch.get_by_donor_id(self.donor['donor_id']),
+                         lambda matches: self.show_matches(matches, quiet),
+                         self.matches_failed, status=self.matches_status)
+    
+    def show_matches(self, matches, quiet=False):
+        """Show pending matches, changing only rows that differ"""
+        shown = set(self.matches_tree.get_children())
+        
+        # Only show matched or contacted status (not confirmed/rejected)
+        self.matches_rows.update(match for match in matches
+                                 if match.get('match_status') in ['matched', 'contacted'])
+        
+        # Update count in label
+        if quiet:
+            count = len(set(self.matches_tree.get_children()) - shown)
             if count > 0:
-                messagebox.showinfo("New Matches!", f"You have {count} pending blood request(s) matched to you!")
-                
-        except Exception as e:
-            print(f"Error loading matches: {e}")
-            messagebox.showerror("Error", f"Failed to load matches: {str(e)}")
+                messagebox.showinfo("New Matches!", f"You have {count} new blood request(s) matched to you!")
+            return
+        count = len(self.matches_tree.get_children())
+        if count > 0:
+            messagebox.showinfo("New Matches!", f"You have {count} pending blood request(s) matched to you!")
+    
+    def matches_failed(self, e):
+        print(f"Error loading matches: {e}")
+        messagebox.showerror("Error", f"Failed to load matches: {str(e)}")
     
     def accept_request(self):
         """Accept a blood request match"""
@@ -279,12 +308,18 @@ Status: {'Available ✅' if self.donor.get('is_available', False) else 'Unavaila
                               f"Decline blood donation request from {patient_name}?\n\n"
                               f"Another donor will be matched instead."):
             try:
-                # Update match status to rejected
-                DonorMatch.update_status(match_id, 'rejected', 
-                                        f"Donor {self.donor['name']} declined")
+                # Reject the match and free the donor in one commit
+                with db.transaction():
+                    DonorMatch.update_status(match_id, 'rejected', 
+                                            f"Donor {self.donor['name']} declined")
+                    
+                    # Make donor available again
+                    Donor.update_availability(self.donor['donor_id'], True)
                 
-                # Make donor available again
-                Donor.update_availability(self.donor['donor_id'], True)
+                # Hand the request to the next candidate donor
+                match = DonorMatch.get_by_id(match_id)
+                if match:
+                    rematch_worker.submit(match['request_id'])
                 
                 messagebox.showinfo("Request Declined", 
                                    "Request declined. The system will find another donor.")
@@ -393,31 +428,23 @@ City: {match.get('city', 'N/A')}
         except Exception as e:
             messagebox.showerror("Error", f"Failed to accept request: {str(e)}")
     
+    def on_data_changed(self, tables):
+        """Re-query only the tabs whose tables changed"""
+        if 'DONOR_MATCH' in tables:
+            self.load_matches(quiet=True)
+        if 'DONATION_RECORD' in tables:
+            self.load_history()
+    
     def load_history(self):
-        """Load donation history"""
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
-        
-        try:
-            history = Donor.get_donation_history(self.donor['donor_id'])
-            
-            for record in history:
-                next_eligible = record.get('next_eligible_date')
-                next_eligible_str = next_eligible.strftime('%Y-%m-%d') if next_eligible else 'N/A'
-                
-                donation_date = record.get('donation_date')
-                donation_date_str = donation_date.strftime('%Y-%m-%d') if donation_date else 'N/A'
-                
-                self.history_tree.insert('', 'end', values=(
-                    record.get('donation_id', 'N/A'),
-                    donation_date_str,
-                    record.get('hospital_name', 'N/A'),
-                    record.get('units_donated', 'N/A'),
-                    record.get('status', 'N/A'),
-                    next_eligible_str
-                ))
-        except Exception as e:
-            print(f"Error loading donation history: {e}")
+        """Load donation history in the background"""
+        self.loader.load('history', lambda: Donor.get_donation_history(self.donor['donor_id']),
+                         self.show_history,
+                         lambda e: print(f"Error loading donation history: {e}"),
+                         status=self.history_status)
+    
+    def show_history(self, history):
+        """Show donation history, changing only rows that differ"""
+        self.history_rows.update(history)
     
     def update_availability(self):
         """UPDATE - Update donor availability"""
@@ -431,5 +458,7 @@ City: {match.get('city', 'N/A')}
             messagebox.showerror("Error", f"Failed to update availability: {str(e)}")
     
     def on_closing(self):
+        self.watcher.close()
+        self.loader.shutdown()
         self.window.destroy()
         self.parent.deiconify()
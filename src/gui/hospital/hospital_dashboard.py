@@ -1,4 +1,5 @@
 
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
@@ -7,6 +8,10 @@ from src.models.donor_match import DonorMatch
 from src.models.blood_request import BloodRequest
 from src.models.donation_record import DonationRecord
 from src.models.hospital_staff import HospitalStaff
+from src.models.change_feed import change_feed
+from src.gui.common.background import BackgroundLoader, ChangeWatcher
+from src.gui.common.widgets import TreeviewBinder, LazyNotebook
+from src.utils.helpers import format_date
 
 class HospitalDashboard:
     def __init__(self, parent, user):
@@ -15,6 +20,7 @@ class HospitalDashboard:
         self.staff = None
         
         self.window = tk.Toplevel()
+        self.loader = BackgroundLoader(self.window)
         self.window.title(f"Hospital Staff Dashboard - {user['user_name']}")
         self.window.geometry("1200x700")
         
@@ -27,7 +33,13 @@ class HospitalDashboard:
             self.parent.deiconify()
             return
         
+        start = time.perf_counter()
         self.create_widgets()
+        print(f"Hospital dashboard ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+        
+        # Refresh when another client changes matches or donations
+        self.watcher = ChangeWatcher(self.window, change_feed, ['DONOR_MATCH', 'DONATION_RECORD'],
+                                     self.on_data_changed)
         
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
     
@@ -64,24 +76,18 @@ class HospitalDashboard:
             fg='white'
         ).pack(pady=15)
         
-        # Tabs
-        notebook = ttk.Notebook(self.window)
-        notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        # Tabs, each built and loaded on first view
+        self.notebook = LazyNotebook(self.window)
+        self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
         # Tab 1: Confirmed Matches (Need Scheduling)
-        confirmed_tab = tk.Frame(notebook)
-        notebook.add(confirmed_tab, text='✅ Confirmed Matches')
-        self.create_confirmed_tab(confirmed_tab)
+        self.notebook.add_lazy('confirmed', '✅ Confirmed Matches', self.create_confirmed_tab)
         
         # Tab 2: Scheduled Donations (Need Completion)
-        scheduled_tab = tk.Frame(notebook)
-        notebook.add(scheduled_tab, text='📅 Scheduled Donations')
-        self.create_scheduled_tab(scheduled_tab)
+        self.notebook.add_lazy('scheduled', '📅 Scheduled Donations', self.create_scheduled_tab)
         
         # Tab 3: Completed Donations
-        completed_tab = tk.Frame(notebook)
-        notebook.add(completed_tab, text='✔️ Completed Donations')
-        self.create_completed_tab(completed_tab)
+        self.notebook.add_lazy('completed', '✔️ Completed Donations', self.create_completed_tab)
     
     def create_confirmed_tab(self, parent):
         """Confirmed matches waiting to be scheduled"""
@@ -102,6 +108,8 @@ class HospitalDashboard:
                  command=self.load_confirmed).pack(side='left', padx=5)
         tk.Button(btn_frame, text="Schedule Donation", bg='#28a745', fg='white', font=('Arial', 10, 'bold'),
                  command=self.schedule_donation).pack(side='left', padx=5)
+        self.confirmed_status = tk.Label(btn_frame, text="", fg='#6c757d')
+        self.confirmed_status.pack(side='right', padx=5)
         
         # Treeview
         tree_frame = tk.Frame(frame)
@@ -133,6 +141,15 @@ class HospitalDashboard:
         self.confirmed_tree.column('Phone', width=120)
         
         self.confirmed_tree.pack(fill='both', expand=True)
+        self.confirmed_rows = TreeviewBinder(self.confirmed_tree, 'match_id', lambda match: (
+            match['match_id'],
+            match.get('donor_name', 'N/A'),
+            match.get('patient_name', 'N/A'),
+            match['blood_group_needed'],
+            match['urgency'],
+            match['units_needed'],
+            match.get('donor_phone', 'N/A')
+        ))
         
         self.load_confirmed()
     
@@ -157,6 +174,8 @@ class HospitalDashboard:
                  command=self.complete_donation).pack(side='left', padx=5)
         tk.Button(btn_frame, text="Cancel Donation", bg='#dc3545', fg='white',
                  command=self.cancel_donation).pack(side='left', padx=5)
+        self.scheduled_status = tk.Label(btn_frame, text="", fg='#6c757d')
+        self.scheduled_status.pack(side='right', padx=5)
         
         # Treeview
         tree_frame = tk.Frame(frame)
@@ -180,6 +199,15 @@ class HospitalDashboard:
         self.scheduled_tree.heading('Status', text='Status')
         
         self.scheduled_tree.pack(fill='both', expand=True)
+        self.scheduled_rows = TreeviewBinder(self.scheduled_tree, 'donation_id', lambda donation: (
+            donation['donation_id'],
+            donation['donor_name'],
+            donation.get('patient_name', 'N/A'),
+            donation['blood_group'],
+            donation['units_donated'],
+            format_date(donation.get('donation_date')),
+            donation['status']
+        ))
         
         self.load_scheduled()
     
@@ -194,6 +222,8 @@ class HospitalDashboard:
         
         tk.Button(btn_frame, text="Refresh", bg='#007bff', fg='white', 
                  command=self.load_completed).pack(side='left', padx=5)
+        self.completed_status = tk.Label(btn_frame, text="", fg='#6c757d')
+        self.completed_status.pack(side='right', padx=5)
         
         # Treeview
         tree_frame = tk.Frame(frame)
@@ -216,96 +246,84 @@ class HospitalDashboard:
         self.completed_tree.heading('Next Eligible', text='Next Eligible')
         
         self.completed_tree.pack(fill='both', expand=True)
+        self.completed_rows = TreeviewBinder(self.completed_tree, 'donation_id', lambda donation: (
+            donation['donation_id'],
+            donation['donor_name'],
+            donation['blood_group'],
+            donation['units_donated'],
+            format_date(donation.get('donation_date')),
+            format_date(donation.get('next_eligible_date'))
+        ))
         
         self.load_completed()
     
-    def load_confirmed(self):
-        """Load confirmed matches"""
-        for item in self.confirmed_tree.get_children():
-            self.confirmed_tree.delete(item)
-        
-        try:
-            # Debug: Print hospital_id
-            print(f"DEBUG: Loading confirmed matches for hospital_id: {self.staff['hospital_id']}")
-            
-            matches = DonorMatch.get_confirmed_by_hospital(self.staff['hospital_id'])
-            
-            print(f"DEBUG: Found {len(matches)} confirmed matches")
-            
-            for match in matches:
-                print(f"DEBUG: Match - {match}")
-                self.confirmed_tree.insert('', 'end', values=(
-                    match['match_id'],
-                    match.get('donor_name', 'N/A'),
-                    match.get('patient_name', 'N/A'),
-                    match['blood_group_needed'],
-                    match['urgency'],
-                    match['units_needed'],
-                    match.get('donor_phone', 'N/A')
-                ))
-                
-            # Show count
-            count = len(matches)
-            if count == 0:
-                messagebox.showinfo("No Matches", "No confirmed matches found for your hospital.")
-            else:
-                print(f"Loaded {count} confirmed matches")
-                
-        except Exception as e:
-            print(f"Error loading confirmed matches: {e}")
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("Error", f"Failed to load confirmed matches: {str(e)}")
+    def load_confirmed(self, quiet=False):
+        """Load confirmed matches in the background
+        
+        quiet skips the "No Matches" popup, for refreshes the user didn't ask for.
+        """
+        if not self.notebook.is_built('confirmed'):
+            return  # loads when first opened
+        # Debug: Print hospital_id
+        print(f"DEBUG: Loading confirmed matches for hospital_id: {self.staff['hospital_id']}")
+        
+        self.loader.load('confirmed',
+                         lambda: DonorMatch.get_confirmed_by_hospital(self.staff['hospital_id']),
+                         lambda matches: self.show_confirmed(matches, quiet),
+                         self.confirmed_failed, status=self.confirmed_status)
+    
+    def show_confirmed(self, matches, quiet=False):
+        """Show confirmed matches, changing only rows that differ"""
+        print(f"DEBUG: Found {len(matches)} confirmed matches")
+        
+        self.confirmed_rows.update(matches)
+        
+        # Show count
+        count = len(matches)
+        if count == 0 and not quiet:
+            messagebox.showinfo("No Matches", "No confirmed matches found for your hospital.")
+        else:
+            print(f"Loaded {count} confirmed matches")
+    
+    def confirmed_failed(self, e):
+        print(f"Error loading confirmed matches: {e}")
+        messagebox.showerror("Error", f"Failed to load confirmed matches: {str(e)}")
     
     def load_scheduled(self):
-        """Load scheduled donations"""
-        for item in self.scheduled_tree.get_children():
-            self.scheduled_tree.delete(item)
-        
-        try:
-            donations = DonationRecord.get_scheduled_by_hospital(self.staff['hospital_id'])
-            
-            for donation in donations:
-                donation_date = donation.get('donation_date')
-                date_str = donation_date.strftime('%Y-%m-%d') if donation_date else 'N/A'
-                
-                self.scheduled_tree.insert('', 'end', values=(
-                    donation['donation_id'],
-                    donation['donor_name'],
-                    donation.get('patient_name', 'N/A'),
-                    donation['blood_group'],
-                    donation['units_donated'],
-                    date_str,
-                    donation['status']
-                ))
-        except Exception as e:
-            print(f"Error loading scheduled donations: {e}")
+        """Load scheduled donations in the background"""
+        if not self.notebook.is_built('scheduled'):
+            return  # loads when first opened
+        self.loader.load('scheduled',
+                         lambda: DonationRecord.get_scheduled_by_hospital(self.staff['hospital_id']),
+                         self.show_scheduled,
+                         lambda e: print(f"Error loading scheduled donations: {e}"),
+                         status=self.scheduled_status)
+    
+    def show_scheduled(self, donations):
+        """Show scheduled donations, changing only rows that differ"""
+        self.scheduled_rows.update(donations)
     
     def load_completed(self):
-        """Load completed donations"""
-        for item in self.completed_tree.get_children():
-            self.completed_tree.delete(item)
-        
-        try:
-            donations = DonationRecord.get_completed_by_hospital(self.staff['hospital_id'])
-            
-            for donation in donations:
-                donation_date = donation.get('donation_date')
-                date_str = donation_date.strftime('%Y-%m-%d') if donation_date else 'N/A'
-                
-                next_eligible = donation.get('next_eligible_date')
-                next_str = next_eligible.strftime('%Y-%m-%d') if next_eligible else 'N/A'
-                
-                self.completed_tree.insert('', 'end', values=(
-                    donation['donation_id'],
-                    donation['donor_name'],
-                    donation['blood_group'],
-                    donation['units_donated'],
-                    date_str,
-                    next_str
-                ))
-        except Exception as e:
-            print(f"Error loading completed donations: {e}")
+        """Load completed donations in the background"""
+        if not self.notebook.is_built('completed'):
+            return  # loads when first opened
+        self.loader.load('completed',
+                         lambda: DonationRecord.get_completed_by_hospital(self.staff['hospital_id']),
+                         self.show_completed,
+                         lambda e: print(f"Error loading completed donations: {e}"),
+                         status=self.completed_status)
+    
+    def show_completed(self, donations):
+        """Show completed donations, changing only rows that differ"""
+        self.completed_rows.update(donations)
+    
+    def on_data_changed(self, tables):
+        """Re-query only the tabs whose tables changed"""
+        if 'DONOR_MATCH' in tables:
+            self.load_confirmed(quiet=True)
+        if 'DONATION_RECORD' in tables:
+            self.load_scheduled()
+            self.load_completed()
     
     def schedule_donation(self):
         """Schedule a donation from confirmed match"""
@@ -428,6 +446,8 @@ class HospitalDashboard:
                 messagebox.showerror("Error", f"Failed to cancel donation: {str(e)}")
     
     def on_closing(self):
+        self.watcher.close()
+        self.loader.shutdown()
         self.window.destroy()
         self.parent.deiconify()
 
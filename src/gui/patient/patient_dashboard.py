@@ -3,17 +3,31 @@ from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
 from tkcalendar import DateEntry
 from src.models.blood_request import BloodRequest
-from src.models.donor import Donor
 from src.models.hospital import Hospital
 from src.models.patient import Patient
+from src.models.matching import DonorMatcher
+from src.models.ranking import rank_donors
+from src.models.pagination import DEFAULT_PAGE_SIZE
+from src.models.change_feed import change_feed
+from src.utils.constants import BLOOD_GROUPS
+from src.gui.common.background import BackgroundLoader, ChangeWatcher
+from src.gui.common.widgets import TreeviewBinder
+from src.utils.helpers import format_date
 
 class PatientDashboard:
+    
+    # Donors listed by a donor search
+    SEARCH_RESULTS = 50
+    
     def __init__(self, parent, user):
         self.parent = parent
         self.user = user
         self.patient = None
+        self.requests_token = None
+        self.requests_pages = 1
         
         self.window = tk.Toplevel()
+        self.loader = BackgroundLoader(self.window)
         self.window.title(f"Patient Dashboard - {user['user_name']}")
         self.window.geometry("1200x700")
         
@@ -30,6 +44,10 @@ class PatientDashboard:
         self.create_widgets()
         self.load_requests()
         
+        # Refresh when a request's status or match changes elsewhere
+        self.watcher = ChangeWatcher(self.window, change_feed, ['BLOOD_REQUEST', 'DONOR_MATCH'],
+                                     self.on_data_changed)
+        
         self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
     
     def center_window(self):
@@ -87,8 +105,7 @@ class PatientDashboard:
         # Blood Group
         tk.Label(left_frame, text="Blood Group:", font=('Arial', 10)).grid(row=row, column=0, sticky='w', pady=5)
         self.blood_group_var = tk.StringVar(value='O+')
-        blood_groups = ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-']
-        blood_group_combo = ttk.Combobox(left_frame, textvariable=self.blood_group_var, values=blood_groups, state='readonly', width=25)
+        blood_group_combo = ttk.Combobox(left_frame, textvariable=self.blood_group_var, values=BLOOD_GROUPS, state='readonly', width=25)
         blood_group_combo.grid(row=row, column=1, pady=5, sticky='w')
         row += 1
         
@@ -125,8 +142,9 @@ class PatientDashboard:
         btn_frame = tk.Frame(left_frame)
         btn_frame.grid(row=row, column=0, columnspan=2, pady=15)
         
-        tk.Button(btn_frame, text="Create Request", bg='#28a745', fg='white', font=('Arial', 11, 'bold'), 
-                 width=15, command=self.create_request).pack(side='left', padx=5)
+        self.create_btn = tk.Button(btn_frame, text="Create Request", bg='#28a745', fg='white', font=('Arial', 11, 'bold'), 
+                                    width=15, command=self.create_request)
+        self.create_btn.pack(side='left', padx=5)
         tk.Button(btn_frame, text="Clear Form", bg='#6c757d', fg='white', font=('Arial', 11), 
                  width=15, command=self.clear_form).pack(side='left', padx=5)
         
@@ -169,6 +187,17 @@ class PatientDashboard:
         self.tree.column('Donor', width=120)
         
         self.tree.pack(fill='both', expand=True)
+        # A request is listed once per match, so key on both
+        self.request_rows = TreeviewBinder(
+            self.tree, lambda req: f"{req['request_id']}:{req.get('match_id')}", lambda req: (
+                req['request_id'],
+                req['blood_group_needed'],
+                req['urgency'],
+                req['status'],
+                req['units_needed'],
+                format_date(req.get('request_date'), '%Y-%m-%d %H:%M'),
+                req.get('donor_name', 'Not Matched')
+            ))
         
         # Action buttons
         action_frame = tk.Frame(right_frame)
@@ -177,7 +206,13 @@ class PatientDashboard:
         tk.Button(action_frame, text="Refresh", bg='#007bff', fg='white', command=self.load_requests).pack(side='left', padx=5)
         tk.Button(action_frame, text="View Details", bg='#17a2b8', fg='white', command=self.view_details).pack(side='left', padx=5)
         tk.Button(action_frame, text="Cancel Request", bg='#dc3545', fg='white', command=self.cancel_request).pack(side='left', padx=5)
-        tk.Button(action_frame, text="Search Donors", bg='#ffc107', command=self.search_donors).pack(side='left', padx=5)
+        self.search_btn = tk.Button(action_frame, text="Search Donors", bg='#ffc107', command=self.search_donors)
+        self.search_btn.pack(side='left', padx=5)
+        self.load_more_btn = tk.Button(action_frame, text="Load More", bg='#6c757d', fg='white',
+                                       state='disabled', command=self.load_more_requests)
+        self.load_more_btn.pack(side='right', padx=5)
+        self.requests_status = tk.Label(action_frame, text="", fg='#6c757d')
+        self.requests_status.pack(side='right', padx=5)
     
     def load_hospitals(self):
         """Load hospitals into combobox"""
@@ -190,36 +225,52 @@ class PatientDashboard:
         except Exception as e:
             print(f"Error loading hospitals: {e}")
     
-    def load_requests(self):
-        """Load all blood requests for this patient"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def load_requests(self, keep_pages=False):
+        """Reload the first page of blood requests for this patient
         
-        try:
-            # Fetch requests
-            requests = BloodRequest.get_all()
-            
-            # Filter by current user
-            user_requests = [r for r in requests if r.get('patient_name') == self.user['user_name']]
-            
-            for req in user_requests:
-                donor_name = req.get('donor_name', 'Not Matched')
-                request_date = req.get('request_date')
-                date_str = request_date.strftime('%Y-%m-%d %H:%M') if request_date else 'N/A'
-                
-                self.tree.insert('', 'end', values=(
-                    req['request_id'],
-                    req['blood_group_needed'],
-                    req['urgency'],
-                    req['status'],
-                    req['units_needed'],
-                    date_str,
-                    donor_name
-                ))
-        except Exception as e:
-            print(f"Error loading requests: {e}")
-            messagebox.showerror("Error", f"Failed to load requests: {str(e)}")
+        keep_pages reloads every page loaded so far instead, so a live
+        refresh doesn't shrink the table.
+        """
+        if not keep_pages:
+            self.requests_pages = 1
+        self.requests_token = None
+        self.load_more_requests(replace=True)
+    
+    def load_more_requests(self, replace=False):
+        """Fetch the next page of this patient's blood requests in the background
+        
+        With replace the rows replace the table instead of extending it.
+        """
+        self.load_more_btn.config(state='disabled')
+        # Filtered by user in SQL, one page at a time
+        user_id, token = self.user['user_id'], self.requests_token
+        limit = DEFAULT_PAGE_SIZE * self.requests_pages if replace else DEFAULT_PAGE_SIZE
+        self.loader.load('requests', lambda: BloodRequest.get_by_user(user_id, after=token, limit=limit),
+                         lambda page: self.show_requests(page, replace),
+                         self.requests_failed, status=self.requests_status)
+    
+    def show_requests(self, user_requests, replace=False):
+        """Add a page of requests to the table
+        
+        A reload diffs the first page against the rows shown, so only
+        changed requests are touched.
+        """
+        self.requests_token = user_requests.next_token
+        self.load_more_btn.config(state='normal' if self.requests_token else 'disabled')
+        
+        if replace:
+            self.request_rows.update(user_requests)
+        else:
+            self.requests_pages += 1
+            self.request_rows.extend(user_requests)
+    
+    def on_data_changed(self, tables):
+        """Requests or their matches changed; refresh the loaded rows"""
+        self.load_requests(keep_pages=True)
+    
+    def requests_failed(self, e):
+        print(f"Error loading requests: {e}")
+        messagebox.showerror("Error", f"Failed to load requests: {str(e)}")
     
     def create_request(self):
         """CREATE - Create new blood request"""
@@ -241,29 +292,37 @@ class PatientDashboard:
                 messagebox.showerror("Error", "Please provide medical reason")
                 return
             
-            # Create request (trigger will auto-match donor)
-            result = BloodRequest.create(
-                self.user['user_id'],
-                hospital_id,
-                blood_group,
-                urgency,
-                units,
-                reason,
-                required_date
-            )
-            
-            match_info = ""
-            if result['match']:
-                match_info = f"\n\n✅ Donor Matched: {result['match']['name']}\nPhone: {result['match']['phone']}"
-            else:
-                match_info = "\n\n⚠️ No donor matched yet. We'll notify you when a donor is available."
-            
-            messagebox.showinfo("Success", f"Blood request created successfully!{match_info}")
-            self.clear_form()
-            self.load_requests()
+            # Create request (trigger will auto-match donor); matching may
+            # rank many donors, so it runs in the background
+            user_id = self.user['user_id']
+            self.create_btn.config(state='disabled')
+            self.loader.load('create', lambda: BloodRequest.create(user_id, hospital_id, blood_group, urgency,
+                                                                   units, reason, required_date),
+                             self.request_created, self.create_failed)
             
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to create request: {str(e)}")
+            self.create_failed(e)
+    
+    def request_created(self, result):
+        self.create_btn.config(state='normal')
+        match_info = ""
+        if result['match']:
+            match_info = f"\n\n✅ Donor Matched: {result['match']['name']}\nPhone: {result['match']['phone']}"
+        else:
+            match_info = "\n\n⚠️ No donor matched yet. We'll notify you when a donor is available."
+        
+        if result.get('candidates'):
+            backups = "\n".join(f"  {donor['name']} ({donor['blood_group']}) - {donor.get('phone', 'N/A')}"
+                                for _, _, donor in result['candidates'])
+            match_info += f"\n\nTop ranked donors:\n{backups}"
+        
+        messagebox.showinfo("Success", f"Blood request created successfully!{match_info}")
+        self.clear_form()
+        self.load_requests()
+    
+    def create_failed(self, e):
+        self.create_btn.config(state='normal')
+        messagebox.showerror("Error", f"Failed to create request: {str(e)}")
     
     def view_details(self):
         """READ - View request details"""
@@ -334,36 +393,61 @@ Match Status: {match['match_status']}
                 messagebox.showerror("Error", f"Failed to cancel request: {str(e)}")
     
     def search_donors(self):
-        """READ - Search available donors"""
+        """READ - Search the nearest available donors of every compatible blood group"""
         blood_group = self.blood_group_var.get()
-        donors = Donor.get_available(blood_group)
+        hospital_text = self.hospital_var.get()
+        hospital_id = int(hospital_text.split(' - ')[0]) if hospital_text else None
+        limit = self.SEARCH_RESULTS
+        
+        def search():
+            # Nearest to the selected hospital, ranked by donor score
+            if hospital_id is not None:
+                return DonorMatcher.rank_candidates(hospital_id, blood_group, limit=limit)
+            return rank_donors([(None, donor) for donor in DonorMatcher.find_candidates(blood_group, limit)],
+                               limit)
+        
+        self.search_btn.config(state='disabled')
+        self.loader.load('search', search, lambda ranking: self.show_search_results(blood_group, ranking),
+                         self.search_failed)
+    
+    def search_failed(self, error):
+        self.search_btn.config(state='normal')
+        messagebox.showerror("Error", f"Failed to search donors: {error}")
+    
+    def show_search_results(self, blood_group, ranking):
+        """Show a donor search in its own window"""
+        self.search_btn.config(state='normal')
         
         # Create search window
         search_window = tk.Toplevel(self.window)
-        search_window.title(f"Available Donors - {blood_group}")
-        search_window.geometry("700x400")
+        search_window.title(f"Compatible Donors - {blood_group}")
+        search_window.geometry("840x400")
         
-        tk.Label(search_window, text=f"Available Donors for {blood_group}", 
+        tk.Label(search_window, text=f"Compatible Donors for {blood_group} (best match first)", 
                 font=('Arial', 14, 'bold')).pack(pady=10)
         
         # Treeview
-        tree = ttk.Treeview(search_window, columns=('ID', 'Name', 'Blood', 'Phone', 'City', 'Last Donation'), show='headings')
+        tree = ttk.Treeview(search_window, columns=('ID', 'Name', 'Blood', 'Phone', 'City', 'Distance', 'Last Donation', 'Score'), show='headings')
         
         tree.heading('ID', text='Donor ID')
         tree.heading('Name', text='Name')
         tree.heading('Blood', text='Blood Group')
         tree.heading('Phone', text='Phone')
         tree.heading('City', text='Pincode')
+        tree.heading('Distance', text='Distance')
         tree.heading('Last Donation', text='Last Donation')
+        tree.heading('Score', text='Score')
         
         tree.column('ID', width=70)
         tree.column('Name', width=150)
         tree.column('Blood', width=90)
         tree.column('Phone', width=120)
         tree.column('City', width=80)
+        tree.column('Distance', width=80)
         tree.column('Last Donation', width=120)
+        tree.column('Score', width=60)
         
-        for donor in donors:
+        for score, distance, donor in ranking:
             last_donation = donor.get('last_donation_date')
             last_donation_str = last_donation.strftime('%Y-%m-%d') if last_donation else 'Never'
             
@@ -373,12 +457,14 @@ Match Status: {match['match_status']}
                 donor['blood_group'],
                 donor.get('phone', 'N/A'),
                 donor['city_pincode'],
-                last_donation_str
+                f"{distance:.1f} km" if distance is not None else 'N/A',
+                last_donation_str,
+                f"{score:.2f}"
             ))
         
         tree.pack(fill='both', expand=True, padx=10, pady=10)
         
-        tk.Label(search_window, text=f"Total Available Donors: {len(donors)}", 
+        tk.Label(search_window, text=f"Best {len(ranking)} Available Donors", 
                 font=('Arial', 11)).pack(pady=5)
     
     def clear_form(self):
@@ -391,5 +477,7 @@ Match Status: {match['match_status']}
     
     def on_closing(self):
         """Handle window close"""
+        self.watcher.close()
+        self.loader.shutdown()
         self.window.destroy()
         self.parent.deiconify()
\ No newline at end of file
@@ -1,5 +1,9 @@
 import tkinter as tk
 from src.config.database import db
+from src.models.rematch import rematch_worker
+from src.models.change_feed import change_feed
+from src.models.proximity import locator
+from src.utils.cache import cache_stats
 from src.gui.login_window import LoginWindow
 
 def main():
@@ -8,6 +12,15 @@ def main():
         print("Failed to connect to database. Exiting...")
         return
     
+    # Rematch requests in the background when donors decline
+    rematch_worker.start()
+    
+    # One cheap poll tells every open dashboard which tables changed
+    change_feed.start()
+    
+    # Load the donor proximity index before the first request needs it
+    locator.refresh_async()
+    
     # Create main window
     root = tk.Tk()
     app = LoginWindow(root)
@@ -15,7 +28,16 @@ def main():
     # Run application
     root.mainloop()
     
+    for name, stats in cache_stats().items():
+        print(f"Cache {name}: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evictions")
+    stats = db.query_cache.stats()
+    print(f"Query cache: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['evictions']} evictions, {stats['invalidations']} invalidations")
+    
     # Disconnect database when closing
+    change_feed.stop()
+    rematch_worker.stop()
     db.disconnect()
 
 if __name__ == "__main__":
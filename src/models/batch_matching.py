@@ -0,0 +1,152 @@
+import argparse
+from src.config.database import db
+from src.models.blood_request import BloodRequest
+from src.models.donor import Donor
+from src.models.donor_match import DonorMatch
+from src.models.proximity import locator
+from src.utils.constants import COMPATIBLE_DONORS
+from src.utils.geo import haversine_km
+
+# Extra cost (in km) of each step down a recipient's donor preference
+# list, so a nearby exact match beats a slightly closer O- donor
+GROUP_PENALTY_KM = 50.0
+
+# Cost standing in for the distance when a hospital or donor can't be placed
+UNKNOWN_DISTANCE_KM = 500.0
+
+class BatchMatcher:
+    """Match a backlog of pending requests in one pass
+
+    Requests are taken most urgent first (then earliest required_by_date)
+    and each gets the cheapest donor not yet booked, where cost is the
+    distance to the hospital plus a penalty for using a less preferred
+    compatible group. The whole assignment is written in one transaction
+    with a single bulk insert into DONOR_MATCH.
+    """
+
+    def __init__(self, pincodes=None):
+        self.pincodes = pincodes or locator.pincodes
+
+    def _donor_pool(self):
+        """Eligible donors by blood group as (placed, unplaced) lists
+
+        placed holds (point, donor) pairs.
+        """
+        placed = {}
+        unplaced = {}
+        for donor in Donor.get_available():
+            point = self.pincodes.locate(donor['city_pincode'])
+            if point is None:
+                unplaced.setdefault(donor['blood_group'], []).append((None, donor))
+            else:
+                placed.setdefault(donor['blood_group'], []).append((point, donor))
+        return placed, unplaced
+
+    @staticmethod
+    def _next_free(queue, booked):
+        """Advance a [entries, position] queue past booked donors
+
+        Donors are only ever added to booked, so each queue is walked at
+        most once over the whole batch.
+        """
+        entries, position = queue
+        while position < len(entries) and entries[position][1]['donor_id'] in booked:
+            position += 1
+        queue[1] = position
+        return entries[position] if position < len(entries) else None
+
+    def plan(self, requests=None):
+        """Assign donors to requests without writing anything
+
+        Returns (request, donor, distance_km) triples; distance is None
+        when the hospital or donor could not be placed.
+        """
+        if requests is None:
+            requests = BloodRequest.get_unmatched()
+        placed, unplaced = self._donor_pool()
+        # Donors of one group by distance from one hospital, sorted the
+        # first time that pair is needed
+        queues = {}
+        booked = set()
+        assignments = []
+
+        for request in requests:
+            # Placed like DonorLocator.locate_hospital: pincode, then city
+            point = self.pincodes.locate_place(request.get('pincode'), request.get('city'))
+            best = None  # (cost, donor, distance_km)
+            for rank, group in enumerate(COMPATIBLE_DONORS[request['blood_group_needed']]):
+                penalty = rank * GROUP_PENALTY_KM
+                if best is not None and penalty >= best[0]:
+                    break
+                if (group, point) not in queues:
+                    if point is None:
+                        entries = [(None, donor) for _, donor in placed.get(group, [])]
+                    else:
+                        entries = sorted(((haversine_km(point, where), donor)
+                                          for where, donor in placed.get(group, [])),
+                                         key=lambda entry: entry[0])
+                    queues[(group, point)] = [entries, 0]
+                queues.setdefault((group, 'unplaced'), [unplaced.get(group, []), 0])
+
+                for key in ((group, point), (group, 'unplaced')):
+                    entry = self._next_free(queues[key], booked)
+                    if entry is None:
+                        continue
+                    distance, donor = entry
+                    cost = penalty + (UNKNOWN_DISTANCE_KM if distance is None else distance)
+                    if best is None or cost < best[0]:
+                        best = (cost, donor, distance)
+            if best is not None:
+                booked.add(best[1]['donor_id'])
+                assignments.append((request, best[1], best[2]))
+
+        return assignments
+
+    def run(self, requests=None, dry_run=False):
+        """Plan and write matches; returns the assignments written
+
+        Requests and donors are locked before writing. Requests matched,
+        cancelled or fulfilled since planning, and donors taken since,
+        are dropped from the batch rather than double-booked.
+        """
+        assignments = self.plan(requests)
+        if dry_run or not assignments:
+            return assignments
+
+        with db.transaction():
+            open_ids = BloodRequest.lock_unmatched([request['request_id'] for request, _, _ in assignments])
+            assignments = [a for a in assignments if a[0]['request_id'] in open_ids]
+            free = Donor.lock_available([donor['donor_id'] for _, donor, _ in assignments])
+            assignments = [a for a in assignments if a[1]['donor_id'] in free]
+            Donor.set_unavailable_many([donor['donor_id'] for _, donor, _ in assignments])
+            DonorMatch.create_many([
+                (request['request_id'], donor['donor_id'],
+                 f"Batch-matched {donor['blood_group']} donor for {request['blood_group_needed']}")
+                for request, donor, _ in assignments
+            ])
+        locator.remove([donor['donor_id'] for _, donor, _ in assignments])
+        return assignments
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match all pending blood requests in one batch")
+    parser.add_argument('--dry-run', action='store_true', help="print the plan without writing matches")
+    args = parser.parse_args(argv)
+
+    if not db.connect():
+        print("Failed to connect to database. Exiting...")
+        return 1
+
+    try:
+        assignments = BatchMatcher().run(dry_run=args.dry_run)
+        for request, donor, distance in assignments:
+            distance_str = f"{distance:.1f} km" if distance is not None else "distance unknown"
+            print(f"Request {request['request_id']} ({request['urgency']}, {request['blood_group_needed']}) "
+                  f"-> donor {donor['donor_id']} ({donor['blood_group']}), {distance_str}")
+        verb = "Would match" if args.dry_run else "Matched"
+        print(f"{verb} {len(assignments)} request(s)")
+    finally:
+        db.disconnect()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
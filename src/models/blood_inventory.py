@@ -1,7 +1,11 @@
 from src.config.database import db
+from src.models.pagination import paginate
 
 class BloodInventory:
     
+    # Stable sort keys for the inventory listing
+    LIST_KEYS = [('h.hospital_name', 'ASC'), ('bi.blood_group', 'ASC'), ('bi.inventory_id', 'ASC')]
+    
     @staticmethod
     def get_by_hospital(hospital_id):
         """Get inventory for a hospital"""
@@ -10,11 +14,15 @@ class BloodInventory:
             WHERE hospital_id = %s
             ORDER BY blood_group
         """
-        return db.fetch_all(query, (hospital_id,))
+        return db.fetch_all(query, (hospital_id,), cache=True)
     
     @staticmethod
-    def get_all():
-        """Get all inventory with hospital names"""
+    def get_all(after=None, limit=None):
+        """Get all inventory with hospital names
+        
+        With a limit, returns one page; pass its next_token as after to
+        continue.
+        """
         query = """
             SELECT 
                 bi.*,
@@ -25,9 +33,8 @@ class BloodInventory:
                 END as stock_status
             FROM BLOOD_INVENTORY bi
             JOIN HOSPITAL h ON bi.hospital_id = h.hospital_id
-            ORDER BY h.hospital_name, bi.blood_group
         """
-        return db.fetch_all(query)
+        return paginate(query, BloodInventory.LIST_KEYS, after, limit)
     
     @staticmethod
     def update_units(inventory_id, units_available, units_reserved, updated_by):
@@ -40,4 +47,23 @@ class BloodInventory:
                 last_updated = NOW()
             WHERE inventory_id = %s
         """
-        db.execute_query(query, (units_available, units_reserved, updated_by, inventory_id))
\ No newline at end of file
+        db.execute_query(query, (units_available, units_reserved, updated_by, inventory_id))
+    
+    @staticmethod
+    def update_units_many(updates, chunk_size=None):
+        """Update many inventory rows, committing once per chunk
+        
+        Each item holds the update_units() arguments in order:
+        (inventory_id, units_available, units_reserved, updated_by)
+        """
+        query = """
+            UPDATE BLOOD_INVENTORY
+            SET units_available = %s, 
+                units_reserved = %s,
+                updated_by = %s,
+                last_updated = NOW()
+            WHERE inventory_id = %s
+        """
+        rows = ((units_available, units_reserved, updated_by, inventory_id)
+                for inventory_id, units_available, units_reserved, updated_by in updates)
+        return db.execute_many(query, rows, chunk_size)
\ No newline at end of file
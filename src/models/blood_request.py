@@ -1,10 +1,24 @@
-from src.config.database import db
+from src.config.database import db, in_list
+from src.models.pagination import DEFAULT_PAGE_SIZE, keyset_tail, key_names, make_page
+from src.models.matching import DonorMatcher
 
 class BloodRequest:
     
+    # Sort keys shared by every request listing
+    LIST_KEYS = [('request_date', 'DESC'), ('request_id', 'DESC')]
+    
     @staticmethod
     def create(user_id, hospital_id, blood_group, urgency, units_needed, medical_reason, required_by_date):
-        """Create new blood request (Trigger will auto-match donor)"""
+        """Create new blood request
+        
+        The insert trigger matches exact blood groups; if it finds nobody,
+        the compatibility engine tries every compatible group. Only then
+        are candidates ranked, once, and saved for rematching if the donor
+        declines; requests the trigger matched are ranked by rematch()
+        if their donor ever declines. Critical requests are matched by
+        that ranking and also return the best ranked donors as backups
+        under 'candidates'.
+        """
         query = """
             INSERT INTO BLOOD_REQUEST 
             (user_id, hospital_id, blood_group_needed, urgency, status, 
@@ -18,15 +32,32 @@ class BloodRequest:
         # Check if donor was matched (by trigger)
         match = BloodRequest.get_match(request_id)
         
-        return {
+        critical = urgency == 'critical'
+        ranking = []
+        if not match:
+            ranking = DonorMatcher.rank_candidates(hospital_id, blood_group, DonorMatcher.CANDIDATE_LIST_SIZE)
+            candidates = [donor for _, _, donor in ranking] if critical else None
+            if DonorMatcher.match_request(request_id, blood_group, hospital_id, candidates):
+                match = BloodRequest.get_match(request_id)
+            DonorMatcher.save_candidates(request_id, ranking)
+        
+        result = {
             'request_id': request_id,
             'match': match
         }
+        if critical:
+            result['candidates'] = ranking[:5]
+        return result
     
     @staticmethod
-    def get_all():
-        """Get all blood requests with details"""
-        query = """
+    def _list_query(where=None, params=(), after=None, limit=None):
+        """Build a request listing that pages requests before joining details
+        
+        Paging the requests in a derived table first means a request with
+        several matches never straddles two pages.
+        """
+        tail, params = keyset_tail(BloodRequest.LIST_KEYS, after, limit, where, params)
+        query = f"""
             SELECT 
                 br.request_id,
                 br.blood_group_needed,
@@ -41,14 +72,44 @@ class BloodRequest:
                 dm.match_id,
                 d.name as donor_name,
                 dm.match_status
-            FROM BLOOD_REQUEST br
+            FROM (
+                SELECT * FROM BLOOD_REQUEST
+                {tail}
+            ) br
             LEFT JOIN PATIENT p ON br.user_id = p.user_id
             LEFT JOIN HOSPITAL h ON br.hospital_id = h.hospital_id
             LEFT JOIN DONOR_MATCH dm ON br.request_id = dm.request_id
             LEFT JOIN DONOR d ON dm.donor_id = d.donor_id
-            ORDER BY br.request_date DESC
+            ORDER BY br.request_date DESC, br.request_id DESC, dm.match_id
         """
-        return db.fetch_all(query)
+        return query, params
+    
+    @staticmethod
+    def get_all(after=None, limit=None):
+        """Get all blood requests with details, newest first
+        
+        With a limit, returns one page; pass its next_token as after to
+        continue.
+        """
+        query, params = BloodRequest._list_query(after=after, limit=limit)
+        return make_page(db.fetch_all(query, params), limit, key_names(BloodRequest.LIST_KEYS))
+    
+    @staticmethod
+    def iter_all(batch_size=None):
+        """Stream all blood requests without loading them into memory at once"""
+        query, params = BloodRequest._list_query()
+        return db.fetch_iter(query, params, batch_size=batch_size)
+    
+    @staticmethod
+    def get_by_user(user_id, after=None, limit=DEFAULT_PAGE_SIZE):
+        """Get one page of a user's blood requests, newest first
+        
+        Filters on br.user_id in SQL and pages by (request_date, request_id),
+        so each page is a range scan on the user's own requests. Pass the
+        previous page's next_token as after to continue.
+        """
+        query, params = BloodRequest._list_query("user_id = %s", (user_id,), after, limit)
+        return make_page(db.fetch_all(query, params), limit, key_names(BloodRequest.LIST_KEYS))
     
     @staticmethod
     def get_by_id(request_id):
@@ -80,6 +141,88 @@ class BloodRequest:
         """
         return db.fetch_all(query)
     
+    @staticmethod
+    def get_unmatched():
+        """Pending requests with no live donor match, most urgent first"""
+        query = """
+            SELECT br.*, h.city, h.pincode
+            FROM BLOOD_REQUEST br
+            LEFT JOIN HOSPITAL h ON br.hospital_id = h.hospital_id
+            WHERE br.status = 'pending'
+            AND NOT EXISTS (
+                SELECT 1 FROM DONOR_MATCH dm
+                WHERE dm.request_id = br.request_id
+                AND dm.match_status IN ('matched', 'contacted', 'confirmed')
+            )
+            ORDER BY FIELD(br.urgency, 'critical', 'high', 'medium', 'low'),
+                     br.required_by_date, br.request_date, br.request_id
+        """
+        return db.fetch_all(query)
+    
+    @staticmethod
+    def get_awaiting_rematch():
+        """Pending requests whose donor declined and that have no live match"""
+        query = """
+            SELECT br.request_id, br.urgency
+            FROM BLOOD_REQUEST br
+            WHERE br.status = 'pending'
+            AND EXISTS (
+                SELECT 1 FROM DONOR_MATCH dm
+                WHERE dm.request_id = br.request_id AND dm.match_status = 'rejected'
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM DONOR_MATCH dm
+                WHERE dm.request_id = br.request_id
+                AND dm.match_status IN ('matched', 'contacted', 'confirmed')
+            )
+            ORDER BY FIELD(br.urgency, 'critical', 'high', 'medium', 'low'), br.request_id
+        """
+        return db.fetch_all(query)
+    
+    @staticmethod
+    def lock_for_rematch(request_id):
+        """Lock a request row and report whether it still needs a donor
+        
+        Must run inside db.transaction(), so two workers cannot rematch
+        the same request.
+        """
+        query = """
+            SELECT br.request_id, br.hospital_id, br.blood_group_needed, br.urgency, br.status,
+                   EXISTS (
+                       SELECT 1 FROM DONOR_MATCH dm
+                       WHERE dm.request_id = br.request_id
+                       AND dm.match_status IN ('matched', 'contacted', 'confirmed')
+                   ) AS has_live_match
+            FROM BLOOD_REQUEST br
+            WHERE br.request_id = %s
+            FOR UPDATE
+        """
+        return db.fetch_one(query, (request_id,), raise_errors=True)
+    
+    @staticmethod
+    def lock_unmatched(request_ids):
+        """Lock request rows; returns the ids still pending with no live match
+        
+        Must run inside db.transaction(), before matches are written for
+        requests chosen earlier.
+        """
+        if not request_ids:
+            return set()
+        placeholders, params = in_list(request_ids)
+        query = f"""
+            SELECT br.request_id
+            FROM BLOOD_REQUEST br
+            WHERE br.request_id IN ({placeholders})
+            AND br.status = 'pending'
+            AND NOT EXISTS (
+                SELECT 1 FROM DONOR_MATCH dm
+                WHERE dm.request_id = br.request_id
+                AND dm.match_status IN ('matched', 'contacted', 'confirmed')
+            )
+            FOR UPDATE
+        """
+        return {row['request_id'] for row in db.fetch_all(query, params, raise_errors=True)}
+    
     @staticmethod
     def update_status(request_id, new_status):
         """Update request status"""
@@ -100,6 +243,7 @@ class BloodRequest:
             FROM DONOR_MATCH dm
             JOIN DONOR d ON dm.donor_id = d.donor_id
             WHERE dm.request_id = %s
+            ORDER BY dm.match_id DESC
         """
         return db.fetch_one(query, (request_id,))
     
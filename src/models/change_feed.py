@@ -0,0 +1,118 @@
+import os
+import threading
+from src.config.database import CHANGE_TABLES, db
+
+class Subscription:
+    """Tables a subscriber watches, and the changes it hasn't taken yet"""
+
+    def __init__(self, feed, tables, callback=None):
+        self.feed = feed
+        self.tables = frozenset(tables)
+        self.callback = callback
+        self._changed = set()
+        self._lock = threading.Lock()
+
+    def notify(self, tables):
+        with self._lock:
+            self._changed |= tables
+        if self.callback:
+            self.callback(tables)
+
+    def take(self):
+        """Return and clear the watched tables changed since the last take()"""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+class ChangeFeed:
+    """Single background poller over the CHANGE_VERSION counters
+
+    Database bumps a per-table version once per statement or transaction
+    that writes a watched table, so one primary-key scan of a four-row
+    table tells every subscriber in this process which tables changed.
+    Callbacks run on the poller thread; GUI code should use
+    Subscription.take() from the Tk main thread instead.
+    """
+
+    TABLES = CHANGE_TABLES
+
+    def __init__(self, interval=None):
+        self.interval = interval or float(os.getenv('DB_CHANGE_POLL_INTERVAL', 2))
+        self.versions = None
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._failing = False
+
+    def subscribe(self, tables, callback=None):
+        """Watch tables; callback(changed_tables) is optional"""
+        subscription = Subscription(self, tables, callback)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def start(self):
+        """Start polling if it isn't running"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='change-feed', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.interval)
+
+    def poll(self):
+        """Read the counters once and notify subscribers of changed tables"""
+        try:
+            rows = db.fetch_all("SELECT table_name, version FROM CHANGE_VERSION", raise_errors=True)
+        except Exception as e:
+            # Report once, not on every poll, until it recovers. The last
+            # versions are kept, so an outage isn't reported as every
+            # table changing once the database is back.
+            if not self._failing:
+                print(f"Change feed unavailable: {e}")
+                self._failing = True
+            return set()
+        self._failing = False
+
+        versions = {row['table_name']: row['version'] for row in rows}
+        previous, self.versions = self.versions, versions
+        if previous is None:
+            return set()  # first read only sets the baseline
+
+        changed = {table for table, version in versions.items() if previous.get(table) != version}
+        if changed:
+            with self._lock:
+                subscriptions = list(self._subscriptions)
+            for subscription in subscriptions:
+                tables = changed & subscription.tables
+                if tables:
+                    try:
+                        subscription.notify(tables)
+                    except Exception as e:
+                        print(f"Error in change feed subscriber: {e}")
+        return changed
+
+change_feed = ChangeFeed()
+
+# Writes by other clients stale this process's cached query results.
+# Subscribed first, so entries are gone before any dashboard re-queries.
+change_feed.subscribe(ChangeFeed.TABLES, db.query_cache.invalidate_tables)
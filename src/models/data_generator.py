@@ -0,0 +1,433 @@
+import argparse
+import csv
+import os
+import random
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from mysql.connector import Error
+from src.config.database import db
+from src.models.donor import Donor
+from src.models.hospital import Hospital
+from src.models.patient import Patient
+from src.models.user import User
+from src.utils.constants import BLOOD_GROUPS, COMPATIBLE_DONORS, DONATION_INTERVAL_DAYS
+from src.utils.geo import DEFAULT_PINCODE_FILE
+
+# Share of the population per blood group, in percent (Indian averages)
+BLOOD_GROUP_WEIGHTS = {
+    'O+': 36.5, 'B+': 32.1, 'A+': 22.1, 'AB+': 6.6,
+    'O-': 1.2, 'B-': 0.9, 'A-': 0.4, 'AB-': 0.2,
+}
+
+# Urgency of incoming requests, in percent
+URGENCY_WEIGHTS = {'low': 30, 'medium': 35, 'high': 25, 'critical': 10}
+
+# Where people live: a pincode from the table, another pincode in the
+# same sorting district, or anywhere in the country (often unplaceable)
+PINCODE_SPREAD = {'known': 60, 'district': 30, 'anywhere': 10}
+
+# Requests newer than this are still pending; older ones are closed
+PENDING_DAYS = 14
+
+# Closed requests that found a donor; the rest were cancelled
+FULFILLED_SHARE = 0.8
+
+# Chance that a donor asked for a request declines it
+REJECTION_RATE = 0.25
+
+# Share of requests served by a compatible rather than the exact group
+CROSS_GROUP_SHARE = 0.15
+
+# Donors who have switched themselves off
+UNAVAILABLE_SHARE = 0.1
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Bhavya', 'Deepak', 'Divya',
+    'Gaurav', 'Harini', 'Ishaan', 'Kavya', 'Lakshmi', 'Manoj', 'Meera', 'Nikhil',
+    'Pooja', 'Priya', 'Rahul', 'Ravi', 'Sanjay', 'Shreya', 'Suresh', 'Tanvi',
+    'Varun', 'Vikram', 'Yash', 'Zoya',
+]
+
+LAST_NAMES = [
+    'Agarwal', 'Bhat', 'Chopra', 'Das', 'Gupta', 'Iyer', 'Joshi', 'Kapoor',
+    'Kumar', 'Menon', 'Mishra', 'Nair', 'Patel', 'Rao', 'Reddy', 'Shah',
+    'Sharma', 'Singh', 'Verma', 'Yadav',
+]
+
+MEDICAL_REASONS = [
+    'Surgery', 'Accident trauma', 'Anaemia', 'Childbirth complications',
+    'Cancer treatment', 'Thalassemia transfusion', 'Dengue', 'Dialysis',
+]
+
+def load_places(path=None):
+    """(pincode, city) pairs from the pincode table geo.py uses"""
+    path = path or os.getenv('PINCODE_FILE') or DEFAULT_PINCODE_FILE
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(row['pincode'].strip(), row.get('city', '').strip()) for row in csv.DictReader(f)]
+
+class DataGenerator:
+    """Seeded generator of a realistic database for load testing
+
+    Creates hospitals, donor and patient accounts with profiles, a year
+    of closed requests with their matches and completed donations, the
+    recent pending requests (left to the auto-match trigger) and blood
+    stock. Every row goes through the bulk write path, chunk_size rows
+    per multi-row INSERT and commit, so memory stays flat at millions of
+    rows.
+
+    The same seed, end_date and starting database always produce the
+    same data. Generated ids are read back as the rows above the
+    previous maximum id, so nothing else may write while it runs.
+    """
+
+    def __init__(self, seed=42, end_date=None, days=365, chunk_size=None, places=None):
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.end_date = end_date or date.today()
+        self.days = days
+        self.chunk_size = chunk_size or db.bulk_chunk_size
+        self.places = places or load_places()
+        self.hospital_ids = []
+        self.donors = {group: array('q') for group in BLOOD_GROUPS}
+        self.patient_ids = array('q')
+        self.patient_groups = array('b')
+        self.last_donation = {}   # donor_id -> date of their latest donation
+        self.donation_counts = {}  # donor_id -> completed donations
+        self.counts = {}
+
+    # --- random values ---
+
+    def _pick(self, weights):
+        return self.random.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _blood_group(self):
+        return self._pick(BLOOD_GROUP_WEIGHTS)
+
+    def _pincode(self):
+        pincode, _ = self.random.choice(self.places)
+        spread = self._pick(PINCODE_SPREAD)
+        if spread == 'district':
+            return pincode[:3] + f"{self.random.randrange(1000):03d}"
+        if spread == 'anywhere':
+            return f"{self.random.randint(1, 8)}{self.random.randrange(100000):05d}"
+        return pincode
+
+    def _name(self):
+        return f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+
+    def _phone(self):
+        return f"{self.random.randint(6, 9)}{self.random.randrange(10 ** 9):09d}"
+
+    # --- helpers ---
+
+    def _chunks(self, count):
+        """Sizes of the chunks count rows are written in"""
+        for start in range(0, count, self.chunk_size):
+            yield min(self.chunk_size, count - start)
+
+    @staticmethod
+    def _max_id(table, column):
+        row = db.fetch_one(f"SELECT MAX({column}) AS max_id FROM {table}")
+        return (row['max_id'] or 0) if row else 0
+
+    @staticmethod
+    def _ids_after(table, column, after, expected):
+        """Ids of the rows just inserted, in insertion order"""
+        rows = db.fetch_all(f"SELECT {column} FROM {table} WHERE {column} > %s ORDER BY {column}", (after,))
+        ids = [row[column] for row in rows]
+        if len(ids) != expected:
+            raise Error(f"Expected {expected} new {table} rows but found {len(ids)}; "
+                        "another client is writing to the database")
+        return ids
+
+    def _report(self, table, count, started, label=None):
+        """Count inserted rows and print the rate they were written at"""
+        if label is None:
+            self.counts[table] = self.counts.get(table, 0) + count
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed > 0 else 0.0
+        print(f"{label or table}: {count:,} rows in {elapsed:.1f} s ({rate:,.0f} rows/s)")
+
+    # --- tables ---
+
+    def create_hospitals(self, count):
+        """Add count hospitals, then use every active hospital for requests"""
+        started = time.perf_counter()
+        rows = []
+        for i in range(count):
+            pincode, city = self.random.choice(self.places)
+            rows.append((f"{city} {self.random.choice(LAST_NAMES)} Hospital {i + 1}",
+                         f"{self.random.randint(1, 400)} Main Road", city, pincode,
+                         self._phone(), f"hospital{i + 1}.s{self.seed}@example.com"))
+        query = """
+            INSERT INTO HOSPITAL (hospital_name, address, city, pincode, phone, email, is_active)
+            VALUES (%s, %s, %s, %s, %s, %s, TRUE)
+        """
+        db.execute_many(query, rows, self.chunk_size)
+        Hospital.invalidate_cache()
+        self._report('HOSPITAL', count, started)
+        rows = db.fetch_all("SELECT hospital_id FROM HOSPITAL WHERE is_active = TRUE ORDER BY hospital_id")
+        self.hospital_ids = [row['hospital_id'] for row in rows]
+
+    def _create_users(self, role, count, start):
+        """Insert count users; returns their (user_id, name) in order"""
+        names = [self._name() for _ in range(count)]
+        users = [(name, f"{role}{start + i}.s{self.seed}@example.com", self._phone(), role)
+                 for i, name in enumerate(names)]
+        last_id = self._max_id('USER', 'user_id')
+        User.create_many(users, self.chunk_size)
+        return list(zip(self._ids_after('USER', 'user_id', last_id, count), names))
+
+    def create_donors(self, count):
+        """Donor accounts and profiles; donation history is filled in later"""
+        started = time.perf_counter()
+        done = 0
+        for size in self._chunks(count):
+            users = self._create_users('donor', size, done)
+            groups = [self._blood_group() for _ in users]
+            last_id = self._max_id('DONOR', 'donor_id')
+            Donor.create_many(((user_id, name, group, self._pincode(), self.random.randint(50, 95))
+                               for (user_id, name), group in zip(users, groups)), self.chunk_size)
+            for donor_id, group in zip(self._ids_after('DONOR', 'donor_id', last_id, size), groups):
+                self.donors[group].append(donor_id)
+            done += size
+        self._report('DONOR', count, started)
+
+    def create_patients(self, count):
+        """Patient accounts and profiles"""
+        started = time.perf_counter()
+        done = 0
+        for size in self._chunks(count):
+            users = self._create_users('patient', size, done)
+            rows = []
+            for user_id, name in users:
+                group = self._blood_group()
+                self.patient_ids.append(user_id)
+                self.patient_groups.append(BLOOD_GROUPS.index(group))
+                rows.append((user_id, name, group, self._pincode(), self._phone(),
+                             self.random.choice(MEDICAL_REASONS)))
+            Patient.create_many(rows, self.chunk_size)
+            done += size
+        self._report('PATIENT', count, started)
+
+    def _request_dates(self, count):
+        """count request times spread evenly over the last days, oldest first"""
+        start = datetime.combine(self.end_date - timedelta(days=self.days), datetime.min.time())
+        span = self.days * 86400
+        for i in range(count):
+            yield start + timedelta(seconds=int(span * (i + self.random.random()) / count))
+
+    def _request_row(self, requested_at, status):
+        index = self.random.randrange(len(self.patient_ids))
+        group = BLOOD_GROUPS[self.patient_groups[index]]
+        urgency = self._pick(URGENCY_WEIGHTS)
+        lead_days = {'critical': 1, 'high': 3, 'medium': 7, 'low': 14}[urgency]
+        return (self.patient_ids[index], self.random.choice(self.hospital_ids), group, urgency, status,
+                self.random.choice((1, 1, 1, 2, 2, 3)), self.random.choice(MEDICAL_REASONS),
+                requested_at, requested_at.date() + timedelta(days=lead_days))
+
+    def _insert_requests(self, rows):
+        """Insert request rows; returns their request ids in order"""
+        query = """
+            INSERT INTO BLOOD_REQUEST
+            (user_id, hospital_id, blood_group_needed, urgency, status,
+             units_needed, medical_reason, request_date, required_by_date)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        last_id = self._max_id('BLOOD_REQUEST', 'request_id')
+        db.execute_many(query, rows, self.chunk_size)
+        return self._ids_after('BLOOD_REQUEST', 'request_id', last_id, len(rows))
+
+    def _random_donor(self, group):
+        """A donor who can give to group, usually of exactly that group"""
+        groups = COMPATIBLE_DONORS[group]
+        if self.random.random() < CROSS_GROUP_SHARE:
+            groups = groups[1:] or groups
+        pool = self.donors[self.random.choice(groups)]
+        return pool[self.random.randrange(len(pool))] if pool else None
+
+    def _eligible_donor(self, group, donated_on, attempts=5):
+        """A donor for group whose last donation is far enough back"""
+        for _ in range(attempts):
+            donor_id = self._random_donor(group)
+            if donor_id is None:
+                continue
+            last = self.last_donation.get(donor_id)
+            if last is None or (donated_on - last).days >= DONATION_INTERVAL_DAYS:
+                return donor_id
+        return None
+
+    def _close_requests(self, requested):
+        """Outcomes of closed requests
+
+        requested is a list of (request_id, row). Returns the request
+        status updates as (status, request_id), the matches as
+        (request_id, donor_id, match_date, match_status, notes) and the
+        donations as (request_id, donor_id, hospital_id, donation_date).
+        """
+        statuses, matches, donations = [], [], []
+        for request_id, row in requested:
+            hospital_id, group, requested_at = row[1], row[2], row[7]
+            asked_at = requested_at
+            while self.random.random() < REJECTION_RATE:
+                donor_id = self._random_donor(group)
+                if donor_id is None:
+                    break
+                asked_at += timedelta(minutes=self.random.randint(5, 240))
+                matches.append((request_id, donor_id, asked_at, 'rejected', 'Donor unavailable'))
+
+            donor_id = None
+            donated_on = requested_at.date() + timedelta(days=self.random.randint(0, 2))
+            if self.random.random() < FULFILLED_SHARE:
+                donor_id = self._eligible_donor(group, donated_on)
+            if donor_id is None:
+                statuses.append(('cancelled', request_id))
+                continue
+
+            asked_at += timedelta(minutes=self.random.randint(5, 240))
+            matches.append((request_id, donor_id, asked_at, 'completed', 'Donation completed'))
+            donations.append((request_id, donor_id, hospital_id, donated_on))
+            statuses.append(('fulfilled', request_id))
+            self.last_donation[donor_id] = donated_on
+            self.donation_counts[donor_id] = self.donation_counts.get(donor_id, 0) + 1
+        return statuses, matches, donations
+
+    def create_history(self, count):
+        """Closed requests with their matches and completed donations
+
+        Requests are inserted as cancelled, so no trigger matches them,
+        then fulfilled ones are updated once their donation exists.
+        """
+        started = time.perf_counter()
+        match_count = donation_count = 0
+        dates = self._request_dates(count)
+        for size in self._chunks(count):
+            rows = [self._request_row(next(dates), 'cancelled') for _ in range(size)]
+            request_ids = self._insert_requests(rows)
+            statuses, matches, donations = self._close_requests(list(zip(request_ids, rows)))
+
+            last_match = self._max_id('DONOR_MATCH', 'match_id')
+            db.execute_many("""
+                INSERT INTO DONOR_MATCH (request_id, donor_id, match_date, match_status, notes)
+                VALUES (%s, %s, %s, %s, %s)
+            """, matches, self.chunk_size)
+            match_ids = self._ids_after('DONOR_MATCH', 'match_id', last_match, len(matches))
+            completed = {match[0]: match_id for match, match_id in zip(matches, match_ids)
+                         if match[3] == 'completed'}
+
+            db.execute_many("""
+                INSERT INTO DONATION_RECORD
+                (donor_id, request_id, match_id, hospital_id, donation_date, units_donated,
+                 status, next_eligible_date)
+                VALUES (%s, %s, %s, %s, %s, 1, 'completed', %s)
+            """, ((donor_id, request_id, completed[request_id], hospital_id, donated_on,
+                   donated_on + timedelta(days=DONATION_INTERVAL_DAYS))
+                  for request_id, donor_id, hospital_id, donated_on in donations), self.chunk_size)
+            db.execute_many("UPDATE BLOOD_REQUEST SET status = %s WHERE request_id = %s",
+                            [status for status in statuses if status[0] == 'fulfilled'], self.chunk_size)
+            match_count += len(matches)
+            donation_count += len(donations)
+        self._report('BLOOD_REQUEST', count, started)
+        self.counts['DONOR_MATCH'] = self.counts.get('DONOR_MATCH', 0) + match_count
+        self.counts['DONATION_RECORD'] = self.counts.get('DONATION_RECORD', 0) + donation_count
+        print(f"  with {match_count:,} matches and {donation_count:,} completed donations")
+
+    def update_donors(self):
+        """Record donation history on donors and switch some of them off"""
+        started = time.perf_counter()
+        db.execute_many("""
+            UPDATE DONOR SET last_donation_date = %s, total_donations = %s
+            WHERE donor_id = %s
+        """, ((self.last_donation[donor_id], donations, donor_id)
+              for donor_id, donations in self.donation_counts.items()), self.chunk_size)
+        unavailable = [(donor_id,) for pool in self.donors.values() for donor_id in pool
+                       if self.random.random() < UNAVAILABLE_SHARE]
+        db.execute_many("UPDATE DONOR SET is_available = FALSE WHERE donor_id = %s",
+                        unavailable, self.chunk_size)
+        Donor.invalidate_cache()
+        self._report('DONOR', len(self.donation_counts) + len(unavailable), started, 'DONOR updates')
+
+    def create_pending(self, count):
+        """Recent requests left pending for the auto-match trigger"""
+        started = time.perf_counter()
+        start = datetime.combine(self.end_date - timedelta(days=PENDING_DAYS), datetime.min.time())
+        span = PENDING_DAYS * 86400
+        for size in self._chunks(count):
+            rows = [self._request_row(start + timedelta(seconds=self.random.randrange(span)), 'pending')
+                    for _ in range(size)]
+            self._insert_requests(rows)
+        self.counts['BLOOD_REQUEST'] = self.counts.get('BLOOD_REQUEST', 0) + count
+        self._report('BLOOD_REQUEST', count, started, 'BLOOD_REQUEST pending')
+
+    def create_inventory(self):
+        """Stock per hospital and blood group, scaled by how common the group is"""
+        started = time.perf_counter()
+        rows = []
+        for hospital_id in self.hospital_ids:
+            for group in BLOOD_GROUPS:
+                typical = 40 * BLOOD_GROUP_WEIGHTS[group] / max(BLOOD_GROUP_WEIGHTS.values())
+                units = int(self.random.uniform(0, 2 * typical + 2))
+                rows.append((hospital_id, group, units, self.random.randint(0, units // 5), 5))
+        # Existing stock rows are left alone
+        written = db.execute_many("""
+            INSERT IGNORE INTO BLOOD_INVENTORY
+            (hospital_id, blood_group, units_available, units_reserved, threshold)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows, self.chunk_size)
+        self._report('BLOOD_INVENTORY', max(written, 0), started)
+
+    def run(self, hospitals, donors, patients, requests):
+        """Generate everything; returns the rows written per table"""
+        if requests and not patients:
+            raise ValueError("Requests need patients; pass --patients")
+        pending = requests * PENDING_DAYS // self.days if self.days > PENDING_DAYS else 0
+        self.create_hospitals(hospitals)
+        if requests and not self.hospital_ids:
+            raise ValueError("Requests need hospitals; pass --hospitals")
+        self.create_donors(donors)
+        self.create_patients(patients)
+        self.create_history(requests - pending)
+        self.update_donors()
+        self.create_pending(pending)
+        self.create_inventory()
+        return self.counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Fill the database with seeded, realistic synthetic data for load testing",
+        epilog="Use an empty database, or a different --seed for each run into the same one. "
+               "Run `python -m src.models.batch_matching` afterwards to match pending requests "
+               "the trigger could not.")
+    parser.add_argument('--seed', type=int, default=42, help="random seed (default 42)")
+    parser.add_argument('--hospitals', type=int, default=50, help="hospitals to add (default 50)")
+    parser.add_argument('--donors', type=int, default=10000, help="donors to add (default 10000)")
+    parser.add_argument('--patients', type=int, help="patients to add (default donors / 4)")
+    parser.add_argument('--requests', type=int, help="blood requests to add (default 2 per patient)")
+    parser.add_argument('--days', type=int, default=365, help="days of request history (default 365)")
+    parser.add_argument('--end-date', type=date.fromisoformat,
+                        help="last day of the history, YYYY-MM-DD (default today)")
+    parser.add_argument('--chunk-size', type=int, help="rows per bulk insert (default DB_BULK_CHUNK_SIZE)")
+    args = parser.parse_args(argv)
+    patients = args.patients if args.patients is not None else args.donors // 4
+    requests = args.requests if args.requests is not None else patients * 2
+
+    if not db.connect():
+        print("Failed to connect to database. Exiting...")
+        return 1
+
+    started = time.perf_counter()
+    try:
+        generator = DataGenerator(args.seed, args.end_date, args.days, args.chunk_size)
+        counts = generator.run(args.hospitals, args.donors, patients, requests)
+        total = sum(counts.values())
+        print(f"Generated {total:,} rows in {time.perf_counter() - started:.1f} s")
+    except (Error, ValueError) as e:
+        print(f"Data generation failed: {e}")
+        return 1
+    finally:
+        db.disconnect()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
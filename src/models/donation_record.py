@@ -1,7 +1,11 @@
 from src.config.database import db
+from src.models.pagination import paginate
 
 class DonationRecord:
     
+    # Stable sort keys for the completed donations listing
+    COMPLETED_KEYS = [('dr.donation_date', 'DESC'), ('dr.donation_id', 'DESC')]
+    
     @staticmethod
     def get_scheduled_by_hospital(hospital_id):
         """Get scheduled donations for a hospital"""
@@ -18,23 +22,23 @@ class DonationRecord:
             AND dr.status = 'scheduled'
             ORDER BY dr.donation_date ASC
         """
-        return db.fetch_all(query, (hospital_id,))
+        return db.fetch_all(query, (hospital_id,), cache=True)
     
     @staticmethod
-    def get_completed_by_hospital(hospital_id):
-        """Get completed donations for a hospital"""
+    def get_completed_by_hospital(hospital_id, after=None, limit=50):
+        """Get completed donations for a hospital, newest first
+        
+        Returns one page; pass its next_token as after to continue.
+        """
         query = """
             SELECT 
                 dr.*,
                 d.name as donor_name
             FROM DONATION_RECORD dr
             JOIN DONOR d ON dr.donor_id = d.donor_id
-            WHERE dr.hospital_id = %s 
-            AND dr.status = 'completed'
-            ORDER BY dr.donation_date DESC
-            LIMIT 50
         """
-        return db.fetch_all(query, (hospital_id,))
+        where = "dr.hospital_id = %s AND dr.status = 'completed'"
+        return paginate(query, DonationRecord.COMPLETED_KEYS, after, limit, where, (hospital_id,))
     
     @staticmethod
     def update_status(donation_id, new_status):
@@ -1,7 +1,17 @@
-from src.config.database import db
+from src.config.database import db, in_list
+from src.models.pagination import paginate
+from src.utils.constants import COMPATIBLE_DONORS
+from src.utils.cache import reference_cache
+
+# Availability also changes in SQL triggers this process never sees, so
+# donor profiles are kept only briefly
+_profiles = reference_cache('donor_profiles', ttl=30)
 
 class Donor:
     
+    # Stable sort keys for the donor listing
+    LIST_KEYS = [('d.name', 'ASC'), ('d.donor_id', 'ASC')]
+    
     @staticmethod
     def create(user_id, name, blood_group, city_pincode, weight, last_donation_date=None):
         """Create new donor profile"""
@@ -10,29 +20,60 @@ class Donor:
             (user_id, name, blood_group, city_pincode, is_available, weight, last_donation_date)
             VALUES (%s, %s, %s, %s, TRUE, %s, %s)
         """
-        return db.execute_query(query, (user_id, name, blood_group, city_pincode, weight, last_donation_date))
+        result = db.execute_query(query, (user_id, name, blood_group, city_pincode, weight, last_donation_date))
+        _profiles.invalidate(user_id)
+        return result
+    
+    @staticmethod
+    def create_many(donors, chunk_size=None):
+        """Create many donor profiles with multi-row inserts
+        
+        Each item holds the create() arguments in order:
+        (user_id, name, blood_group, city_pincode, weight[, last_donation_date])
+        """
+        query = """
+            INSERT INTO DONOR 
+            (user_id, name, blood_group, city_pincode, is_available, weight, last_donation_date)
+            VALUES (%s, %s, %s, %s, TRUE, %s, %s)
+        """
+        rows = (tuple(donor) if len(donor) == 6 else tuple(donor) + (None,) for donor in donors)
+        result = db.execute_many(query, rows, chunk_size)
+        _profiles.invalidate()
+        return result
     
     @staticmethod
     def get_by_user_id(user_id):
-        """Check if donor profile exists for user"""
+        """Check if donor profile exists for user (cached)"""
         query = """
             SELECT d.*, u.email, u.phone
             FROM DONOR d
             JOIN USER u ON d.user_id = u.user_id
             WHERE d.user_id = %s
         """
-        return db.fetch_one(query, (user_id,))
+        return _profiles.get(user_id, lambda: db.fetch_one(query, (user_id,)))
     
     @staticmethod
-    def get_all():
-        """Get all donors"""
+    def invalidate_cache(user_id=None):
+        """Forget one donor profile, or all of them
+        
+        Writes below are keyed by donor_id while the cache is keyed by
+        user_id, so they drop every profile; there are few per process.
+        """
+        _profiles.invalidate(user_id)
+    
+    @staticmethod
+    def get_all(after=None, limit=None):
+        """Get all donors, ordered by name
+        
+        With a limit, returns one page; pass its next_token as after to
+        continue.
+        """
         query = """
             SELECT d.*, u.email, u.phone
             FROM DONOR d
             JOIN USER u ON d.user_id = u.user_id
-            ORDER BY d.name
         """
-        return db.fetch_all(query)
+        return paginate(query, Donor.LIST_KEYS, after, limit)
     
     @staticmethod
     def get_by_id(donor_id):
@@ -47,16 +88,20 @@ class Donor:
     
     @staticmethod
     def get_available(blood_group=None):
-        """Get available donors"""
+        """Get available donors
+        
+        eligible_from is last_donation_date + 90 days, kept by the server,
+        so eligibility is a range on idx_donor_eligibility
+        (blood_group, is_available, eligible_from).
+        """
         if blood_group:
             query = """
                 SELECT d.*, u.phone
                 FROM DONOR d
                 JOIN USER u ON d.user_id = u.user_id
-                WHERE d.is_available = TRUE 
-                AND d.blood_group = %s
-                AND (d.last_donation_date IS NULL 
-                     OR DATEDIFF(CURDATE(), d.last_donation_date) >= 90)
+                WHERE d.blood_group = %s
+                AND d.is_available = TRUE 
+                AND (d.eligible_from IS NULL OR d.eligible_from <= CURDATE())
             """
             return db.fetch_all(query, (blood_group,))
         else:
@@ -65,16 +110,80 @@ class Donor:
                 FROM DONOR d
                 JOIN USER u ON d.user_id = u.user_id
                 WHERE d.is_available = TRUE
-                AND (d.last_donation_date IS NULL 
-                     OR DATEDIFF(CURDATE(), d.last_donation_date) >= 90)
+                AND (d.eligible_from IS NULL OR d.eligible_from <= CURDATE())
             """
             return db.fetch_all(query)
     
+    @staticmethod
+    def get_compatible(blood_group, limit=None):
+        """Get eligible donors who can give to blood_group, best match first
+        
+        One indexed query over every compatible group (see
+        COMPATIBLE_DONORS); exact matches rank first, then the remaining
+        groups in preference order, then donors rested longest.
+        """
+        donor_groups = COMPATIBLE_DONORS[blood_group]
+        # Groups go in as params; only 1, 2, 4 or 8 of them, so the query
+        # has few texts and they stay in the statement cache
+        placeholders = ", ".join(["%s"] * len(donor_groups))
+        rank = " ".join(f"WHEN %s THEN {i}" for i in range(len(donor_groups)))
+        query = f"""
+            SELECT d.*, u.phone
+            FROM DONOR d
+            JOIN USER u ON d.user_id = u.user_id
+            WHERE d.blood_group IN ({placeholders})
+            AND d.is_available = TRUE 
+            AND (d.eligible_from IS NULL OR d.eligible_from <= CURDATE())
+            ORDER BY CASE d.blood_group {rank} END, d.eligible_from, d.donor_id
+        """
+        params = donor_groups + donor_groups
+        if limit:
+            query += " LIMIT %s"
+            params += (limit,)
+        return db.fetch_all(query, params)
+    
+    @staticmethod
+    def claim(donor_id):
+        """Mark an available donor unavailable; False if someone else got them first"""
+        query = "UPDATE DONOR SET is_available = FALSE WHERE donor_id = %s AND is_available = TRUE"
+        claimed = db.execute_update(query, (donor_id,)) > 0
+        if claimed:
+            _profiles.invalidate()
+        return claimed
+    
+    @staticmethod
+    def lock_available(donor_ids):
+        """Lock the given donors and return the ids still available
+        
+        Must run inside db.transaction(); the row locks hold until it ends.
+        """
+        if not donor_ids:
+            return set()
+        placeholders, params = in_list(donor_ids)
+        query = f"""
+            SELECT donor_id FROM DONOR
+            WHERE donor_id IN ({placeholders}) AND is_available = TRUE
+            FOR UPDATE
+        """
+        return {row['donor_id'] for row in db.fetch_all(query, params, raise_errors=True)}
+    
+    @staticmethod
+    def set_unavailable_many(donor_ids):
+        """Mark many donors unavailable in one statement"""
+        if not donor_ids:
+            return 0
+        placeholders, params = in_list(donor_ids)
+        query = f"UPDATE DONOR SET is_available = FALSE WHERE donor_id IN ({placeholders})"
+        result = db.execute_update(query, params)
+        _profiles.invalidate()
+        return result
+    
     @staticmethod
     def update_availability(donor_id, is_available):
         """Update donor availability"""
         query = "UPDATE DONOR SET is_available = %s WHERE donor_id = %s"
         db.execute_query(query, (is_available, donor_id))
+        _profiles.invalidate()
     
     @staticmethod
     def update(donor_id, name, blood_group, city_pincode, weight):
@@ -85,12 +194,14 @@ class Donor:
             WHERE donor_id = %s
         """
         db.execute_query(query, (name, blood_group, city_pincode, weight, donor_id))
+        _profiles.invalidate()
     
     @staticmethod
     def delete(donor_id):
         """Delete donor"""
         query = "DELETE FROM DONOR WHERE donor_id = %s"
         db.execute_query(query, (donor_id,))
+        _profiles.invalidate()
     
     @staticmethod
     def get_donation_history(donor_id):
@@ -1,7 +1,43 @@
-from src.config.database import db
+from src.config.database import db, in_list
+from src.models.pagination import keyset_tail, paginate
 
 class DonorMatch:
     
+    # Listing query shared by get_all() and iter_all()
+    LIST_SELECT = """
+        SELECT 
+            dm.*,
+            d.name as donor_name,
+            br.blood_group_needed,
+            p.name as patient_name
+        FROM DONOR_MATCH dm
+        JOIN DONOR d ON dm.donor_id = d.donor_id
+        JOIN BLOOD_REQUEST br ON dm.request_id = br.request_id
+        JOIN PATIENT p ON br.user_id = p.user_id
+    """
+    LIST_KEYS = [('dm.match_date', 'DESC'), ('dm.match_id', 'DESC')]
+    
+    @staticmethod
+    def create(request_id, donor_id, notes=None):
+        """Create a new match between a request and a donor"""
+        query = """
+            INSERT INTO DONOR_MATCH (request_id, donor_id, match_status, notes)
+            VALUES (%s, %s, 'matched', %s)
+        """
+        return db.execute_query(query, (request_id, donor_id, notes))
+    
+    @staticmethod
+    def create_many(matches, chunk_size=None):
+        """Create many matches with multi-row inserts
+        
+        Each item is (request_id, donor_id, notes).
+        """
+        query = """
+            INSERT INTO DONOR_MATCH (request_id, donor_id, match_status, notes)
+            VALUES (%s, %s, 'matched', %s)
+        """
+        return db.execute_many(query, matches, chunk_size)
+    
     @staticmethod
     def get_by_donor_id(donor_id):
         """Get all matches for a specific donor"""
@@ -70,21 +106,43 @@ class DonorMatch:
             db.execute_query(query, (new_status, match_id))
     
     @staticmethod
-    def get_all():
-        """Get all matches"""
+    def get_acceptance_counts(donor_ids=None):
+        """Past match outcomes per donor: {donor_id: (accepted, decided)}
+        
+        decided counts matches the donor confirmed or rejected; matches
+        still pending are left out. Without donor_ids every donor with a
+        match is counted.
+        """
         query = """
-            SELECT 
-                dm.*,
-                d.name as donor_name,
-                br.blood_group_needed,
-                p.name as patient_name
-            FROM DONOR_MATCH dm
-            JOIN DONOR d ON dm.donor_id = d.donor_id
-            JOIN BLOOD_REQUEST br ON dm.request_id = br.request_id
-            JOIN PATIENT p ON br.user_id = p.user_id
-            ORDER BY dm.match_date DESC
+            SELECT donor_id,
+                   SUM(match_status IN ('confirmed', 'completed')) AS accepted,
+                   SUM(match_status IN ('confirmed', 'completed', 'rejected')) AS decided
+            FROM DONOR_MATCH
+        """
+        params = ()
+        if donor_ids is not None:
+            if not donor_ids:
+                return {}
+            placeholders, params = in_list(donor_ids)
+            query += f" WHERE donor_id IN ({placeholders})"
+        query += " GROUP BY donor_id"
+        rows = db.fetch_all(query, params)
+        return {row['donor_id']: (int(row['accepted'] or 0), int(row['decided'] or 0)) for row in rows}
+    
+    @staticmethod
+    def get_all(after=None, limit=None):
+        """Get all matches, newest first
+        
+        With a limit, returns one page; pass its next_token as after to
+        continue.
         """
-        return db.fetch_all(query)
+        return paginate(DonorMatch.LIST_SELECT, DonorMatch.LIST_KEYS, after, limit)
+    
+    @staticmethod
+    def iter_all(batch_size=None):
+        """Stream all matches without loading them into memory at once"""
+        tail, params = keyset_tail(DonorMatch.LIST_KEYS)
+        return db.fetch_iter(f"{DonorMatch.LIST_SELECT}\n{tail}", params, batch_size=batch_size)
     
     @staticmethod
     def get_confirmed_by_hospital(hospital_id):
@@ -108,4 +166,4 @@ class DonorMatch:
             AND br.status = 'pending'
             ORDER BY br.urgency DESC, dm.match_date ASC
         """
-        return db.fetch_all(query, (hospital_id,))
\ No newline at end of file
+        return db.fetch_all(query, (hospital_id,), cache=True)
\ No newline at end of file
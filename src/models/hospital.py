@@ -1,15 +1,24 @@
 from src.config.database import db
+from src.utils.cache import reference_cache
+
+# Hospitals change only through admin maintenance, so entries live long
+_hospitals = reference_cache('hospitals', maxsize=512, ttl=600)
 
 class Hospital:
     
     @staticmethod
     def get_all():
-        """Get all hospitals"""
+        """Get all hospitals (cached)"""
         query = "SELECT * FROM HOSPITAL WHERE is_active = TRUE ORDER BY hospital_name"
-        return db.fetch_all(query)
+        return _hospitals.get('all', lambda: db.fetch_all(query))
     
     @staticmethod
     def get_by_id(hospital_id):
-        """Get hospital by ID"""
+        """Get hospital by ID (cached)"""
         query = "SELECT * FROM HOSPITAL WHERE hospital_id = %s"
-        return db.fetch_one(query, (hospital_id,))
\ No newline at end of file
+        return _hospitals.get(hospital_id, lambda: db.fetch_one(query, (hospital_id,)))
+    
+    @staticmethod
+    def invalidate_cache():
+        """Forget cached hospitals after they are changed outside this class"""
+        _hospitals.invalidate()
\ No newline at end of file
@@ -1,14 +1,22 @@
 from src.config.database import db
+from src.utils.cache import reference_cache
+
+_staff = reference_cache('hospital_staff', ttl=600)
 
 class HospitalStaff:
     
     @staticmethod
     def get_by_user_id(user_id):
-        """Get hospital staff by user_id"""
+        """Get hospital staff by user_id (cached)"""
         query = """
             SELECT hs.*, h.hospital_name, h.city
             FROM HOSPITAL_STAFF hs
             JOIN HOSPITAL h ON hs.hospital_id = h.hospital_id
             WHERE hs.user_id = %s
         """
-        return db.fetch_one(query, (user_id,))
\ No newline at end of file
+        return _staff.get(user_id, lambda: db.fetch_one(query, (user_id,)))
+    
+    @staticmethod
+    def invalidate_cache(user_id=None):
+        """Forget one staff profile, or all of them"""
+        _staff.invalidate(user_id)
\ No newline at end of file
@@ -0,0 +1,49 @@
+from src.config.database import db
+
+class MatchCandidate:
+    """Ranked backup donors saved for each request"""
+    
+    @staticmethod
+    def save(request_id, donor_ids):
+        """Store the ranked candidate list for a request, replacing any old one
+        
+        Both statements commit together, so a concurrent rematch never
+        sees the old list deleted and the new one missing.
+        """
+        query = """
+            INSERT INTO MATCH_CANDIDATE (request_id, candidate_rank, donor_id)
+            VALUES (%s, %s, %s)
+        """
+        rows = [(request_id, rank, donor_id) for rank, donor_id in enumerate(donor_ids)]
+        with db.transaction():
+            db.execute_query("DELETE FROM MATCH_CANDIDATE WHERE request_id = %s", (request_id,))
+            return db.execute_many(query, rows)
+    
+    @staticmethod
+    def exists(request_id):
+        """Whether a candidate list was saved for the request"""
+        query = "SELECT 1 AS found FROM MATCH_CANDIDATE WHERE request_id = %s LIMIT 1"
+        return db.fetch_one(query, (request_id,)) is not None
+    
+    @staticmethod
+    def next_available(request_id, limit=5):
+        """Best remaining candidates who are still eligible
+        
+        Donors already matched to this request (including ones who
+        declined) are skipped.
+        """
+        query = """
+            SELECT d.*, mc.candidate_rank
+            FROM MATCH_CANDIDATE mc
+            JOIN DONOR d ON mc.donor_id = d.donor_id
+            WHERE mc.request_id = %s
+            AND d.is_available = TRUE
+            AND (d.eligible_from IS NULL OR d.eligible_from <= CURDATE())
+            AND NOT EXISTS (
+                SELECT 1 FROM DONOR_MATCH dm
+                WHERE dm.request_id = mc.request_id AND dm.donor_id = mc.donor_id
+            )
+            ORDER BY mc.candidate_rank
+            LIMIT %s
+        """
+        return db.fetch_all(query, (request_id, limit))
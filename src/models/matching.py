@@ -0,0 +1,119 @@
+from src.config.database import db
+from src.models.donor import Donor
+from src.models.donor_match import DonorMatch
+from src.models.match_candidate import MatchCandidate
+from src.models.proximity import locator
+from src.models.ranking import rank_donors
+
+class DonorMatcher:
+    """Compatibility-aware donor matching
+
+    The insert trigger on BLOOD_REQUEST only looks for donors of the exact
+    blood group. This engine also considers every compatible group from
+    COMPATIBLE_DONORS, in one indexed query with exact matches first.
+    """
+
+    # Candidates tried before giving up when others claim them first
+    CLAIM_ATTEMPTS = 5
+
+    # Nearest donors pulled from the index before scoring
+    RANKING_POOL = 500
+
+    # Ranked candidates saved per request for rematching
+    CANDIDATE_LIST_SIZE = 20
+
+    @staticmethod
+    def find_candidates(blood_group, limit=None):
+        """Eligible donors who can give to blood_group, best first"""
+        return Donor.get_compatible(blood_group, limit)
+
+    @staticmethod
+    def find_nearest(hospital_id, blood_group, k=10):
+        """(distance_km, donor) pairs for the k nearest compatible donors
+        
+        None when the hospital's location is unknown.
+        """
+        return locator.nearest_to_hospital(hospital_id, blood_group, k)
+
+    @staticmethod
+    def rank_candidates(hospital_id, blood_group, limit=None):
+        """(score, distance_km, donor) triples, best first
+        
+        Scores the nearest compatible donors to the hospital on distance,
+        rest since last donation, past acceptance and weight (see
+        models/ranking). Donors are scored without distance when the
+        hospital can't be placed.
+        """
+        candidates = DonorMatcher.find_nearest(hospital_id, blood_group, DonorMatcher.RANKING_POOL)
+        if candidates is None:
+            candidates = [(None, donor) for donor in
+                          DonorMatcher.find_candidates(blood_group, DonorMatcher.RANKING_POOL)]
+        return rank_donors(candidates, limit)
+
+    @staticmethod
+    def save_candidates(request_id, ranking):
+        """Keep a rank_candidates() result as the request's rematch list"""
+        return MatchCandidate.save(request_id, [donor['donor_id'] for _, _, donor in ranking])
+
+    @staticmethod
+    def _claim_first(request_id, blood_group, candidates):
+        """Claim the first free donor among candidates and record the match"""
+        for donor in candidates:
+            with db.transaction():
+                if not Donor.claim(donor['donor_id']):
+                    continue
+                match_id = DonorMatch.create(request_id, donor['donor_id'],
+                                             f"Auto-matched {donor['blood_group']} donor for {blood_group}")
+            locator.remove([donor['donor_id']])
+            return match_id
+        return None
+
+    @staticmethod
+    def match_request(request_id, blood_group, hospital_id=None, candidates=None):
+        """Match a request to the best compatible donor
+
+        candidates, if given, are tried in order (critical requests pass
+        their ranking). Otherwise, with a hospital_id the nearest
+        compatible donors are tried first, else donors in compatibility
+        order. The donor is claimed (made unavailable) and the match
+        inserted in one transaction. Returns the new match_id, or None
+        when no compatible donor is eligible.
+        """
+        if candidates:
+            candidates = candidates[:DonorMatcher.CLAIM_ATTEMPTS]
+        else:
+            nearest = None
+            if hospital_id is not None:
+                nearest = DonorMatcher.find_nearest(hospital_id, blood_group, DonorMatcher.CLAIM_ATTEMPTS)
+            if nearest:
+                candidates = [donor for _, donor in nearest]
+            else:
+                candidates = DonorMatcher.find_candidates(blood_group, DonorMatcher.CLAIM_ATTEMPTS)
+        return DonorMatcher._claim_first(request_id, blood_group, candidates)
+
+    @staticmethod
+    def rematch(request):
+        """Match a request to the next donor on its saved candidate list
+
+        Call inside db.transaction() after BloodRequest.lock_for_rematch().
+        Requests matched before candidate lists existed get one ranked
+        and saved here. Returns the new match_id or None.
+        """
+        request_id = request['request_id']
+        blood_group = request['blood_group_needed']
+        candidates = MatchCandidate.next_available(request_id, DonorMatcher.CLAIM_ATTEMPTS)
+        if not candidates and not MatchCandidate.exists(request_id):
+            ranking = DonorMatcher.rank_candidates(request['hospital_id'], blood_group,
+                                                   DonorMatcher.CANDIDATE_LIST_SIZE)
+            DonorMatcher.save_candidates(request_id, ranking)
+            candidates = MatchCandidate.next_available(request_id, DonorMatcher.CLAIM_ATTEMPTS)
+
+        for donor in candidates:
+            if not Donor.claim(donor['donor_id']):
+                continue
+            match_id = DonorMatch.create(request_id, donor['donor_id'],
+                                         f"Rematched {donor['blood_group']} donor for {blood_group} "
+                                         f"(candidate #{donor['candidate_rank'] + 1})")
+            locator.remove([donor['donor_id']])
+            return match_id
+        return None
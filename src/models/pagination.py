@@ -0,0 +1,103 @@
+import base64
+import json
+from src.config.database import db
+
+# Rows per page when a caller asks for paging without a limit
+DEFAULT_PAGE_SIZE = 50
+
+class Page(list):
+    """One page of rows plus the token that continues after it
+
+    next_token is None on the last page. A Page is a list, so it can be
+    used anywhere an unpaginated result was.
+    """
+
+    def __init__(self, rows=(), next_token=None):
+        super().__init__(rows)
+        self.next_token = next_token
+
+def encode_token(values):
+    """Pack the sort key of the last row on a page into an opaque token"""
+    payload = json.dumps(list(values), default=str)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_token(token):
+    """Unpack a token produced by encode_token"""
+    try:
+        return json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+
+def order_by(keys):
+    """ORDER BY clause for keys given as (column, 'ASC' | 'DESC') pairs"""
+    return "ORDER BY " + ", ".join(f"{column} {direction}" for column, direction in keys)
+
+def after_condition(keys, token):
+    """SQL condition and params selecting rows that sort after the token
+
+    Expands the row comparison into (a < x) OR (a = x AND b < y) ... so
+    that MySQL can use it as an index range on the sort columns.
+    """
+    values = decode_token(token)
+    if len(values) != len(keys):
+        raise ValueError("Page token does not match this listing")
+
+    clauses = []
+    params = []
+    for i, (column, direction) in enumerate(keys):
+        op = '<' if direction == 'DESC' else '>'
+        parts = [f"{keys[j][0]} = %s" for j in range(i)]
+        parts.append(f"{column} {op} %s")
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(values[:i + 1])
+    return "(" + " OR ".join(clauses) + ")", params
+
+def make_page(rows, limit, names):
+    """Wrap rows in a Page, setting next_token when the page is full
+
+    names are the result columns holding the sort key. Pages of a joined
+    listing may repeat a key, so fullness counts distinct keys.
+    """
+    if not limit or not rows:
+        return Page(rows)
+    keys = {tuple(row[name] for name in names) for row in rows}
+    if len(keys) < limit:
+        return Page(rows)
+    last = rows[-1]
+    return Page(rows, encode_token([last[name] for name in names]))
+
+def keyset_tail(keys, after=None, limit=None, where=None, params=()):
+    """WHERE / ORDER BY / LIMIT tail of a keyset-paginated query
+
+    where is an optional filter condition whose params come first.
+    Returns the SQL tail and the full parameter tuple.
+    """
+    conditions = [where] if where else []
+    params = list(params)
+    if after:
+        condition, after_params = after_condition(keys, after)
+        conditions.append(condition)
+        params.extend(after_params)
+
+    parts = []
+    if conditions:
+        parts.append("WHERE " + " AND ".join(conditions))
+    parts.append(order_by(keys))
+    if limit:
+        parts.append("LIMIT %s")
+        params.append(limit)
+    return "\n".join(parts), tuple(params)
+
+def key_names(keys):
+    """Result column names of the sort keys (table aliases dropped)"""
+    return [column.split('.')[-1] for column, _ in keys]
+
+def paginate(select, keys, after=None, limit=None, where=None, params=()):
+    """Run select with a keyset tail and return the rows as a Page
+
+    Without a limit every row is returned and next_token is None, which
+    keeps the old unbounded listings working unchanged.
+    """
+    tail, params = keyset_tail(keys, after, limit, where, params)
+    rows = db.fetch_all(f"{select}\n{tail}", params)
+    return make_page(rows, limit, key_names(keys))
@@ -1,7 +1,14 @@
 from src.config.database import db
+from src.models.pagination import paginate
+from src.utils.cache import reference_cache
+
+_profiles = reference_cache('patient_profiles', ttl=300)
 
 class Patient:
     
+    # Stable sort keys for the patient listing
+    LIST_KEYS = [('p.name', 'ASC'), ('p.patient_id', 'ASC')]
+    
     @staticmethod
     def create(user_id, name, blood_group, city_pincode, emergency_contact, medical_history=''):
         """Create new patient profile"""
@@ -10,24 +17,51 @@ class Patient:
             (user_id, name, blood_group, city_pincode, emergency_contact, medical_history)
             VALUES (%s, %s, %s, %s, %s, %s)
         """
-        return db.execute_query(query, (user_id, name, blood_group, city_pincode, emergency_contact, medical_history))
+        result = db.execute_query(query, (user_id, name, blood_group, city_pincode, emergency_contact, medical_history))
+        _profiles.invalidate(user_id)
+        return result
+    
+    @staticmethod
+    def create_many(patients, chunk_size=None):
+        """Create many patient profiles with multi-row inserts
+        
+        Each item holds the create() arguments in order:
+        (user_id, name, blood_group, city_pincode, emergency_contact[, medical_history])
+        """
+        query = """
+            INSERT INTO PATIENT 
+            (user_id, name, blood_group, city_pincode, emergency_contact, medical_history)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        rows = (tuple(patient) if len(patient) == 6 else tuple(patient) + ('',) for patient in patients)
+        result = db.execute_many(query, rows, chunk_size)
+        _profiles.invalidate()
+        return result
     
     @staticmethod
     def get_by_user_id(user_id):
-        """Check if patient profile exists for user"""
+        """Check if patient profile exists for user (cached)"""
         query = "SELECT * FROM PATIENT WHERE user_id = %s"
-        return db.fetch_one(query, (user_id,))
+        return _profiles.get(user_id, lambda: db.fetch_one(query, (user_id,)))
     
     @staticmethod
-    def get_all():
-        """Get all patients"""
+    def invalidate_cache(user_id=None):
+        """Forget one patient profile, or all of them"""
+        _profiles.invalidate(user_id)
+    
+    @staticmethod
+    def get_all(after=None, limit=None):
+        """Get all patients, ordered by name
+        
+        With a limit, returns one page; pass its next_token as after to
+        continue.
+        """
         query = """
             SELECT p.*, u.email, u.phone
             FROM PATIENT p
             JOIN USER u ON p.user_id = u.user_id
-            ORDER BY p.name
         """
-        return db.fetch_all(query)
+        return paginate(query, Patient.LIST_KEYS, after, limit)
     
     @staticmethod
     def update(patient_id, name, blood_group, city_pincode, emergency_contact, medical_history):
@@ -38,4 +72,5 @@ class Patient:
                 emergency_contact = %s, medical_history = %s
             WHERE patient_id = %s
         """
-        db.execute_query(query, (name, blood_group, city_pincode, emergency_contact, medical_history, patient_id))
\ No newline at end of file
+        db.execute_query(query, (name, blood_group, city_pincode, emergency_contact, medical_history, patient_id))
+        _profiles.invalidate()  # keyed by user_id, not patient_id
\ No newline at end of file
@@ -0,0 +1,129 @@
+import threading
+import time
+from src.models.donor import Donor
+from src.models.hospital import Hospital
+from src.utils.constants import COMPATIBLE_DONORS
+from src.utils.geo import KDTree, PincodeTable
+
+class DonorLocator:
+    """In-memory spatial index of eligible donors
+    
+    Donors are placed by city_pincode and kept in one k-d tree per blood
+    group. nearest() never touches the DONOR table: once the index is
+    older than ttl seconds, or after invalidate(), it is reloaded on a
+    background thread while the old trees keep answering. Donors claimed
+    in the meantime are dropped at once with remove().
+    """
+
+    def __init__(self, pincodes=None, ttl=60):
+        self._pincodes = pincodes
+        self.ttl = ttl
+        self._trees = None
+        self._built_at = None
+        self._stale = False
+        self._removed = {}  # donor_id -> when it was claimed
+        self._refreshing = False
+        self.unlocated = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pincodes(self):
+        if self._pincodes is None:
+            self._pincodes = PincodeTable.load()
+        return self._pincodes
+
+    def invalidate(self):
+        """Reload the index in the background on the next search"""
+        self._stale = True
+
+    def remove(self, donor_ids):
+        """Stop returning donors that have just been claimed"""
+        now = time.monotonic()
+        with self._lock:
+            for donor_id in donor_ids:
+                self._removed[donor_id] = now
+
+    def rebuild(self):
+        """Reload eligible donors and swap in new per-group trees"""
+        started = time.monotonic()
+        self._stale = False
+        groups = {}
+        unlocated = 0
+        for donor in Donor.get_available():
+            point = self.pincodes.locate(donor['city_pincode'])
+            if point is None:
+                unlocated += 1
+                continue
+            groups.setdefault(donor['blood_group'], []).append((point, donor))
+
+        trees = {group: KDTree(entries) for group, entries in groups.items()}
+        with self._lock:
+            self._trees = trees
+            self.unlocated = unlocated
+            self._built_at = started
+            # The reload already left out donors claimed before it began
+            self._removed = {donor_id: claimed for donor_id, claimed in self._removed.items()
+                             if claimed >= started}
+
+    def refresh_async(self):
+        """Start a background rebuild unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name='donor-locator', daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            print(f"Error rebuilding donor index: {e}")
+            if self._trees is not None:
+                # Keep serving the old index for another ttl before retrying
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _is_stale(self):
+        built_at = self._built_at
+        return self._stale or built_at is None or time.monotonic() - built_at >= self.ttl
+
+    def locate_hospital(self, hospital):
+        """(latitude, longitude) of a hospital row, by pincode then city"""
+        return self.pincodes.locate_place(hospital.get('pincode'), hospital.get('city'))
+
+    def nearest(self, point, blood_group, k=10):
+        """k nearest eligible donors who can give to blood_group
+        
+        Returns (distance_km, donor) pairs, nearest first, or None while
+        the first index is still loading.
+        """
+        if self._is_stale():
+            self.refresh_async()
+        with self._lock:
+            trees, removed = self._trees, self._removed
+        if trees is None:
+            return None
+        skip = (lambda donor: donor['donor_id'] in removed) if removed else None
+        results = []
+        for group in COMPATIBLE_DONORS[blood_group]:
+            tree = trees.get(group)
+            if tree:
+                results.extend(tree.nearest(point, k, skip))
+        results.sort(key=lambda result: result[0])
+        return results[:k]
+
+    def nearest_to_hospital(self, hospital_id, blood_group, k=10):
+        """k nearest eligible compatible donors to a hospital
+        
+        Returns None when the hospital cannot be placed on the map or the
+        index is not loaded yet.
+        """
+        hospital = Hospital.get_by_id(hospital_id)
+        point = self.locate_hospital(hospital) if hospital else None
+        if point is None:
+            return None
+        return self.nearest(point, blood_group, k)
+
+locator = DonorLocator()
@@ -0,0 +1,152 @@
+from datetime import date, datetime
+from itertools import chain, repeat
+from operator import methodcaller
+from src.config.records import Record
+from src.models.donor_match import DonorMatch
+from src.utils.constants import DONATION_INTERVAL_DAYS
+
+try:
+    import numpy as np
+except ImportError:  # ranking falls back to plain Python
+    np = None
+
+# Share of the score given to each signal; they sum to 1
+WEIGHTS = {
+    'distance': 0.4,
+    'acceptance': 0.3,
+    'rest': 0.2,
+    'weight': 0.1,
+}
+
+# Distance at which the proximity signal has halved
+DISTANCE_SCALE_KM = 25.0
+
+# Days after the donation interval at which a donor counts as fully rested
+FULL_REST_DAYS = 365
+
+# Body weight range (kg) mapped onto the weight signal
+MIN_WEIGHT_KG = 50.0
+FULL_WEIGHT_KG = 70.0
+
+NAN = float('nan')
+
+# Above this many candidates acceptance is read for all donors in one
+# GROUP BY instead of a long IN list
+ACCEPTANCE_IN_LIMIT = 1000
+
+def _days_since(value, today):
+    """Days since a date; never-donated donors count as fully rested"""
+    if value is None:
+        return FULL_REST_DAYS
+    if isinstance(value, datetime):
+        value = value.date()
+    return (today - value).days
+
+def _columns(candidates, acceptance, today):
+    """Pull the scoring inputs out of (distance_km, donor) pairs"""
+    distance, rest, accepted, decided, weight = [], [], [], [], []
+    for km, donor in candidates:
+        distance.append(float('nan') if km is None else float(km))
+        rest.append(_days_since(donor.get('last_donation_date'), today))
+        a, d = acceptance.get(donor['donor_id'], (0, 0))
+        accepted.append(a)
+        decided.append(d)
+        weight.append(float(donor.get('weight') or 0))
+    return distance, rest, accepted, decided, weight
+
+def _field(donors, name):
+    """One field of every donor, without a Python-level loop per row
+
+    Record rows of one query shape are read by position straight from
+    their tuples; dictionary rows through dict.get.
+    """
+    kinds = set(map(type, donors))
+    if len(kinds) == 1:
+        kind = kinds.pop()
+        if issubclass(kind, Record):
+            index = kind._index.get(name)
+            if index is None:
+                return [None] * len(donors)
+            return list(map(tuple.__getitem__, donors, repeat(index)))
+        if issubclass(kind, dict):
+            return list(map(dict.get, donors, repeat(name)))
+    return list(map(methodcaller('get', name), donors))
+
+def _numpy_columns(candidates, acceptance, today):
+    """_columns() as float arrays built a whole column at a time"""
+    distance = np.array([km for km, _ in candidates], dtype=np.float64)  # None -> NaN
+    donors = [donor for _, donor in candidates]
+
+    # Day ordinals; NumPy's own date conversion is far slower than toordinal()
+    last = np.array([NAN if value is None else value.toordinal()
+                     for value in _field(donors, 'last_donation_date')], dtype=np.float64)
+    rest = np.nan_to_num(today.toordinal() - last, nan=FULL_REST_DAYS)
+
+    pairs = map(acceptance.get, _field(donors, 'donor_id'), repeat((0, 0)))
+    counts = np.fromiter(chain.from_iterable(pairs), dtype=np.float64,
+                         count=2 * len(donors)).reshape(-1, 2)
+    weight = np.fromiter(_field(donors, 'weight'), dtype=np.float64, count=len(donors))
+    weight = np.nan_to_num(weight, nan=0.0)  # None -> NaN -> 0
+    return distance, rest, counts[:, 0], counts[:, 1], weight
+
+def _score_numpy(distance, rest, accepted, decided, weight):
+    proximity = np.nan_to_num(1.0 / (1.0 + distance / DISTANCE_SCALE_KM), nan=0.0)
+    rested = np.clip((rest - DONATION_INTERVAL_DAYS) / (FULL_REST_DAYS - DONATION_INTERVAL_DAYS), 0.0, 1.0)
+    # Laplace-smoothed, so donors without history start at 0.5
+    acceptance = (accepted + 1.0) / (decided + 2.0)
+    build = np.clip((weight - MIN_WEIGHT_KG) / (FULL_WEIGHT_KG - MIN_WEIGHT_KG), 0.0, 1.0)
+
+    return (WEIGHTS['distance'] * proximity + WEIGHTS['acceptance'] * acceptance +
+            WEIGHTS['rest'] * rested + WEIGHTS['weight'] * build)
+
+def _score_python(distance, rest, accepted, decided, weight):
+    def clip(value):
+        return min(max(value, 0.0), 1.0)
+
+    scores = []
+    for km, days, a, d, kg in zip(distance, rest, accepted, decided, weight):
+        proximity = 0.0 if km != km else 1.0 / (1.0 + km / DISTANCE_SCALE_KM)
+        rested = clip((days - DONATION_INTERVAL_DAYS) / (FULL_REST_DAYS - DONATION_INTERVAL_DAYS))
+        acceptance = (a + 1.0) / (d + 2.0)
+        build = clip((kg - MIN_WEIGHT_KG) / (FULL_WEIGHT_KG - MIN_WEIGHT_KG))
+        scores.append(WEIGHTS['distance'] * proximity + WEIGHTS['acceptance'] * acceptance +
+                      WEIGHTS['rest'] * rested + WEIGHTS['weight'] * build)
+    return scores
+
+def load_acceptance(candidates):
+    """Acceptance counts for the donors among candidates"""
+    if len(candidates) > ACCEPTANCE_IN_LIMIT:
+        return DonorMatch.get_acceptance_counts()
+    return DonorMatch.get_acceptance_counts([donor['donor_id'] for _, donor in candidates])
+
+def score_donors(candidates, acceptance=None, today=None):
+    """Score (distance_km, donor) pairs in one pass; higher is better
+    
+    distance_km may be None when the donor could not be placed. Returns
+    a NumPy array when NumPy is installed, otherwise a list.
+    """
+    if acceptance is None:
+        acceptance = load_acceptance(candidates)
+    if np is not None:
+        return _score_numpy(*_numpy_columns(candidates, acceptance, today or date.today()))
+    return _score_python(*_columns(candidates, acceptance, today or date.today()))
+
+def rank_donors(candidates, limit=None, acceptance=None, today=None):
+    """Best candidates first as (score, distance_km, donor) triples"""
+    candidates = list(candidates)
+    if not candidates:
+        return []
+    scores = score_donors(candidates, acceptance, today)
+
+    if np is not None:
+        if limit and limit < len(candidates):
+            # Only the top slice needs a full sort
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            order = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            order = np.argsort(-scores, kind='stable')
+        order = order.tolist()
+    else:
+        order = sorted(range(len(candidates)), key=lambda i: -scores[i])[:limit]
+
+    return [(float(scores[i]), candidates[i][0], candidates[i][1]) for i in order]
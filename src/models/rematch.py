@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+from src.config.database import db
+from src.models.blood_request import BloodRequest
+from src.models.matching import DonorMatcher
+
+class RematchWorker:
+    """Background thread that rematches requests after a donor declines
+
+    Declines in this process are submitted directly and handled at once;
+    a periodic poll picks up declines made by other running clients. The
+    next donor comes from the candidate list saved when the request was
+    first matched, so a rematch is a few indexed lookups.
+    """
+
+    # Seconds between polls for declines made elsewhere
+    POLL_INTERVAL = 30
+
+    # Seconds before the poll retries a request no donor was found for;
+    # doubles with every further miss, up to RETRY_MAX
+    RETRY_AFTER = 60
+    RETRY_MAX = 30 * 60
+
+    def __init__(self, poll_interval=None):
+        self.poll_interval = poll_interval or self.POLL_INTERVAL
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._timings = {}
+        self._misses = {}  # request_id -> (misses, monotonic time to retry at)
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker thread if it isn't running"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='rematch-worker', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """Stop the worker thread, waiting up to timeout seconds"""
+        self._stop.set()
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, request_id):
+        """Queue a request whose donor just declined"""
+        self._queue.put((request_id, time.perf_counter()))
+
+    def _run(self):
+        next_poll = time.monotonic()
+        while not self._stop.is_set():
+            if time.monotonic() >= next_poll:
+                self.poll()
+                next_poll = time.monotonic() + self.poll_interval
+            try:
+                item = self._queue.get(timeout=max(0.0, next_poll - time.monotonic()))
+            except queue.Empty:
+                continue
+            if item is not None:
+                self.process(*item)
+
+    def poll(self):
+        """Rematch every request still waiting after a decline
+        
+        Requests no donor was found for are skipped until their retry
+        time; a fresh decline submitted for one is still handled at once.
+        """
+        try:
+            waiting = BloodRequest.get_awaiting_rematch()
+            waiting_ids = {request['request_id'] for request in waiting}
+            for request_id in [request_id for request_id in self._misses if request_id not in waiting_ids]:
+                del self._misses[request_id]
+            now = time.monotonic()
+            for request in waiting:
+                miss = self._misses.get(request['request_id'])
+                if miss is not None and now < miss[1]:
+                    continue
+                self.process(request['request_id'], time.perf_counter())
+        except Exception as e:
+            print(f"Error polling for declined matches: {e}")
+
+    def process(self, request_id, submitted_at):
+        """Rematch one request; returns the new match_id or None"""
+        try:
+            with db.transaction():
+                request = BloodRequest.lock_for_rematch(request_id)
+                if not request or request['status'] != 'pending' or request['has_live_match']:
+                    self._misses.pop(request_id, None)
+                    return None
+                match_id = DonorMatcher.rematch(request)
+        except Exception as e:
+            print(f"Error rematching request {request_id}: {e}")
+            return None
+
+        elapsed = time.perf_counter() - submitted_at
+        if match_id:
+            self._misses.pop(request_id, None)
+            self._record(request['urgency'], elapsed)
+            print(f"Rematched request {request_id} ({request['urgency']}) in {elapsed * 1000:.1f} ms")
+        else:
+            delay = self._missed(request_id)
+            print(f"No compatible donor left to rematch request {request_id}; retrying in {delay:.0f} s")
+        return match_id
+
+    def _missed(self, request_id):
+        """Back off a request no donor was found for; returns the delay"""
+        misses = self._misses.get(request_id, (0, 0.0))[0] + 1
+        delay = min(self.RETRY_AFTER * 2 ** (misses - 1), self.RETRY_MAX)
+        self._misses[request_id] = (misses, time.monotonic() + delay)
+        return delay
+
+    def _record(self, urgency, elapsed):
+        with self._lock:
+            self._timings.setdefault(urgency, []).append(elapsed)
+
+    def stats(self):
+        """Time-to-rematch per urgency: {urgency: (count, mean_s, max_s)}"""
+        with self._lock:
+            return {
+                urgency: (len(times), sum(times) / len(times), max(times))
+                for urgency, times in self._timings.items()
+            }
+
+rematch_worker = RematchWorker()
@@ -0,0 +1,80 @@
+from src.config.database import db
+
+class Statistics:
+    """Aggregate counts for the admin statistics tab
+
+    Every figure is computed by the server with COUNT/SUM ... GROUP BY,
+    so the client receives a few dozen numbers however large the tables
+    grow.
+    """
+
+    @staticmethod
+    def get_summary():
+        """Headline counts as one row
+
+        Keys: total_users, total_donors, available_donors, total_requests,
+        pending_requests, fulfilled_requests.
+        """
+        query = """
+            SELECT
+                (SELECT COUNT(*) FROM USER) as total_users,
+                d.total_donors,
+                d.available_donors,
+                r.total_requests,
+                r.pending_requests,
+                r.fulfilled_requests
+            FROM (
+                SELECT COUNT(*) as total_donors,
+                       COALESCE(SUM(is_available = 1), 0) as available_donors
+                FROM DONOR
+            ) d
+            CROSS JOIN (
+                SELECT COUNT(*) as total_requests,
+                       COALESCE(SUM(status = 'pending'), 0) as pending_requests,
+                       COALESCE(SUM(status = 'fulfilled'), 0) as fulfilled_requests
+                FROM BLOOD_REQUEST
+            ) r
+        """
+        row = db.fetch_one(query)
+        return {key: int(value or 0) for key, value in row.items()} if row else {}
+
+    @staticmethod
+    def get_requests_by_urgency():
+        """Request counts per (urgency, status)"""
+        query = """
+            SELECT urgency, status, COUNT(*) as request_count
+            FROM BLOOD_REQUEST
+            GROUP BY urgency, status
+            ORDER BY urgency, status
+        """
+        return db.fetch_all(query)
+
+    @staticmethod
+    def get_donors_by_blood_group():
+        """Registered and available donors per blood group"""
+        query = """
+            SELECT blood_group,
+                   COUNT(*) as donor_count,
+                   COALESCE(SUM(is_available = 1), 0) as available_count
+            FROM DONOR
+            GROUP BY blood_group
+            ORDER BY blood_group
+        """
+        return db.fetch_all(query)
+
+    @staticmethod
+    def get_stock_by_hospital():
+        """Units available and reserved per hospital, with its low-stock groups"""
+        query = """
+            SELECT
+                h.hospital_id,
+                h.hospital_name,
+                SUM(bi.units_available) as units_available,
+                SUM(bi.units_reserved) as units_reserved,
+                SUM(bi.units_available <= bi.threshold) as low_stock_groups
+            FROM BLOOD_INVENTORY bi
+            JOIN HOSPITAL h ON bi.hospital_id = h.hospital_id
+            GROUP BY h.hospital_id, h.hospital_name
+            ORDER BY h.hospital_name
+        """
+        return db.fetch_all(query)
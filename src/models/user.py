@@ -1,7 +1,14 @@
 from src.config.database import db
+from src.models.pagination import keyset_tail, paginate
+from src.models.donor import Donor
+from src.models.patient import Patient
+from src.models.hospital_staff import HospitalStaff
 
 class User:
     
+    # Stable sort keys for the user listing
+    LIST_KEYS = [('created_at', 'DESC'), ('user_id', 'DESC')]
+    
     @staticmethod
     def create(user_name, email, phone, role, password_hash=None):
         """Create new user"""
@@ -11,9 +18,28 @@ class User:
         """
         return db.execute_query(query, (user_name, email, phone, role))
     
+    @staticmethod
+    def create_many(users, chunk_size=None):
+        """Create many users with multi-row inserts
+        
+        Each item starts with (user_name, email, phone, role). Like
+        create(), no password_hash is stored, so anything after role is
+        ignored.
+        """
+        query = """
+            INSERT INTO USER (user_name, email, phone, role, is_active)
+            VALUES (%s, %s, %s, %s, TRUE)
+        """
+        rows = (tuple(user[:4]) for user in users)
+        return db.execute_many(query, rows, chunk_size)
+    
     @staticmethod
     def authenticate(email, role):
-        """Simple authentication (you can add password later)"""
+        """Simple authentication (you can add password later)
+        
+        Deliberately not cached, so a deactivated account is refused at
+        its very next login.
+        """
         query = """
             SELECT * FROM USER 
             WHERE email = %s AND role = %s AND is_active = TRUE
@@ -21,10 +47,19 @@ class User:
         return db.fetch_one(query, (email, role))
     
     @staticmethod
-    def get_all():
-        """Get all users"""
-        query = "SELECT * FROM USER ORDER BY created_at DESC"
-        return db.fetch_all(query)
+    def get_all(after=None, limit=None):
+        """Get all users, newest first
+        
+        With a limit, returns one page; pass its next_token as after to
+        continue.
+        """
+        return paginate("SELECT * FROM USER", User.LIST_KEYS, after, limit)
+    
+    @staticmethod
+    def iter_all(batch_size=None):
+        """Stream all users without loading them into memory at once"""
+        tail, params = keyset_tail(User.LIST_KEYS)
+        return db.fetch_iter(f"SELECT * FROM USER\n{tail}", params, batch_size=batch_size)
     
     @staticmethod
     def get_by_role(role):
@@ -41,9 +76,14 @@ class User:
             WHERE user_id = %s
         """
         db.execute_query(query, (user_name, email, phone, user_id))
+        Donor.invalidate_cache(user_id)  # donor profiles carry email and phone
     
     @staticmethod
     def delete(user_id):
         """Delete user"""
         query = "DELETE FROM USER WHERE user_id = %s"
-        db.execute_query(query, (user_id,))
\ No newline at end of file
+        db.execute_query(query, (user_id,))
+        # Profiles go with the user
+        Donor.invalidate_cache(user_id)
+        Patient.invalidate_cache(user_id)
+        HospitalStaff.invalidate_cache(user_id)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """Thread-safe read-through cache with per-entry expiry and LRU eviction
+
+    Entries expire ttl seconds after they were loaded; once maxsize is
+    reached the least recently used entry makes room. Cached values are
+    shared between callers, so treat them as read-only.
+    """
+
+    def __init__(self, name, maxsize=256, ttl=300):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        # Bumped by invalidate() so a load that started before it isn't stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, load):
+        """Return the cached value for key, calling load() on a miss
+
+        None results are not cached, so a missing row is looked up again
+        next time instead of hiding one created since.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = load()
+        if value is not None:
+            self.put(key, value, generation)
+        return value
+
+    def put(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when key is None"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+# Every cache created through reference_cache(), for stats and invalidation
+_caches = {}
+
+def reference_cache(name, maxsize=256, ttl=300):
+    """Return the process-wide cache called name, creating it on first use"""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches.setdefault(name, TTLCache(name, maxsize, ttl))
+    return cache
+
+def cache_stats():
+    """Stats for every reference cache, keyed by name"""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+def invalidate_all():
+    for cache in _caches.values():
+        cache.invalidate()
@@ -0,0 +1,38 @@
+# Blood groups in the order the forms list them
+BLOOD_GROUPS = ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-']
+
+# Red cell compatibility: donor group -> recipient groups it can give to
+CAN_DONATE_TO = {
+    'O-': ['O-', 'O+', 'A-', 'A+', 'B-', 'B+', 'AB-', 'AB+'],
+    'O+': ['O+', 'A+', 'B+', 'AB+'],
+    'A-': ['A-', 'A+', 'AB-', 'AB+'],
+    'A+': ['A+', 'AB+'],
+    'B-': ['B-', 'B+', 'AB-', 'AB+'],
+    'B+': ['B+', 'AB+'],
+    'AB-': ['AB-', 'AB+'],
+    'AB+': ['AB+'],
+}
+
+def _donor_preference(recipient, donor):
+    """Sort key for donor groups: exact first, then spare Rh-negative
+    blood, then prefer the same ABO type and keep group O for last"""
+    return (
+        donor != recipient,
+        donor[-1] != recipient[-1],
+        donor[:-1] != recipient[:-1],
+        donor[:-1] == 'O',
+    )
+
+# Recipient group -> donor groups that can serve it, best first.
+# Precomputed once so matching never re-derives compatibility per request.
+COMPATIBLE_DONORS = {
+    recipient: tuple(sorted(
+        (donor for donor, recipients in CAN_DONATE_TO.items() if recipient in recipients),
+        key=lambda donor, recipient=recipient: _donor_preference(recipient, donor)
+    ))
+    for recipient in BLOOD_GROUPS
+}
+
+# Days a donor must wait between donations. The SQLite schema reads it
+# when created; MySQL's eligible_from (migration 003) hard-codes 90 too.
+DONATION_INTERVAL_DAYS = 90
@@ -0,0 +1,145 @@
+import csv
+import heapq
+import math
+import os
+
+# Mean radius of the Earth in kilometres
+EARTH_RADIUS_KM = 6371.0
+
+# Bundled pincode table. It only covers major cities; point PINCODE_FILE at
+# a full pincode directory with the same columns for complete coverage.
+DEFAULT_PINCODE_FILE = os.path.join(os.path.dirname(__file__), 'pincodes.csv')
+
+def haversine_km(a, b):
+    """Great-circle distance in km between two (latitude, longitude) points"""
+    lat1, lon1 = map(math.radians, a)
+    lat2, lon2 = map(math.radians, b)
+    h = (math.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+def to_xyz(point):
+    """Project (latitude, longitude) onto the unit sphere
+    
+    Straight-line distance between projected points grows with the
+    great-circle distance, so nearest neighbours in 3-D are nearest on
+    the map too.
+    """
+    lat, lon = map(math.radians, point)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+def chord_to_km(chord):
+    """Convert a unit-sphere chord length back to kilometres"""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+class PincodeTable:
+    """Pincode and city lookup of (latitude, longitude)
+    
+    Indian pincodes are hierarchical: the first digit is the region and
+    the first three the sorting district. A pincode missing from the
+    table falls back to the centre of the longest known prefix.
+    """
+
+    def __init__(self, rows=()):
+        self.points = {}
+        self.cities = {}
+        sums = {}
+        for pincode, city, point in rows:
+            self.points[pincode] = point
+            if city:
+                self.cities.setdefault(city.lower(), point)
+            for n in range(1, len(pincode)):
+                total = sums.setdefault(pincode[:n], [0.0, 0.0, 0])
+                total[0] += point[0]
+                total[1] += point[1]
+                total[2] += 1
+        self.prefixes = {prefix: (lat / count, lon / count) for prefix, (lat, lon, count) in sums.items()}
+
+    @classmethod
+    def load(cls, path=None):
+        """Load a CSV with pincode, city, latitude, longitude columns"""
+        path = path or os.getenv('PINCODE_FILE') or DEFAULT_PINCODE_FILE
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = [
+                (row['pincode'].strip(), row.get('city', '').strip(),
+                 (float(row['latitude']), float(row['longitude'])))
+                for row in csv.DictReader(f)
+            ]
+        return cls(rows)
+
+    def locate(self, pincode):
+        """(latitude, longitude) of a pincode, or None if nothing matches"""
+        pincode = str(pincode or '').strip()
+        point = self.points.get(pincode)
+        if point:
+            return point
+        for n in range(len(pincode) - 1, 0, -1):
+            point = self.prefixes.get(pincode[:n])
+            if point:
+                return point
+        return None
+
+    def locate_city(self, city):
+        """(latitude, longitude) of a city by name, or None"""
+        return self.cities.get(str(city or '').strip().lower())
+
+    def locate_place(self, pincode, city):
+        """(latitude, longitude) by pincode, falling back to the city name"""
+        return self.locate(pincode) or self.locate_city(city)
+
+class KDTree:
+    """Static 3-D k-d tree over unit-sphere points
+    
+    Built once from (point, item) pairs; nearest() visits only the
+    branches that can still beat the current k-th best distance.
+    """
+
+    def __init__(self, entries):
+        self.size = len(entries)
+        self.root = self._build([(to_xyz(point), item) for point, item in entries], 0)
+
+    def _build(self, entries, depth):
+        if not entries:
+            return None
+        axis = depth % 3
+        entries.sort(key=lambda entry: entry[0][axis])
+        mid = len(entries) // 2
+        xyz, item = entries[mid]
+        return (xyz, item, axis,
+                self._build(entries[:mid], depth + 1),
+                self._build(entries[mid + 1:], depth + 1))
+
+    def nearest(self, point, k, skip=None):
+        """Up to k (distance_km, item) pairs closest to point, nearest first
+        
+        Items for which skip(item) is true are passed over, so entries
+        can be retired without rebuilding the tree.
+        """
+        if k <= 0 or self.root is None:
+            return []
+        target = to_xyz(point)
+        best = []  # max-heap of (-squared distance, tiebreak, item)
+        counter = 0
+        # Each entry carries the squared distance to its splitting plane,
+        # so subtrees that cannot beat the k-th best are skipped
+        stack = [(self.root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if node is None or (len(best) == k and bound >= -best[0][0]):
+                continue
+            xyz, item, axis, left, right = node
+            d2 = sum((p - q) ** 2 for p, q in zip(xyz, target))
+            counter += 1
+            if skip is None or not skip(item):
+                if len(best) < k:
+                    heapq.heappush(best, (-d2, counter, item))
+                elif d2 < -best[0][0]:
+                    heapq.heapreplace(best, (-d2, counter, item))
+
+            diff = target[axis] - xyz[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Push far first so the near side is searched first
+            stack.append((far, diff * diff))
+            stack.append((near, 0.0))
+
+        return [(chord_to_km(math.sqrt(-d2)), item) for d2, _, item in sorted(best, reverse=True)]
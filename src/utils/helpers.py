@@ -0,0 +1,3 @@
+def format_date(value, fmt='%Y-%m-%d', default='N/A'):
+    """Format a date or datetime for display, default when it's missing"""
+    return value.strftime(fmt) if value else default